@@ -59,9 +59,31 @@ exe = EXE(
     icon='blazescan_logo.ico'
 )
 
+# 2.1 Executável de console para os comandos de linha (historico, agente, frota, sessao, monitor).
+# O BlazeScan.exe é uma aplicação de janela (console=False) e não exibiria a saída desses comandos.
+exe_cli = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='BlazeScan-cli',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    console=True,
+    disable_windowed_traceback=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    manifest='blazescan_manifest.xml',
+    icon='blazescan_logo.ico'
+)
+
 # 3. Configurações do Arquivo (COLLECT)
 coll = COLLECT(
     exe,
+    exe_cli,
     a.binaries,
     a.zipfiles,
     a.datas,
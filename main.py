@@ -7,7 +7,8 @@ import sys
 import os
 import logging
 import ctypes 
-import customtkinter as ctk
+import subprocess
+import multiprocessing
 from typing import NoReturn
 
 # --- CONFIGURAÇÃO INICIAL E LOGGING ---
@@ -26,14 +27,17 @@ except Exception as e:
     logger.error(f"Não foi possível configurar o caminho de importação: {e}")
     sys.exit(1)
 
-# Importa a classe App
-try:
-    # 🚨 CORREÇÃO: Importar a classe App, não a função start_ui
-    from src.frontend.ui import App 
-except ImportError as e:
-    logger.error(f"Falha ao carregar a interface (UI). Erro: {e}")
-    logger.info("Verifique se as dependências (ex: customtkinter) estão instaladas e se as importações são absolutas (ex: from src...).")
-    sys.exit(1)
+def load_ui():
+    """Importa a interface gráfica apenas quando necessária (os modos de linha de comando não dependem dela)."""
+    try:
+        import customtkinter as ctk
+        # 🚨 CORREÇÃO: Importar a classe App, não a função start_ui
+        from src.frontend.ui import App 
+    except ImportError as e:
+        logger.error(f"Falha ao carregar a interface (UI). Erro: {e}")
+        logger.info("Verifique se as dependências (ex: customtkinter) estão instaladas e se as importações são absolutas (ex: from src...).")
+        sys.exit(1)
+    return ctk, App
 
 
 # --- FUNÇÕES DE ADMINISTRAÇÃO ---
@@ -41,6 +45,8 @@ except ImportError as e:
 def is_admin() -> bool:
     """Verifica se o script está rodando com privilégios de administrador."""
     try:
+        if hasattr(os, 'geteuid'):
+            return os.geteuid() == 0
         return ctypes.windll.shell32.IsUserAnAdmin()
     except Exception:
         return False
@@ -48,12 +54,15 @@ def is_admin() -> bool:
 def elevate_privileges():
     """Tenta reiniciar o script com permissões de administrador."""
     if not is_admin() and sys.platform == 'win32':
-        script = os.path.abspath(sys.argv[0])
+        arguments = sys.argv[1:]
+        if not getattr(sys, 'frozen', False):
+            # No executável (PyInstaller) sys.executable já é o BlazeScan.exe: só o script é repassado ao python.exe
+            arguments = [os.path.abspath(sys.argv[0])] + arguments
         ret = ctypes.windll.shell32.ShellExecuteW(
             None,      
             "runas",   
             sys.executable,
-            f'"{script}"', # Passa o caminho do script entre aspas
+            subprocess.list2cmdline(arguments), # Argumentos entre aspas quando necessário
             None,      
             1          
         )
@@ -70,12 +79,17 @@ def elevate_privileges():
 def main() -> NoReturn:
     """Função principal que inicia a aplicação BlazeScan."""
 
+    # 0. MODOS DE LINHA DE COMANDO (ex: 'historico') NÃO ABREM A INTERFACE
+    from src.cli import CLI_COMMANDS, run_cli
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        sys.exit(run_cli(sys.argv[1:]))
+
     # 1. VERIFICA E ELEVA PRIVILÉGIOS 
     elevate_privileges() 
 
-    # 2. VERIFICA SISTEMA OPERACIONAL (Simplificado)
-    if sys.platform != 'win32':
-        logger.warning("AVISO: Este programa foi projetado para Windows e pode não funcionar corretamente aqui.")
+    # 2. VERIFICA SISTEMA OPERACIONAL (Windows e Linux têm backends próprios)
+    if sys.platform != 'win32' and not sys.platform.startswith('linux'):
+        logger.warning("AVISO: Este programa foi projetado para Windows e Linux e pode não funcionar corretamente aqui.")
     
     # Inicia a interface gráfica
     logger.info("Iniciando BlazeScan...")
@@ -84,6 +98,8 @@ def main() -> NoReturn:
     else:
         logger.warning("Executando sem privilégios de Administrador. Algumas funções (como Otimização de Disco) podem falhar.")
         
+    ctk, App = load_ui()
+
     try:
         # Configurações globais do CTk (devem estar fora da classe App)
         ctk.set_appearance_mode("System")
@@ -103,4 +119,6 @@ def main() -> NoReturn:
     sys.exit(0)
 
 if __name__ == '__main__':
+    # Necessário para o pool de processos (compressão) no executável PyInstaller
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
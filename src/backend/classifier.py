@@ -0,0 +1,252 @@
+import os
+import re
+import stat
+import time
+import struct
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from src.utils.system import format_bytes
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DO CLASSIFICADOR
+# ====================================================================
+
+# Apenas o início de cada arquivo é lido, com uma única chamada (pread)
+HEADER_READ_SIZE = 4096
+
+MAX_CLASSIFIER_WORKERS = 8
+# Limite de arquivos examinados por pasta, para que pastas enormes não travem a etapa
+MAX_CANDIDATES_PER_PATH = 50000
+
+# Um download parcial mais novo que isto provavelmente ainda está em andamento
+PARTIAL_DOWNLOAD_MIN_AGE_SECONDS = 24 * 60 * 60
+
+CATEGORY_CRASH_DUMP = "Dump de Falha"
+CATEGORY_INSTALLER = "Instalador Antigo"
+CATEGORY_PARTIAL_DOWNLOAD = "Download Incompleto"
+CATEGORY_ARCHIVE_FRAGMENT = "Fragmento de Arquivo Compactado"
+
+# Assinaturas (magic bytes) no início do arquivo
+MAGIC_MINIDUMP = b"MDMP"
+MAGIC_KERNEL_DUMPS = (b"PAGEDU64", b"PAGEDUMP")
+MAGIC_OLE = b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1"
+MAGIC_MZ = b"MZ"
+MAGIC_ELF = b"\x7fELF"
+MAGIC_7Z = b"7z\xBC\xAF\x27\x1C"
+MAGIC_RAR = b"Rar!\x1a\x07"
+MAGIC_ZIP_SPLIT = b"PK\x07\x08"
+MAGIC_DEB = b"!<arch>\ndebian-binary"
+MAGIC_RPM = b"\xED\xAB\xEE\xDB"
+APPORT_CRASH_PREFIX = b"ProblemType:"
+
+ELF_TYPE_CORE = 4
+
+PARTIAL_DOWNLOAD_EXTENSIONS = (".crdownload", ".part", ".partial", ".download", ".opdownload", ".!qb", ".!ut")
+DUMP_EXTENSIONS = (".dmp", ".mdmp", ".hdmp", ".crash", ".core")
+INSTALLER_EXTENSIONS = (".msi", ".exe", ".deb", ".rpm")
+INSTALLER_NAME_HINTS = ("setup", "install", "installer", "update")
+
+# Volumes de arquivos divididos: nome.7z.001, nome.z01, nome.r00, nome.part2.rar
+FRAGMENT_PATTERNS = [
+    (re.compile(r"^(?P<stem>.+)\.7z\.(?P<n>\d{3})$", re.IGNORECASE), "7z"),
+    (re.compile(r"^(?P<stem>.+)\.z(?P<n>\d{2})$", re.IGNORECASE), "zip"),
+    (re.compile(r"^(?P<stem>.+)\.r(?P<n>\d{2})$", re.IGNORECASE), "rar"),
+    (re.compile(r"^(?P<stem>.+)\.part(?P<n>\d+)\.rar$", re.IGNORECASE), "rar"),
+]
+
+
+# ====================================================================
+# LEITURA DO CABEÇALHO
+# ====================================================================
+
+def read_header(path: str, size: int = HEADER_READ_SIZE) -> bytes:
+    """Lê somente os primeiros bytes do arquivo, com uma única chamada de leitura."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        if hasattr(os, 'pread'):
+            return os.pread(fd, size, 0)
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+# ====================================================================
+# REGRAS DE CLASSIFICAÇÃO
+# ====================================================================
+
+def _match_fragment(name: str) -> Optional[Tuple[str, int, str]]:
+    """Retorna (radical, número do volume, formato) se o nome for de um volume dividido."""
+    for pattern, kind in FRAGMENT_PATTERNS:
+        match = pattern.match(name)
+        if match:
+            return match.group("stem"), int(match.group("n")), kind
+    return None
+
+def _has_first_volume(stem: str, kind: str, dir_names: Set[str]) -> bool:
+    stem = stem.lower()
+    if kind == "7z":
+        return f"{stem}.7z.001" in dir_names
+    if kind == "zip":
+        return f"{stem}.zip" in dir_names
+    return any(f"{stem}{suffix}" in dir_names for suffix in (".rar", ".part1.rar", ".part01.rar"))
+
+def _is_pe_executable(header: bytes) -> bool:
+    if not header.startswith(MAGIC_MZ) or len(header) < 0x40:
+        return False
+    pe_offset = struct.unpack_from("<I", header, 0x3C)[0]
+    return pe_offset + 4 <= len(header) and header[pe_offset:pe_offset + 4] == b"PE\0\0"
+
+def _is_elf_core(header: bytes) -> bool:
+    if not header.startswith(MAGIC_ELF) or len(header) < 18:
+        return False
+    byte_order = "<" if header[5] == 1 else ">"
+    return struct.unpack_from(byte_order + "H", header, 16)[0] == ELF_TYPE_CORE
+
+def needs_header(name: str, in_dump_dir: bool) -> bool:
+    """Indica se o arquivo é candidato à leitura do cabeçalho (evita ler arquivos comuns)."""
+    lower = name.lower()
+    if in_dump_dir or lower.endswith(DUMP_EXTENSIONS + INSTALLER_EXTENSIONS):
+        return True
+    if lower == "core" or lower.startswith("core."):
+        return True
+    return _match_fragment(name) is not None
+
+def classify_file(path: str, st: os.stat_result, header: Optional[bytes],
+                  dir_names: Set[str], now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Classifica um arquivo pelo nome e pelo conteúdo do cabeçalho.
+    Retorna {"path", "category", "confidence", "size", "reason"} ou None se não for lixo.
+    """
+    now = now or time.time()
+    name = os.path.basename(path)
+    lower = name.lower()
+
+    def result(category: str, confidence: float, reason: str) -> Dict[str, Any]:
+        return {"path": path, "category": category, "confidence": round(min(confidence, 1.0), 2),
+                "size": st.st_size, "reason": reason}
+
+    # Downloads incompletos: o nome basta, a idade indica se ainda estão em andamento
+    if lower.endswith(PARTIAL_DOWNLOAD_EXTENSIONS):
+        if now - st.st_mtime >= PARTIAL_DOWNLOAD_MIN_AGE_SECONDS:
+            return result(CATEGORY_PARTIAL_DOWNLOAD, 0.9, "download parado há mais de 1 dia")
+        return result(CATEGORY_PARTIAL_DOWNLOAD, 0.4, "download recente (pode estar em andamento)")
+
+    fragment = _match_fragment(name)
+    if fragment is not None:
+        stem, number, kind = fragment
+        expected_magic = {"7z": MAGIC_7Z, "rar": MAGIC_RAR, "zip": MAGIC_ZIP_SPLIT}[kind]
+        structure_ok = header is not None and header.startswith(expected_magic)
+        if not _has_first_volume(stem, kind, dir_names):
+            return result(CATEGORY_ARCHIVE_FRAGMENT, 0.85, "volume órfão (primeiro volume ausente)")
+        if structure_ok:
+            return result(CATEGORY_ARCHIVE_FRAGMENT, 0.5, f"volume de {kind} dividido (conjunto completo)")
+        return result(CATEGORY_ARCHIVE_FRAGMENT, 0.4, f"volume de {kind} dividido")
+
+    if header is None:
+        return None
+
+    # Dumps de falha: a assinatura identifica o formato independentemente do nome
+    if header.startswith(MAGIC_MINIDUMP):
+        return result(CATEGORY_CRASH_DUMP, 0.95, "minidump do Windows (MDMP)")
+    if header.startswith(MAGIC_KERNEL_DUMPS):
+        return result(CATEGORY_CRASH_DUMP, 0.95, "dump de memória do kernel")
+    if _is_elf_core(header):
+        return result(CATEGORY_CRASH_DUMP, 0.9, "core dump ELF")
+    if header.startswith(APPORT_CRASH_PREFIX):
+        return result(CATEGORY_CRASH_DUMP, 0.9, "relatório de falha (apport)")
+
+    # Instaladores: extensão e estrutura precisam concordar
+    hinted = any(hint in lower for hint in INSTALLER_NAME_HINTS)
+    if lower.endswith(".msi") and header.startswith(MAGIC_OLE):
+        return result(CATEGORY_INSTALLER, 0.8, "pacote MSI (OLE)")
+    if lower.endswith(".exe") and _is_pe_executable(header):
+        return result(CATEGORY_INSTALLER, 0.75 if hinted else 0.55, "executável PE baixado")
+    if lower.endswith(".deb") and header.startswith(MAGIC_DEB):
+        return result(CATEGORY_INSTALLER, 0.7, "pacote .deb")
+    if lower.endswith(".rpm") and header.startswith(MAGIC_RPM):
+        return result(CATEGORY_INSTALLER, 0.7, "pacote .rpm")
+
+    return None
+
+
+# ====================================================================
+# VARREDURA EM PARALELO
+# ====================================================================
+
+def _classify_with_header(path: str, st: os.stat_result, needs_read: bool,
+                          dir_names: Set[str], now: float) -> Optional[Dict[str, Any]]:
+    header = None
+    if needs_read:
+        try:
+            header = read_header(path)
+        except OSError as e:
+            logger.debug(f"Classificador: não foi possível ler '{path}': {e}")
+    return classify_file(path, st, header, dir_names, now)
+
+def classify_directory(path: str, scan_all: bool = False,
+                       max_candidates: int = MAX_CANDIDATES_PER_PATH) -> List[Dict[str, Any]]:
+    """
+    Percorre a pasta e classifica os arquivos candidatos. A leitura dos cabeçalhos roda em
+    um pool de threads enquanto a varredura continua. Com scan_all (pastas de dumps),
+    todo arquivo tem o cabeçalho examinado.
+    """
+    if not os.path.isdir(path):
+        return []
+
+    now = time.time()
+    findings: List[Dict[str, Any]] = []
+    examined = 0
+    with ThreadPoolExecutor(max_workers=MAX_CLASSIFIER_WORKERS) as executor:
+        futures = []
+        for dirpath, dirnames, filenames in os.walk(path):
+            dir_names = {f.lower() for f in filenames}
+            for filename in filenames:
+                file_path = os.path.join(dirpath, filename)
+                try:
+                    st = os.lstat(file_path)
+                except OSError:
+                    continue
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                needs_read = needs_header(filename, scan_all)
+                if not needs_read and not filename.lower().endswith(PARTIAL_DOWNLOAD_EXTENSIONS):
+                    continue
+                futures.append(executor.submit(_classify_with_header, file_path, st, needs_read, dir_names, now))
+                examined += 1
+                if examined >= max_candidates:
+                    break
+            if examined >= max_candidates:
+                logger.debug(f"Classificador: limite de {max_candidates} candidatos atingido em '{path}'.")
+                break
+
+        for future in futures:
+            finding = future.result()
+            if finding is not None:
+                findings.append(finding)
+
+    return findings
+
+def format_classifier_report(findings: List[Dict[str, Any]], max_listed: int = 10) -> List[str]:
+    """Resume os achados por categoria e lista os maiores itens."""
+    if not findings:
+        return ["Nenhum item identificado pelo conteúdo."]
+
+    lines = []
+    by_category: Dict[str, List[Dict[str, Any]]] = {}
+    for finding in findings:
+        by_category.setdefault(finding["category"], []).append(finding)
+
+    for category, items in sorted(by_category.items(), key=lambda kv: -sum(i["size"] for i in kv[1])):
+        likely = [i for i in items if i["confidence"] >= 0.7]
+        lines.append(
+            f"{category}: {len(items)} arquivos, {format_bytes(sum(i['size'] for i in items))} "
+            f"(alta confiança: {len(likely)}, {format_bytes(sum(i['size'] for i in likely))})"
+        )
+
+    for finding in sorted(findings, key=lambda f: -f["size"])[:max_listed]:
+        lines.append(f"   [{finding['confidence']:.2f}] {format_bytes(finding['size'])} - {finding['path']} ({finding['reason']})")
+    return lines
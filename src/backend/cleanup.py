@@ -1,11 +1,18 @@
 import os
+import time
 import logging
 import sys
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional
 
 # Importa as funções e constantes dos utilitários
 from src.utils.system import (
     get_temp_paths, 
+    get_file_targets,
+    get_min_file_age,
+    get_required_owner,
+    get_processes_to_kill,
+    get_compress_paths,
+    get_classifier_paths,
     set_power_plan, 
     optimize_disk, 
     terminate_processes, 
@@ -13,50 +20,249 @@ from src.utils.system import (
     
     # 🚨 CORREÇÃO: clean_directory precisa ser importado do system.py 🚨
     clean_directory, 
-    
-    OPT_PROCESSES_TO_KILL
+    clean_files,
+    trim_directory,
+    load_failure_cache,
+    get_disk_free_bytes,
+    SpaceAccount,
 )
+from src.backend.compress import compress_old_files, DEFAULT_CODEC, DEFAULT_MIN_AGE_DAYS
+from src.backend.quarantine import new_batch, quarantine_directory, start_background_purge
+from src.backend.history import RunHistory
+from src.backend.progress import ProgressTracker
+from src.backend.classifier import classify_directory, format_classifier_report
 
 logger = logging.getLogger('BlazeScan')
 
+# Alvos cujo nome começa com este prefixo são caches de aplicativos (ex: 'Cache Chrome')
+CACHE_TARGET_PREFIX = "Cache"
+DEFAULT_CACHE_BUDGET_MB = 256
+
 
 # ====================================================================
 # FUNÇÕES DE EXECUÇÃO ESPECÍFICA (Responsabilidade Única)
 # ====================================================================
 
-def cleanup_temp_files(messages: List[str]) -> int:
-    """Executa a limpeza de arquivos temporários."""
+def _add_target_report(targets_report: Optional[List[Dict[str, Any]]], stage: str, name: str, path: str,
+                       started_at: float, bytes_freed: int, files: int, errors: int):
+    """Registra o resultado de um alvo para o histórico de execuções."""
+    if targets_report is None:
+        return
+    targets_report.append({
+        "stage": stage,
+        "name": name,
+        "path": path,
+        "started_at": started_at,
+        "duration": time.time() - started_at,
+        "bytes": bytes_freed,
+        "files": files,
+        "errors": errors,
+    })
+
+
+def _space_details(account: SpaceAccount, path: str, free_before: Optional[int]) -> str:
+    """
+    Complementa a mensagem de um alvo com o tamanho aparente removido e com a variação
+    do espaço livre medida pelo sistema (shutil.disk_usage) antes e depois do alvo.
+    """
+    details = f" em disco (aparente: {format_bytes(account.apparent_bytes)})"
+    free_after = get_disk_free_bytes(path)
+    if free_before is not None and free_after is not None:
+        measured = free_after - free_before
+        sign = "+" if measured >= 0 else "-"
+        details += f" | Espaço livre medido: {sign}{format_bytes(abs(measured))}"
+    return details
+
+def cleanup_temp_files(messages: List[str], settings: Optional[Dict[str, Any]] = None,
+                       targets_report: Optional[List[Dict[str, Any]]] = None,
+                       progress: Optional[ProgressTracker] = None) -> int:
+    """
+    Executa a limpeza de arquivos temporários.
+    Com a estratégia "quarantine", o conteúdo é apenas movido para a quarentena
+    (a limpeza pode ser desfeita) e o espaço é liberado depois pela purga em segundo plano.
+    Com cache_mode="trim", os caches de aplicativos são apenas reduzidos ao orçamento.
+    """
+    settings = settings or {}
+    use_quarantine = settings.get("cleanup_strategy", "delete") == "quarantine"
+    trim_caches = settings.get("cache_mode", "wipe") == "trim"
+    cache_budget = int(settings.get("cache_budget_mb", DEFAULT_CACHE_BUDGET_MB) * 1024 * 1024)
+    quarantine_batch = new_batch(settings) if use_quarantine else None
     total_cleaned_bytes = 0
     logger.info("--- 1. Limpeza de Arquivos Temporários ---")
     messages.append("--- 1. Limpeza de Arquivos Temporários ---")
     
     # Assumindo que get_temp_paths retorna Dict[str, str] (Nome: Caminho)
-    temp_paths_map = get_temp_paths() 
-    
+    temp_paths_map = get_temp_paths()
+
+    # Cache negativo: evita tentar de novo arquivos que sempre estão bloqueados
+    failure_cache = load_failure_cache()
+
+    file_targets = get_file_targets()
+    if progress is not None:
+        progress.add_targets([name for name, path in temp_paths_map.items() if os.path.exists(path)]
+                             + list(file_targets))
+
     for name, path in temp_paths_map.items():
         if os.path.exists(path):
-            # clean_directory AGORA ESTÁ IMPORTADO
+            skipped_before, failed_before = failure_cache.skipped, failure_cache.failed
+            target_started_at = time.time()
+            cleaned_size, cleaned_files, target_errors = 0, 0, 0
+            account = SpaceAccount(throttle=progress.target_callback(name) if progress is not None else None)
+            if progress is not None:
+                progress.start_target(name)
+            free_before = get_disk_free_bytes(path)
             try:
-                cleaned_size = clean_directory(path) 
-                total_cleaned_bytes += cleaned_size
-                messages.append(f"Limpeza em '{name}' concluída. Liberado: {format_bytes(cleaned_size)}")
+                if trim_caches and name.startswith(CACHE_TARGET_PREFIX):
+                    # Mantém o conjunto mais usado do cache e remove só o excedente (LRU)
+                    kept_size, cleaned_size, cleaned_files = trim_directory(path, cache_budget, failure_cache, account)
+                    total_cleaned_bytes += cleaned_size
+                    messages.append(
+                        f"Cache em '{name}' reduzido. Liberado: {format_bytes(cleaned_size)}"
+                        f"{_space_details(account, path, free_before)} | "
+                        f"Mantido: {format_bytes(kept_size)} (orçamento {format_bytes(cache_budget)})"
+                    )
+                elif quarantine_batch is not None:
+                    cleaned_files = quarantine_directory(quarantine_batch, name, path, failure_cache,
+                                                         get_min_file_age(name), get_required_owner(name))
+                    messages.append(f"Limpeza em '{name}' concluída. Itens movidos para a quarentena: {cleaned_files}")
+                else:
+                    cleaned_size, cleaned_files = clean_directory(path, failure_cache, get_min_file_age(name), account,
+                                                                  get_required_owner(name))
+                    total_cleaned_bytes += cleaned_size
+                    messages.append(
+                        f"Limpeza em '{name}' concluída. Liberado: {format_bytes(cleaned_size)}"
+                        f"{_space_details(account, path, free_before)}"
+                    )
             except Exception as e:
                  # Adiciona um tratamento de erro mais robusto caso a limpeza falhe
                  logger.error(f"Falha crítica ao limpar '{name}' ({path}): {e}")
                  messages.append(f"Limpeza em '{name}' falhou. Erro: {e}")
+                 target_errors += 1
+
+            if progress is not None:
+                progress.finish_target(name, cleaned_files, cleaned_size)
+            skipped = failure_cache.skipped - skipped_before
+            failed = failure_cache.failed - failed_before
+            _add_target_report(targets_report, "temp", name, path, target_started_at,
+                               cleaned_size, cleaned_files, target_errors + failed)
+            if skipped or failed:
+                messages.append(
+                    f"   Itens bloqueados pulados: {skipped} | Falhas nesta execução: {failed} | "
+                    f"Falhas acumuladas: {failure_cache.total_failures(os.path.join(path, ''))}"
+                )
 
         else:
             logger.debug(f"Caminho não encontrado para limpeza: {name}")
 
+    # Arquivos avulsos (ex: logs rotacionados no Linux) são sempre apagados diretamente
+    for name, patterns in file_targets.items():
+        failed_before = failure_cache.failed
+        target_started_at = time.time()
+        account = SpaceAccount(throttle=progress.target_callback(name) if progress is not None else None)
+        if progress is not None:
+            progress.start_target(name)
+        # O volume é medido pela pasta base do primeiro padrão (ex: /var/log)
+        base_path = os.path.dirname(patterns[0].split('*', 1)[0]) if patterns else ""
+        free_before = get_disk_free_bytes(base_path) if base_path else None
+        try:
+            cleaned_size, cleaned_files = clean_files(patterns, failure_cache, account)
+        except Exception as e:
+            logger.error(f"Falha crítica ao limpar '{name}': {e}")
+            messages.append(f"Limpeza em '{name}' falhou. Erro: {e}")
+            if progress is not None:
+                progress.finish_target(name)
+            continue
+        if progress is not None:
+            progress.finish_target(name, cleaned_files, cleaned_size)
+        total_cleaned_bytes += cleaned_size
+        messages.append(
+            f"Limpeza em '{name}' concluída. Liberado: {format_bytes(cleaned_size)}"
+            f"{_space_details(account, base_path, free_before) if base_path else ''}"
+        )
+        _add_target_report(targets_report, "temp", name, ", ".join(patterns), target_started_at,
+                           cleaned_size, cleaned_files, failure_cache.failed - failed_before)
+
+    failure_cache.save()
+
+    if quarantine_batch is not None and quarantine_batch["targets"]:
+        retention_hours = quarantine_batch["retention_hours"]
+        messages.append(
+            f"Limpeza rápida: o espaço será liberado em segundo plano. "
+            f"É possível desfazer esta limpeza por até {retention_hours} hora(s) (lote {quarantine_batch['batch_id']})."
+        )
+
+    # Purga em baixa prioridade os lotes de quarentena cujo período de retenção expirou
+    start_background_purge()
+
     return total_cleaned_bytes
 
 
+def cleanup_compress_old_files(messages: List[str], settings: Dict[str, Any],
+                               targets_report: Optional[List[Dict[str, Any]]] = None) -> int:
+    """Comprime (em vez de apagar) logs e dumps antigos, se configurado."""
+    logger.info("\n--- 1.1 Compressão de Logs e Dumps Antigos ---")
+    messages.append("\n--- 1.1 Compressão de Logs e Dumps Antigos ---")
+
+    if not settings.get("compress_logs", False):
+        messages.append("Compressão de logs e dumps ignorada por opção do utilizador.")
+        return 0
+
+    min_age_days = settings.get("compress_min_age_days", DEFAULT_MIN_AGE_DAYS)
+    codec = settings.get("compress_codec", DEFAULT_CODEC)
+    total_saved_bytes = 0
+
+    for name, path in get_compress_paths().items():
+        if not os.path.exists(path):
+            logger.debug(f"Caminho não encontrado para compressão: {name}")
+            continue
+        target_started_at = time.time()
+        try:
+            saved_bytes, compressed_count, failures = compress_old_files(path, min_age_days, codec)
+            total_saved_bytes += saved_bytes
+            msg = f"Compressão em '{name}' concluída. Arquivos comprimidos: {compressed_count}. Liberado: {format_bytes(saved_bytes)}"
+            if failures:
+                msg += f" | Falhas: {failures}"
+            messages.append(msg)
+        except Exception as e:
+            logger.error(f"Falha crítica ao comprimir '{name}' ({path}): {e}")
+            messages.append(f"Compressão em '{name}' falhou. Erro: {e}")
+            saved_bytes, compressed_count, failures = 0, 0, 1
+
+        _add_target_report(targets_report, "compress", name, path, target_started_at,
+                           saved_bytes, compressed_count, failures)
+
+    return total_saved_bytes
+
+
+def cleanup_classify_junk(messages: List[str], settings: Dict[str, Any]):
+    """Identifica lixo pelo conteúdo (dumps, instaladores, downloads incompletos, fragmentos) e o relata."""
+    logger.info("\n--- 1.2 Classificação de Arquivos por Conteúdo ---")
+    messages.append("\n--- 1.2 Classificação de Arquivos por Conteúdo ---")
+
+    if not settings.get("classify_junk", True):
+        messages.append("Classificação por conteúdo ignorada por opção do utilizador.")
+        return
+
+    # Nas pastas de dumps todo arquivo é examinado; nas demais, só os candidatos pelo nome
+    dump_paths = set(get_compress_paths().values())
+    findings = []
+    for name, path in get_classifier_paths().items():
+        try:
+            findings.extend(classify_directory(path, scan_all=path in dump_paths))
+        except Exception as e:
+            logger.error(f"Falha ao classificar '{name}' ({path}): {e}")
+            messages.append(f"Classificação em '{name}' falhou. Erro: {e}")
+
+    # Apenas relata: Downloads são arquivos do usuário e nunca são apagados automaticamente
+    messages.extend(format_classifier_report(findings))
+
+
 def cleanup_terminate_processes(messages: List[str]):
     """Encerra processos específicos para otimização."""
     logger.info("\n--- 2. Encerramento de Processos de Otimização ---")
     messages.append("\n--- 2. Encerramento de Processos de Otimização ---")
     
-    success_kill, terminated_list = terminate_processes(OPT_PROCESSES_TO_KILL)
+    success_kill, terminated_list = terminate_processes(get_processes_to_kill())
 
     if terminated_list:
         messages.append(f"Processos encerrados com sucesso: {', '.join(terminated_list)}")
@@ -116,12 +322,59 @@ def cleanup_additional_info(messages: List[str]):
 # FUNÇÃO ORQUESTRADORA PRINCIPAL
 # ====================================================================
 
-def perform_cleanup(settings: Dict[str, Any]) -> Tuple[bool, str, str]:
+# Etapas acompanhadas pelo progresso geral (na ordem de execução)
+CLEANUP_STAGES = [
+    "Limpeza de Arquivos Temporários",
+    "Compressão de Logs e Dumps",
+    "Classificação por Conteúdo",
+    "Encerramento de Processos",
+    "Otimização de Energia",
+    "Otimização de Disco",
+]
+
+def _record_history(settings: Dict[str, Any], started_at: float, total_cleaned_bytes: int, success: bool,
+                    targets_report: List[Dict[str, Any]], stages_report: List[Dict[str, Any]]):
+    """Grava a execução no histórico local. Falhas aqui nunca interrompem a limpeza."""
+    if not settings.get("record_history", True):
+        return
+    try:
+        RunHistory().record_run(started_at, time.time() - started_at, total_cleaned_bytes, success,
+                                settings, targets_report, stages_report)
+    except Exception as e:
+        logger.warning(f"Não foi possível gravar o histórico da execução: {e}")
+
+
+def perform_cleanup(settings: Dict[str, Any], progress: Optional[ProgressTracker] = None) -> Tuple[bool, str, str]:
     """
     Orquestra todas as etapas de limpeza e otimização.
+    Cada execução (alvos, etapas e durações) é registrada no histórico local.
+    Com progress, o andamento de cada etapa e alvo pode ser acompanhado (ex: pela UI).
     """
     total_cleaned_bytes = 0
     messages: List[str] = []
+    targets_report: List[Dict[str, Any]] = []
+    stages_report: List[Dict[str, Any]] = []
+    started_at = time.time()
+
+    if progress is not None:
+        progress.stages = list(CLEANUP_STAGES)
+        if not progress.estimates and settings.get("record_history", True):
+            # O resultado da execução anterior de cada alvo serve de estimativa para o ETA
+            try:
+                progress.estimates = RunHistory().last_target_results()
+            except Exception as e:
+                logger.debug(f"Sem estimativas do histórico para o progresso: {e}")
+
+    def run_stage(stage_name: str, stage_func, *args, **kwargs):
+        stage_started_at = time.perf_counter()
+        if progress is not None:
+            progress.start_stage(stage_name)
+        try:
+            return stage_func(*args, **kwargs)
+        finally:
+            stages_report.append({"name": stage_name, "duration": time.perf_counter() - stage_started_at})
+            if progress is not None:
+                progress.finish_stage(stage_name)
     
     logger.info("=" * 40)
     logger.info("INICIANDO OPERAÇÃO BLAZESCAN")
@@ -129,16 +382,24 @@ def perform_cleanup(settings: Dict[str, Any]) -> Tuple[bool, str, str]:
     logger.info("=" * 40)
 
     # 1. Limpeza de Arquivos
-    total_cleaned_bytes += cleanup_temp_files(messages)
+    total_cleaned_bytes += run_stage("Limpeza de Arquivos Temporários", cleanup_temp_files,
+                                     messages, settings, targets_report, progress=progress)
+
+    # 1.1 Compressão de Logs e Dumps Antigos
+    total_cleaned_bytes += run_stage("Compressão de Logs e Dumps", cleanup_compress_old_files,
+                                     messages, settings, targets_report)
+
+    # 1.2 Classificação por Conteúdo
+    run_stage("Classificação por Conteúdo", cleanup_classify_junk, messages, settings)
 
     # 2. Encerramento de Processos
-    cleanup_terminate_processes(messages)
+    run_stage("Encerramento de Processos", cleanup_terminate_processes, messages)
     
     # 3. Otimização de Energia
-    cleanup_power_plan(messages, settings)
+    run_stage("Otimização de Energia", cleanup_power_plan, messages, settings)
     
     # 4. Otimização de Disco
-    cleanup_disk_optimization(messages, settings)
+    run_stage("Otimização de Disco", cleanup_disk_optimization, messages, settings)
     
     # 5. Informações Adicionais
     cleanup_additional_info(messages)
@@ -151,6 +412,8 @@ def perform_cleanup(settings: Dict[str, Any]) -> Tuple[bool, str, str]:
     logger.info("=" * 40)
     
     final_message = "\n".join(messages)
+
+    _record_history(settings, started_at, total_cleaned_bytes, True, targets_report, stages_report)
     
     # Define o sucesso geral como True, mesmo que processos ou disco falhem (a limpeza de arquivos é o foco)
-    return True, final_message, formatted_size
\ No newline at end of file
+    return True, final_message, formatted_size
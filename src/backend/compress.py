@@ -0,0 +1,144 @@
+import os
+import gzip
+import lzma
+import time
+import shutil
+import zipfile
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, Optional
+
+from src.utils.system import get_allocated_size
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DE COMPRESSÃO
+# ====================================================================
+
+# Codec -> extensão adicionada ao arquivo comprimido
+COMPRESSION_CODECS = {
+    "gzip": ".gz",
+    "lzma": ".xz",
+    "zip": ".zip",
+}
+
+DEFAULT_CODEC = "gzip"
+DEFAULT_MIN_AGE_DAYS = 7
+
+# Arquivos pequenos não compensam o custo; formatos já comprimidos (e os
+# temporários de uma compressão interrompida) são ignorados
+MIN_COMPRESS_SIZE = 4 * 1024
+ALREADY_COMPRESSED_EXTENSIONS = (
+    ".gz", ".xz", ".zip", ".7z", ".rar", ".bz2", ".zst", ".cab", ".lz4", ".tmp",
+)
+
+# Leitura/escrita em blocos: dumps de vários GB nunca ficam inteiros na memória
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+# ====================================================================
+# FUNÇÕES DE COMPRESSÃO
+# ====================================================================
+
+def _compress_file(path: str, codec: str) -> Tuple[str, int, int, Optional[str]]:
+    """
+    Comprime um arquivo no mesmo diretório e remove o original.
+    Executada nos processos do pool. Retorna (caminho, bytes do original no disco,
+    bytes do comprimido no disco, erro), na mesma medida (blocos alocados) da limpeza.
+    Se o resultado não ocupar menos disco que o original, se o destino já existir (ex: um
+    arquivo rotacionado comprimido antes) ou se o original tiver outros hardlinks (removê-lo
+    não liberaria nada), o original é mantido.
+    """
+    dst_path = path + COMPRESSION_CODECS[codec]
+    tmp_path = dst_path + ".tmp"
+
+    try:
+        st = os.stat(path)
+        original_size = get_allocated_size(path, st)
+        if os.path.lexists(dst_path) or st.st_nlink > 1:
+            return path, original_size, original_size, None
+        with open(path, 'rb') as src:
+            if codec == "zip":
+                with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                    with zf.open(os.path.basename(path), 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
+            else:
+                opener = gzip.open if codec == "gzip" else lzma.open
+                with opener(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
+
+        compressed_size = get_allocated_size(tmp_path, os.stat(tmp_path))
+        if compressed_size >= original_size:
+            # Ex: arquivo esparso ou já pequeno no disco: a compressão não libera espaço
+            os.remove(tmp_path)
+            return path, original_size, original_size, None
+
+        # Mantém a data original para que a idade do arquivo continue correta
+        os.utime(tmp_path, (st.st_atime, st.st_mtime))
+        if os.path.lexists(dst_path):
+            # Criado por outro processo durante a compressão: nunca é sobrescrito
+            os.remove(tmp_path)
+            return path, original_size, original_size, None
+        os.replace(tmp_path, dst_path)
+        os.remove(path)
+        return path, original_size, compressed_size, None
+
+    except Exception as e:
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except OSError:
+            pass
+        return path, 0, 0, str(e)
+
+def find_compressible_files(path: str, min_age_days: float) -> List[str]:
+    """Lista os arquivos de um diretório mais antigos que min_age_days e que valem a pena comprimir."""
+    cutoff = time.time() - min_age_days * 24 * 60 * 60
+    candidates = []
+
+    for dirpath, dirnames, filenames in os.walk(path):
+        for filename in filenames:
+            if filename.lower().endswith(ALREADY_COMPRESSED_EXTENSIONS):
+                continue
+            file_path = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(file_path, follow_symlinks=False)
+            except OSError:
+                continue
+            if st.st_mtime < cutoff and st.st_size >= MIN_COMPRESS_SIZE and not os.path.islink(file_path):
+                candidates.append(file_path)
+
+    return candidates
+
+def compress_old_files(path: str, min_age_days: float = DEFAULT_MIN_AGE_DAYS,
+                       codec: str = DEFAULT_CODEC) -> Tuple[int, int, int]:
+    """
+    Comprime no próprio local os arquivos antigos de um diretório, usando um pool
+    de processos do tamanho do número de núcleos.
+    Retorna (bytes economizados no disco, arquivos comprimidos, falhas).
+    """
+    if codec not in COMPRESSION_CODECS:
+        raise ValueError(f"Codec de compressão desconhecido: {codec}")
+
+    if not os.path.exists(path):
+        return 0, 0, 0
+
+    candidates = find_compressible_files(path, min_age_days)
+    if not candidates:
+        return 0, 0, 0
+
+    saved_bytes, compressed_count, failures = 0, 0, 0
+    workers = min(os.cpu_count() or 1, len(candidates))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_compress_file, candidates, [codec] * len(candidates), chunksize=4)
+        for file_path, original_size, compressed_size, error in results:
+            if error:
+                failures += 1
+                logger.debug(f" - Falha ao comprimir '{file_path}': {error}")
+            elif compressed_size < original_size:
+                compressed_count += 1
+                saved_bytes += original_size - compressed_size
+
+    return saved_bytes, compressed_count, failures
@@ -0,0 +1,266 @@
+import os
+import time
+import logging
+import threading
+from typing import Tuple, List, Dict, Any, Optional
+
+from src.utils.system import (
+    get_temp_paths,
+    get_min_file_age,
+    get_required_owner,
+    get_dir_size,
+    get_system_load,
+    lower_current_thread_priority,
+    format_bytes,
+    clean_directory,
+    trim_directory,
+    load_failure_cache,
+    SpaceAccount,
+    CleanupInterrupted,
+)
+from src.backend.cleanup import CACHE_TARGET_PREFIX, DEFAULT_CACHE_BUDGET_MB
+from src.backend.session import is_session_active
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONFIGURAÇÃO PADRÃO DO MONITOR
+# ====================================================================
+
+DAEMON_DEFAULTS: Dict[str, Any] = {
+    # Gatilhos
+    "min_free_percent": 10.0,         # limpa tudo o que for elegível abaixo deste espaço livre
+    "target_max_mb": 512,             # limpa um alvo quando ele passar deste tamanho
+    # Limites de taxa (0 = sem limite)
+    "max_files_per_second": 200,
+    "max_mb_per_second": 20,
+    # Cada ciclo remove no máximo este volume; o restante fica para o próximo ciclo
+    "cycle_max_mb": 256,
+    # Pausa enquanto a carga do sistema (fração da CPU) estiver acima deste valor
+    "max_load": 0.75,
+    "poll_seconds": 60,
+    "size_check_seconds": 15 * 60,
+    "cache_budget_mb": DEFAULT_CACHE_BUDGET_MB,
+}
+
+# Intervalo de reavaliação da carga enquanto o monitor está pausado
+LOAD_RECHECK_SECONDS = 5.0
+
+# Um alvo que não liberou nada só volta a ser percorrido depois de uma espera, que dobra
+# a cada ciclo vazio (começando em 2x poll_seconds) até este limite
+MAX_EMPTY_TARGET_BACKOFF_SECONDS = 6 * 60 * 60
+
+
+class RateLimiter:
+    """
+    Limita a taxa de remoção (arquivos/s e bytes/s) com dois baldes de fichas e pausa
+    enquanto o sistema estiver ocupado. É usado como throttle de um SpaceAccount.
+    """
+
+    def __init__(self, max_files_per_second: float = 0, max_bytes_per_second: float = 0,
+                 max_load: Optional[float] = None, max_bytes: Optional[int] = None,
+                 stop_event: Optional[threading.Event] = None):
+        self.max_files_per_second = max_files_per_second
+        self.max_bytes_per_second = max_bytes_per_second
+        self.max_load = max_load
+        self.max_bytes = max_bytes
+        self.stop_event = stop_event or threading.Event()
+        self.removed_bytes = 0
+        self.paused_seconds = 0.0
+        self._file_tokens = max_files_per_second
+        self._byte_tokens = max_bytes_per_second
+        self._last_refill = time.monotonic()
+        self._last_load_check = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        # Rajada máxima de 1 segundo em cada balde
+        self._file_tokens = min(self.max_files_per_second, self._file_tokens + elapsed * self.max_files_per_second)
+        self._byte_tokens = min(self.max_bytes_per_second, self._byte_tokens + elapsed * self.max_bytes_per_second)
+
+    def wait_for_idle_system(self):
+        """Bloqueia enquanto a carga estiver alta ou o modo jogo estiver ativo (verifica no máximo 1x/s)."""
+        now = time.monotonic()
+        if self.max_load is None or now - self._last_load_check < 1.0:
+            return
+        self._last_load_check = now
+        paused_at = None
+        while not self.stop_event.is_set():
+            load = get_system_load()
+            if (load is None or load <= self.max_load) and not is_session_active():
+                break
+            if paused_at is None:
+                paused_at = time.monotonic()
+                logger.info("Monitor pausado: sistema ocupado (carga alta ou modo jogo ativo).")
+            self.stop_event.wait(LOAD_RECHECK_SECONDS)
+        if paused_at is not None:
+            self.paused_seconds += time.monotonic() - paused_at
+            logger.info("Monitor retomado.")
+            self._last_refill = time.monotonic()
+
+    def __call__(self, size: int):
+        self.removed_bytes += size
+        if self.stop_event.is_set() or (self.max_bytes is not None and self.removed_bytes >= self.max_bytes):
+            raise CleanupInterrupted()
+
+        self.wait_for_idle_system()
+        if self.stop_event.is_set():
+            raise CleanupInterrupted()
+
+        self._refill()
+        self._file_tokens -= 1
+        self._byte_tokens -= size
+        # Fichas negativas = dívida: espera o tempo necessário para quitá-la
+        delay = 0.0
+        if self.max_files_per_second and self._file_tokens < 0:
+            delay = max(delay, -self._file_tokens / self.max_files_per_second)
+        if self.max_bytes_per_second and self._byte_tokens < 0:
+            delay = max(delay, -self._byte_tokens / self.max_bytes_per_second)
+        if delay and self.stop_event.wait(delay):
+            raise CleanupInterrupted()
+
+
+class CleaningDaemon:
+    """
+    Monitor de longa duração: acompanha o espaço livre e o tamanho de cada alvo e,
+    quando um limite é ultrapassado, faz uma limpeza incremental em baixa prioridade,
+    com taxa limitada e pausas automáticas enquanto o sistema estiver ocupado.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.settings = dict(DAEMON_DEFAULTS)
+        self.settings.update(settings or {})
+        self.stop_event = threading.Event()
+        self.target_sizes: Dict[str, int] = {}
+        # Nome -> (instante da próxima tentativa, espera atual) dos alvos que não liberaram nada
+        self._empty_backoff: Dict[str, Tuple[float, float]] = {}
+        self._last_size_check = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Ciclo de vida ---
+
+    def start(self) -> "CleaningDaemon":
+        """Inicia o monitor em uma thread de fundo."""
+        self._thread = threading.Thread(target=self.run_forever, daemon=True, name="BlazeScanDaemon")
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self.stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_forever(self):
+        """Executa ciclos até stop() (modo linha de comando: na thread atual)."""
+        lower_current_thread_priority()
+        logger.info("Monitor de limpeza iniciado em baixa prioridade.")
+        while not self.stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Erro inesperado no monitor de limpeza: {e}")
+            self.stop_event.wait(self.settings["poll_seconds"])
+        logger.info("Monitor de limpeza encerrado.")
+
+    # --- Gatilhos ---
+
+    @staticmethod
+    def _free_percent(path: str) -> Optional[float]:
+        try:
+            import shutil
+            usage = shutil.disk_usage(path)
+            return 100.0 * usage.free / usage.total if usage.total else None
+        except OSError:
+            return None
+
+    def _targets_to_clean(self, temp_paths: Dict[str, str]) -> List[Tuple[str, str, str]]:
+        """Retorna (nome, caminho, motivo) dos alvos que ultrapassaram algum limite."""
+        now = time.monotonic()
+        # O tamanho dos alvos exige uma varredura: só é medido a cada size_check_seconds
+        if now - self._last_size_check >= self.settings["size_check_seconds"]:
+            self._last_size_check = now
+            for name, path in temp_paths.items():
+                if self.stop_event.is_set():
+                    break
+                size = get_dir_size(path)
+                if size > self.target_sizes.get(name, size):
+                    # O alvo cresceu desde a última medição: volta a ser elegível imediatamente
+                    self._empty_backoff.pop(name, None)
+                self.target_sizes[name] = size
+
+        target_max = self.settings["target_max_mb"] * 1024 * 1024
+        selected = []
+        for name, path in temp_paths.items():
+            if now < self._empty_backoff.get(name, (0.0, 0.0))[0]:
+                # Sem espaço livre, o alvo seria percorrido a cada ciclo mesmo sem nada a remover
+                continue
+            free_percent = self._free_percent(path)
+            if free_percent is not None and free_percent < self.settings["min_free_percent"]:
+                selected.append((name, path, f"espaço livre em {free_percent:.1f}%"))
+            elif self.target_sizes.get(name, 0) > target_max:
+                selected.append((name, path, f"tamanho {format_bytes(self.target_sizes[name])}"))
+        return selected
+
+    def _update_backoff(self, name: str, cleaned_size: int):
+        if cleaned_size:
+            self._empty_backoff.pop(name, None)
+            return
+        _, delay = self._empty_backoff.get(name, (0.0, 0.0))
+        delay = min(max(2 * delay, 2 * self.settings["poll_seconds"]), MAX_EMPTY_TARGET_BACKOFF_SECONDS)
+        self._empty_backoff[name] = (time.monotonic() + delay, delay)
+        logger.debug(f"Monitor: '{name}' não liberou nada; próxima tentativa em {delay:.0f}s.")
+
+    # --- Ciclo ---
+
+    def run_once(self) -> int:
+        """Executa um ciclo: verifica os limites e limpa (incrementalmente) os alvos selecionados."""
+        temp_paths = {name: path for name, path in get_temp_paths().items() if os.path.exists(path)}
+        targets = self._targets_to_clean(temp_paths)
+        if not targets:
+            return 0
+
+        limiter = RateLimiter(
+            max_files_per_second=self.settings["max_files_per_second"],
+            max_bytes_per_second=self.settings["max_mb_per_second"] * 1024 * 1024,
+            max_load=self.settings["max_load"],
+            max_bytes=int(self.settings["cycle_max_mb"] * 1024 * 1024) or None,
+            stop_event=self.stop_event,
+        )
+        # Nada é removido enquanto o sistema estiver ocupado
+        limiter.wait_for_idle_system()
+        if self.stop_event.is_set():
+            return 0
+
+        cache_budget = int(self.settings["cache_budget_mb"] * 1024 * 1024)
+        failure_cache = load_failure_cache()
+        total_cleaned = 0
+
+        for name, path, reason in targets:
+            if self.stop_event.is_set() or (limiter.max_bytes is not None and limiter.removed_bytes >= limiter.max_bytes):
+                break
+            account = SpaceAccount(throttle=limiter)
+            try:
+                if name.startswith(CACHE_TARGET_PREFIX):
+                    _, cleaned_size, cleaned_files = trim_directory(path, cache_budget, failure_cache, account)
+                else:
+                    cleaned_size, cleaned_files = clean_directory(path, failure_cache, get_min_file_age(name), account,
+                                                                  get_required_owner(name))
+            except CleanupInterrupted:
+                cleaned_size, cleaned_files = account.on_disk_bytes, account.files
+            except Exception as e:
+                logger.error(f"Monitor: falha ao limpar '{name}' ({path}): {e}")
+                continue
+
+            total_cleaned += cleaned_size
+            self._update_backoff(name, cleaned_size)
+            # Se o alvo continuar acima do limite, o próximo ciclo continua de onde este parou
+            self.target_sizes[name] = max(0, self.target_sizes.get(name, 0) - cleaned_size)
+            logger.info(f"Monitor: '{name}' ({reason}) -> Liberado: {format_bytes(cleaned_size)} "
+                        f"em {cleaned_files} arquivos")
+
+        failure_cache.save()
+        if limiter.paused_seconds:
+            logger.info(f"Monitor: ciclo pausado por {limiter.paused_seconds:.0f}s devido à carga do sistema.")
+        return total_cleaned
@@ -0,0 +1,242 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import List, Dict, Any, Optional
+
+from src.utils.system import get_app_data_dir, format_bytes
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DO HISTÓRICO
+# ====================================================================
+
+HISTORY_DB_FILENAME = "history.sqlite3"
+
+# Política de retenção: execuções mais antigas que isso (ou além do limite) são descartadas
+HISTORY_RETENTION_DAYS = 365
+HISTORY_MAX_RUNS = 5000
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Valor de 'PRAGMA auto_vacuum' no modo incremental
+AUTO_VACUUM_INCREMENTAL = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at  REAL    NOT NULL,
+    duration    REAL    NOT NULL,
+    total_bytes INTEGER NOT NULL,
+    success     INTEGER NOT NULL,
+    settings    TEXT
+);
+CREATE TABLE IF NOT EXISTS targets (
+    run_id      INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    started_at  REAL    NOT NULL,
+    stage       TEXT    NOT NULL,
+    name        TEXT    NOT NULL,
+    path        TEXT,
+    bytes_freed INTEGER NOT NULL,
+    files       INTEGER NOT NULL,
+    duration    REAL    NOT NULL,
+    errors      INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id      INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name        TEXT    NOT NULL,
+    duration    REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at);
+CREATE INDEX IF NOT EXISTS idx_targets_name_time ON targets(name, started_at, bytes_freed);
+CREATE INDEX IF NOT EXISTS idx_targets_run ON targets(run_id);
+CREATE INDEX IF NOT EXISTS idx_stages_run ON stages(run_id, name, duration);
+"""
+
+
+class RunHistory:
+    """
+    Histórico local (SQLite) das execuções do BlazeScan.
+
+    Os índices cobrem as consultas de tendência (crescimento por alvo ao longo do
+    tempo e etapas mais lentas das últimas execuções), que continuam respondendo
+    em milissegundos mesmo com anos de histórico.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join(get_app_data_dir(), HISTORY_DB_FILENAME)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # Conexão sem WAL: o auto_vacuum só é aceito antes de o arquivo do banco ser criado
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            # Permite devolver ao disco as páginas liberadas pela retenção
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+                # Banco criado por uma versão anterior: o modo só vale após um VACUUM completo (uma única vez)
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Uma conexão por operação: a UI e a thread de limpeza usam o histórico em paralelo
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        return conn
+
+    # --- Gravação ---
+
+    def record_run(self, started_at: float, duration: float, total_bytes: int, success: bool,
+                   settings: Dict[str, Any], targets: List[Dict[str, Any]],
+                   stages: List[Dict[str, Any]]) -> int:
+        """Grava uma execução completa (alvos e etapas) e aplica a política de retenção."""
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO runs (started_at, duration, total_bytes, success, settings) VALUES (?, ?, ?, ?, ?)",
+                    (started_at, duration, total_bytes, int(success), json.dumps(settings, default=str)),
+                )
+                run_id = cursor.lastrowid
+                conn.executemany(
+                    "INSERT INTO targets (run_id, started_at, stage, name, path, bytes_freed, files, duration, errors) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (run_id, t.get("started_at", started_at), t["stage"], t["name"], t.get("path"),
+                         t.get("bytes", 0), t.get("files", 0), t.get("duration", 0.0), t.get("errors", 0))
+                        for t in targets
+                    ],
+                )
+                conn.executemany(
+                    "INSERT INTO stages (run_id, name, duration) VALUES (?, ?, ?)",
+                    [(run_id, s["name"], s["duration"]) for s in stages],
+                )
+                self._apply_retention(conn)
+            # Devolve ao disco as páginas liberadas. Fora da transação e via executescript:
+            # execute() avança o pragma um único passo e libera só uma página
+            conn.executescript("PRAGMA incremental_vacuum;")
+        finally:
+            conn.close()
+        return run_id
+
+    def _apply_retention(self, conn: sqlite3.Connection):
+        cutoff = time.time() - HISTORY_RETENTION_DAYS * SECONDS_PER_DAY
+        conn.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,))
+        conn.execute(
+            "DELETE FROM runs WHERE id <= (SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?)",
+            (HISTORY_MAX_RUNS,),
+        )
+
+    # --- Consultas de tendência ---
+
+    def growth_rate(self, target_name: str, days: float = 30) -> Optional[float]:
+        """
+        Estima quantos bytes por dia um alvo acumula, a partir do que foi liberado
+        em cada execução dentro da janela. Retorna None se não houver dados suficientes.
+        """
+        since = time.time() - days * SECONDS_PER_DAY
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT MIN(started_at), MAX(started_at), SUM(bytes_freed), COUNT(*) "
+                "FROM targets WHERE name = ? AND started_at >= ?",
+                (target_name, since),
+            ).fetchone()
+            first_at, last_at, total_bytes, count = row
+            if count < 2 or last_at <= first_at:
+                return None
+
+            # O que foi liberado na primeira execução acumulou antes da janela
+            first_bytes = conn.execute(
+                "SELECT bytes_freed FROM targets WHERE name = ? AND started_at >= ? ORDER BY started_at LIMIT 1",
+                (target_name, since),
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+        return (total_bytes - first_bytes) / ((last_at - first_at) / SECONDS_PER_DAY)
+
+    def slowest_stages(self, last_runs: int = 30) -> List[Dict[str, Any]]:
+        """Retorna as etapas ordenadas pela duração média nas últimas N execuções."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT name, AVG(duration), MAX(duration), COUNT(*) FROM stages "
+                "WHERE run_id IN (SELECT id FROM runs ORDER BY started_at DESC LIMIT ?) "
+                "GROUP BY name ORDER BY AVG(duration) DESC",
+                (last_runs,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [{"name": r[0], "avg_duration": r[1], "max_duration": r[2], "runs": r[3]} for r in rows]
+
+    def recent_runs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Retorna as execuções mais recentes."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, started_at, duration, total_bytes, success FROM runs ORDER BY started_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {"id": r[0], "started_at": r[1], "duration": r[2], "total_bytes": r[3], "success": bool(r[4])}
+            for r in rows
+        ]
+
+    def last_target_results(self) -> Dict[str, Dict[str, int]]:
+        """Resultado mais recente de cada alvo (arquivos e bytes), usado como estimativa de progresso."""
+        conn = self._connect()
+        try:
+            # Com MAX(), o SQLite retorna as demais colunas da linha que contém o máximo
+            rows = conn.execute(
+                "SELECT name, MAX(started_at), files, bytes_freed FROM targets GROUP BY name"
+            ).fetchall()
+        finally:
+            conn.close()
+        return {r[0]: {"files": r[2], "bytes": r[3]} for r in rows}
+
+    def target_names(self) -> List[str]:
+        """Retorna os nomes de alvos presentes no histórico."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT DISTINCT name FROM targets ORDER BY name").fetchall()
+        finally:
+            conn.close()
+        return [r[0] for r in rows]
+
+
+# ====================================================================
+# RELATÓRIO DE TENDÊNCIAS (compartilhado entre UI e CLI)
+# ====================================================================
+
+def format_trends_report(history: Optional[RunHistory] = None, days: float = 30, last_runs: int = 30) -> str:
+    """Monta um relatório em texto com as tendências do histórico."""
+    history = history or RunHistory()
+    lines = ["--- Execuções Recentes ---"]
+
+    runs = history.recent_runs(10)
+    if not runs:
+        return "Nenhuma execução registrada no histórico."
+
+    for run in runs:
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(run["started_at"]))
+        status = "OK" if run["success"] else "ERRO"
+        lines.append(f"{started} | {format_bytes(run['total_bytes'])} | {run['duration']:.1f}s | {status}")
+
+    lines.append(f"\n--- Crescimento por Alvo (últimos {days:g} dias) ---")
+    for name in history.target_names():
+        rate = history.growth_rate(name, days)
+        if rate is not None:
+            lines.append(f"{name}: {format_bytes(int(max(rate, 0)))}/dia")
+
+    lines.append(f"\n--- Etapas Mais Lentas (últimas {last_runs} execuções) ---")
+    for stage in history.slowest_stages(last_runs):
+        lines.append(f"{stage['name']}: média {stage['avg_duration']:.2f}s | máx. {stage['max_duration']:.2f}s")
+
+    return "\n".join(lines)
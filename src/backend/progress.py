@@ -0,0 +1,164 @@
+import time
+import threading
+from typing import List, Dict, Any, Optional
+
+# ====================================================================
+# CONSTANTES DO PROGRESSO
+# ====================================================================
+
+# Suavização da taxa (média móvel exponencial entre leituras)
+THROUGHPUT_SMOOTHING = 0.3
+
+TARGET_PENDING = "pendente"
+TARGET_RUNNING = "em andamento"
+TARGET_DONE = "concluído"
+
+
+class ProgressTracker:
+    """
+    Progresso de uma execução, por etapa e por alvo.
+
+    O backend apenas incrementa contadores (advance é barato e pode ser chamado a cada
+    arquivo); quem exibe o progresso chama snapshot() no seu próprio ritmo (ex: a UI a
+    uma taxa fixa de quadros), então o volume de arquivos nunca inunda a interface.
+    As estimativas de cada alvo (ex: resultado da execução anterior) permitem calcular o ETA.
+    """
+
+    def __init__(self, stages: Optional[List[str]] = None,
+                 estimates: Optional[Dict[str, Dict[str, int]]] = None):
+        self.stages = list(stages or [])
+        self.estimates = estimates or {}
+        self.completed_stages = 0
+        self.current_stage: Optional[str] = None
+        self.targets: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    # --- Chamado pelo backend ---
+
+    def start_stage(self, name: str):
+        with self._lock:
+            self.current_stage = name
+
+    def finish_stage(self, name: str):
+        with self._lock:
+            self.completed_stages += 1
+            if self.current_stage == name:
+                self.current_stage = None
+
+    def add_targets(self, names: List[str]):
+        """Registra os alvos da etapa atual (aparecem como pendentes)."""
+        with self._lock:
+            for name in names:
+                estimate = self.estimates.get(name, {})
+                self.targets.setdefault(name, {
+                    "name": name,
+                    "stage": self.current_stage,
+                    "state": TARGET_PENDING,
+                    "files": 0,
+                    "bytes": 0,
+                    "estimated_files": estimate.get("files"),
+                    "estimated_bytes": estimate.get("bytes"),
+                    "started": None,
+                    "finished": None,
+                    "rate": 0.0,
+                    "_sample": None,
+                })
+
+    def start_target(self, name: str):
+        self.add_targets([name])
+        with self._lock:
+            target = self.targets[name]
+            target["state"] = TARGET_RUNNING
+            target["started"] = time.monotonic()
+            target["_sample"] = (target["started"], 0)
+
+    def advance(self, name: str, files: int = 1, size: int = 0):
+        with self._lock:
+            target = self.targets.get(name)
+            if target is not None:
+                target["files"] += files
+                target["bytes"] += size
+
+    def finish_target(self, name: str, files: Optional[int] = None, size: Optional[int] = None):
+        """Conclui um alvo; files/size substituem os contadores quando informados (ex: quarentena)."""
+        with self._lock:
+            target = self.targets.get(name)
+            if target is None:
+                return
+            if files is not None:
+                target["files"] = files
+            if size is not None:
+                target["bytes"] = size
+            target["state"] = TARGET_DONE
+            target["finished"] = time.monotonic()
+
+    def target_callback(self, name: str):
+        """Throttle para SpaceAccount: conta cada arquivo removido e os bytes liberados no disco."""
+        return lambda size: self.advance(name, 1, size)
+
+    # --- Chamado por quem exibe ---
+
+    def _update_rate(self, target: Dict[str, Any], now: float):
+        sample = target["_sample"]
+        if sample is None or target["state"] != TARGET_RUNNING:
+            return
+        last_time, last_bytes = sample
+        elapsed = now - last_time
+        if elapsed <= 0:
+            return
+        instant = (target["bytes"] - last_bytes) / elapsed
+        target["rate"] = instant if target["rate"] == 0 else (
+            THROUGHPUT_SMOOTHING * instant + (1 - THROUGHPUT_SMOOTHING) * target["rate"])
+        target["_sample"] = (now, target["bytes"])
+
+    @staticmethod
+    def _target_fraction(target: Dict[str, Any]) -> float:
+        if target["state"] == TARGET_DONE:
+            return 1.0
+        if target["state"] == TARGET_PENDING:
+            return 0.0
+        estimated = target["estimated_bytes"]
+        if estimated:
+            return min(target["bytes"] / estimated, 0.99)
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado atual: uma linha por alvo (com taxa e ETA) e a fração geral concluída."""
+        now = time.monotonic()
+        with self._lock:
+            rows = []
+            for target in self.targets.values():
+                self._update_rate(target, now)
+                eta = None
+                if target["state"] == TARGET_RUNNING and target["estimated_bytes"] and target["rate"] > 0:
+                    eta = max(target["estimated_bytes"] - target["bytes"], 0) / target["rate"]
+                elif target["state"] == TARGET_DONE:
+                    eta = 0.0
+                rows.append({
+                    "name": target["name"],
+                    "state": target["state"],
+                    "files": target["files"],
+                    "bytes": target["bytes"],
+                    "rate": target["rate"] if target["state"] == TARGET_RUNNING else 0.0,
+                    "eta": eta,
+                })
+
+            # A etapa em andamento contribui com a fração concluída dos seus alvos
+            stage_targets = [t for t in self.targets.values() if t["stage"] == self.current_stage]
+            stage_fraction = 0.0
+            if self.current_stage is not None and stage_targets:
+                stage_fraction = sum(self._target_fraction(t) for t in stage_targets) / len(stage_targets)
+            total_stages = max(len(self.stages), 1)
+            overall = min((self.completed_stages + stage_fraction) / total_stages, 1.0)
+
+            return {"stage": self.current_stage, "overall": overall, "targets": rows}
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Formata o ETA (mm:ss ou h:mm:ss); '--' quando não há estimativa."""
+    if seconds is None:
+        return "--"
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
@@ -0,0 +1,327 @@
+import os
+import json
+import errno
+import stat
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from typing import Tuple, List, Dict, Any, Optional
+
+from src.utils.system import (
+    get_app_data_dir,
+    clean_directory,
+    is_protected_temp_entry,
+    format_bytes,
+    lower_current_thread_priority,
+)
+from src.utils.failure_cache import FailureCache
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DA QUARENTENA
+# ====================================================================
+
+QUARANTINE_DIRNAME = ".blazescan_quarantine"
+MANIFESTS_DIRNAME = "quarantine_manifests"
+
+# Por padrão, uma limpeza pode ser desfeita durante 24 horas
+DEFAULT_RETENTION_HOURS = 24
+
+_purge_lock = threading.Lock()
+_cancelled_batches = set()
+
+
+# ====================================================================
+# FUNÇÕES AUXILIARES
+# ====================================================================
+
+def _manifests_dir() -> str:
+    return os.path.join(get_app_data_dir(), MANIFESTS_DIRNAME)
+
+def _manifest_path(batch_id: str) -> str:
+    return os.path.join(_manifests_dir(), f"{batch_id}.json")
+
+def _save_manifest(manifest: Dict[str, Any]):
+    os.makedirs(_manifests_dir(), exist_ok=True)
+    path = _manifest_path(manifest["batch_id"])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+def _load_manifests() -> List[Dict[str, Any]]:
+    """Retorna os lotes em quarentena, do mais antigo para o mais recente."""
+    manifests = []
+    try:
+        filenames = os.listdir(_manifests_dir())
+    except FileNotFoundError:
+        return []
+
+    for filename in filenames:
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(_manifests_dir(), filename), 'r', encoding='utf-8') as f:
+                manifests.append(json.load(f))
+        except Exception as e:
+            logger.debug(f"Manifesto de quarentena ilegível '{filename}': {e}")
+
+    return sorted(manifests, key=lambda m: m.get("created", 0))
+
+def _quarantine_root_for(path: str) -> Optional[str]:
+    """
+    Escolhe a pasta de quarentena no MESMO volume do alvo, para que a movimentação
+    seja um rename atômico (O(1)) e não uma cópia. Retorna None se nenhuma estiver
+    no mesmo volume (ex: alvo em um tmpfs montado direto em /tmp).
+    """
+    try:
+        target_dev = os.stat(path).st_dev
+    except OSError:
+        return None
+
+    preferred_root = os.path.join(get_app_data_dir(), QUARANTINE_DIRNAME)
+    try:
+        os.makedirs(preferred_root, exist_ok=True)
+        if os.stat(preferred_root).st_dev == target_dev:
+            return preferred_root
+    except OSError:
+        pass
+
+    parent_dir = os.path.dirname(os.path.abspath(path))
+    try:
+        if os.stat(parent_dir).st_dev == target_dev:
+            return os.path.join(parent_dir, QUARANTINE_DIRNAME)
+    except OSError:
+        pass
+    return None
+
+def _quarantine_entries(src_dir: str, dst_dir: str, rel_dir: str, items: List[str],
+                        failure_cache: Optional[FailureCache], min_mtime: Optional[float] = None,
+                        owner_uid: Optional[int] = None):
+    """
+    Move cada item de src_dir para dst_dir com um único rename.
+    Se uma pasta não puder ser movida inteira (arquivo em uso), desce nela e move o que for possível.
+    Com min_mtime, as pastas são sempre percorridas e só arquivos sem uso recente são movidos.
+    """
+    try:
+        entries = list(os.scandir(src_dir))
+    except OSError as e:
+        logger.debug(f" - Falha ao listar '{src_dir}': {e}")
+        return
+
+    for entry in entries:
+        if is_protected_temp_entry(entry.name):
+            continue
+        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+
+        if failure_cache is not None and failure_cache.should_skip(entry.path, st.st_mtime):
+            continue
+        if owner_uid is not None and st.st_uid != owner_uid:
+            # Item de outro usuário em uma pasta compartilhada (ex: /tmp)
+            continue
+
+        is_plain_dir = entry.is_dir(follow_symlinks=False) and not entry.is_symlink()
+        if min_mtime is not None:
+            if is_plain_dir:
+                _quarantine_entries(entry.path, os.path.join(dst_dir, entry.name), rel_path, items,
+                                    failure_cache, min_mtime, owner_uid)
+                continue
+            if not stat.S_ISREG(st.st_mode) or max(st.st_mtime, st.st_atime) > min_mtime:
+                continue
+
+        try:
+            os.makedirs(dst_dir, exist_ok=True)
+            os.rename(entry.path, os.path.join(dst_dir, entry.name))
+            items.append(rel_path)
+            if failure_cache is not None:
+                failure_cache.record_success(entry.path)
+        except OSError as e:
+            if e.errno == errno.EXDEV:
+                # Ponto de montagem dentro do alvo: mover seria uma cópia, então o item é mantido
+                logger.debug(f" - Mantido fora da quarentena (outro volume): '{entry.path}'")
+            elif is_plain_dir:
+                _quarantine_entries(entry.path, os.path.join(dst_dir, entry.name), rel_path, items,
+                                    failure_cache, owner_uid=owner_uid)
+            else:
+                logger.debug(f" - Falha ao mover '{entry.path}' para a quarentena: {e}")
+                if failure_cache is not None:
+                    failure_cache.record_failure(entry.path, e, st.st_mtime)
+
+
+# ====================================================================
+# QUARENTENA, DESFAZER E PURGA
+# ====================================================================
+
+def new_batch(settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Cria o manifesto de um novo lote de quarentena (um por execução)."""
+    retention_hours = (settings or {}).get("quarantine_retention_hours", DEFAULT_RETENTION_HOURS)
+    return {
+        "batch_id": time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6],
+        "created": time.time(),
+        "retention_hours": retention_hours,
+        "targets": [],
+    }
+
+def quarantine_directory(batch: Dict[str, Any], name: str, path: str,
+                         failure_cache: Optional[FailureCache] = None, min_age: Optional[float] = None,
+                         owner_uid: Optional[int] = None) -> int:
+    """
+    Move o conteúdo de um diretório alvo para a quarentena e registra no manifesto do lote.
+    Retorna o número de itens movidos. O espaço só é liberado na purga.
+    """
+    if not os.path.exists(path):
+        return 0
+
+    quarantine_root = _quarantine_root_for(path)
+    if quarantine_root is None:
+        logger.warning(f"Quarentena indisponível para '{path}': nenhuma pasta de quarentena no mesmo volume. "
+                       f"O conteúdo foi mantido.")
+        return 0
+
+    slot = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+    quarantine_dir = os.path.join(quarantine_root, batch["batch_id"], slot)
+    items: List[str] = []
+
+    min_mtime = time.time() - min_age if min_age else None
+    _quarantine_entries(path, quarantine_dir, "", items, failure_cache, min_mtime, owner_uid)
+
+    if items:
+        batch["targets"].append({
+            "name": name,
+            "path": os.path.abspath(path),
+            "quarantine_dir": quarantine_dir,
+            "items": items,
+        })
+        _save_manifest(batch)
+
+    return len(items)
+
+def _purge_batch(manifest: Dict[str, Any]) -> int:
+    """Apaga definitivamente o conteúdo de um lote. Retorna os bytes liberados."""
+    batch_id = manifest["batch_id"]
+    freed_bytes = 0
+
+    for target in manifest.get("targets", []):
+        if batch_id in _cancelled_batches:
+            logger.info(f"Purga do lote {batch_id} interrompida para desfazer a limpeza.")
+            return freed_bytes
+
+        purged_bytes, _ = clean_directory(target["quarantine_dir"])
+        freed_bytes += purged_bytes
+
+    if not _remove_batch_files(manifest):
+        logger.warning(f"Quarentena {batch_id}: alguns itens não puderam ser apagados; "
+                       f"nova tentativa na próxima purga.")
+    return freed_bytes
+
+def _remove_batch_files(manifest: Dict[str, Any]) -> bool:
+    """
+    Remove as pastas vazias de um lote e, se nenhum item restou na quarentena, o manifesto.
+    Retorna False se algo permaneceu (o lote continua registrado para a próxima purga ou para desfazer).
+    """
+    emptied = True
+    for target in manifest.get("targets", []):
+        quarantine_dir = target["quarantine_dir"]
+        for dirpath, _, _ in os.walk(quarantine_dir, topdown=False):
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+        if os.path.lexists(quarantine_dir):
+            emptied = False
+            continue
+        try:
+            os.rmdir(os.path.dirname(quarantine_dir))
+        except OSError:
+            pass
+
+    if not emptied:
+        return False
+    try:
+        os.remove(_manifest_path(manifest["batch_id"]))
+    except OSError:
+        pass
+    return True
+
+def _run_purge(purge_all: bool):
+    lower_current_thread_priority()
+
+    with _purge_lock:
+        now = time.time()
+        for manifest in _load_manifests():
+            expires_at = manifest.get("created", 0) + manifest.get("retention_hours", DEFAULT_RETENTION_HOURS) * 3600
+            if not purge_all and now < expires_at:
+                continue
+            freed_bytes = _purge_batch(manifest)
+            logger.info(f"Quarentena {manifest['batch_id']} purgada. Liberado: {format_bytes(freed_bytes)}")
+
+def start_background_purge(purge_all: bool = False) -> threading.Thread:
+    """
+    Inicia, em uma thread de baixa prioridade, a purga dos lotes cujo período
+    de retenção expirou (ou de todos, se purge_all=True).
+    """
+    purge_thread = threading.Thread(target=_run_purge, args=(purge_all,), daemon=True, name="BlazeScanPurge")
+    purge_thread.start()
+    return purge_thread
+
+def list_undoable_batches() -> List[Dict[str, Any]]:
+    """Lista os lotes que ainda podem ser desfeitos (mais recente primeiro)."""
+    return list(reversed(_load_manifests()))
+
+def undo_batch(batch_id: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Restaura os itens de um lote de quarentena para seus locais de origem.
+    Sem batch_id, desfaz a limpeza mais recente.
+    """
+    if batch_id is None:
+        batches = list_undoable_batches()
+        if not batches:
+            return False, "Nenhuma limpeza disponível para desfazer."
+        batch_id = batches[0]["batch_id"]
+
+    # Interrompe uma purga em andamento deste lote; a restauração inteira acontece sob o
+    # lock da purga, então nenhuma purga apaga o lote enquanto ele é restaurado
+    _cancelled_batches.add(batch_id)
+    try:
+        with _purge_lock:
+            # Relido sob o lock: o lote pode ter sido purgado enquanto a purga terminava
+            manifest = next((m for m in _load_manifests() if m["batch_id"] == batch_id), None)
+            if manifest is None:
+                return False, "Nenhuma limpeza disponível para desfazer."
+
+            restored, conflicts = 0, 0
+            for target in manifest.get("targets", []):
+                for rel_path in target["items"]:
+                    src = os.path.join(target["quarantine_dir"], rel_path)
+                    dst = os.path.join(target["path"], rel_path)
+                    if not os.path.lexists(src):
+                        continue
+                    if os.path.lexists(dst):
+                        conflicts += 1
+                        logger.warning(f"Não restaurado (já existe no destino): {dst}")
+                        continue
+                    try:
+                        os.makedirs(os.path.dirname(dst), exist_ok=True)
+                        os.rename(src, dst)
+                        restored += 1
+                    except OSError as e:
+                        conflicts += 1
+                        logger.warning(f"Falha ao restaurar '{dst}': {e}")
+
+            # Remove as pastas que ficaram vazias; o manifesto só sai se nada restou na quarentena
+            _remove_batch_files(manifest)
+    finally:
+        _cancelled_batches.discard(batch_id)
+
+    msg = f"Limpeza {batch_id} desfeita: {restored} itens restaurados."
+    if conflicts:
+        msg += f" {conflicts} itens permaneceram na quarentena."
+    logger.info(msg)
+    return True, msg
@@ -0,0 +1,248 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import subprocess
+from typing import Tuple, List, Dict, Any, Optional
+
+from src.utils.system import get_app_data_dir, get_platform_backend, set_power_plan
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DO MODO JOGO
+# ====================================================================
+
+SESSION_FILENAME = "game_session.json"
+
+DEFAULT_SESSION_PLAN = "MAXIMUM_PERFORMANCE"
+
+# Intervalo de verificação do processo do jogo (antes e depois de ele abrir)
+WATCH_POLL_SECONDS = 2.0
+
+_session_lock = threading.Lock()
+# Um evento por monitor: iniciar uma sessão nova nunca reativa um monitor já interrompido
+_watcher_stops: List[threading.Event] = []
+_watchers_lock = threading.Lock()
+
+
+# ====================================================================
+# SNAPSHOT PERSISTIDO
+# ====================================================================
+
+def _session_path() -> str:
+    return os.path.join(get_app_data_dir(), SESSION_FILENAME)
+
+def _save_snapshot(snapshot: Dict[str, Any]):
+    os.makedirs(get_app_data_dir(), exist_ok=True)
+    path = _session_path()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+def load_snapshot() -> Optional[Dict[str, Any]]:
+    """Retorna o snapshot da sessão ativa (persistido: sobrevive ao fechamento do programa), ou None."""
+    try:
+        with open(_session_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Snapshot do modo jogo ilegível: {e}")
+        return None
+
+def is_session_active() -> bool:
+    return load_snapshot() is not None
+
+
+# ====================================================================
+# INÍCIO E RESTAURAÇÃO DA SESSÃO
+# ====================================================================
+
+def _launch_detached(path: str):
+    """
+    Relança um aplicativo desvinculado do BlazeScan e SEM os privilégios dele: o BlazeScan
+    roda como administrador, mas navegadores e comunicadores devem voltar como o usuário.
+    """
+    if sys.platform == 'win32':
+        # O explorer.exe iniciado por um processo elevado repassa a abertura ao shell do
+        # usuário (não elevado), que é quem cria o processo do aplicativo
+        explorer = os.path.join(os.environ.get('SystemRoot', r'C:\Windows'), 'explorer.exe')
+        subprocess.Popen([explorer, path], close_fds=True,
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+
+    kwargs: Dict[str, Any] = {}
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        # Executado via sudo: volta ao usuário que chamou; sem ele, não relança como root
+        sudo_uid, sudo_gid = os.environ.get('SUDO_UID'), os.environ.get('SUDO_GID')
+        if not sudo_uid or not sudo_gid:
+            raise PermissionError("usuário original desconhecido (BlazeScan executado como root)")
+        import pwd
+        user = pwd.getpwuid(int(sudo_uid))
+        kwargs.update(user=user.pw_uid, group=int(sudo_gid), extra_groups=[],
+                      env={**os.environ, 'HOME': user.pw_dir, 'USER': user.pw_name, 'LOGNAME': user.pw_name})
+    subprocess.Popen([path], start_new_session=True, close_fds=True,
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs)
+
+def start_session(plan_key: str = DEFAULT_SESSION_PLAN, processes: Optional[List[str]] = None,
+                  watch_process: Optional[str] = None, on_restore=None) -> Tuple[bool, str]:
+    """
+    Inicia o modo jogo: registra o plano de energia ativo e os aplicativos que serão
+    encerrados (uma leitura da tabela de processos e uma consulta de energia), aplica o
+    perfil de desempenho e, se watch_process for informado, restaura tudo quando o jogo fechar
+    (on_restore(sucesso, mensagem) é chamado nesse momento).
+    """
+    backend = get_platform_backend()
+
+    with _session_lock:
+        if load_snapshot() is not None:
+            return False, "O modo jogo já está ativo. Restaure a sessão anterior primeiro."
+
+        wanted = {backend.normalize_process_name(p): p for p in (processes or backend.get_processes_to_kill())}
+
+        # Uma única leitura da tabela de processos
+        running = backend.list_processes()
+        stopped: Dict[str, Dict[str, Any]] = {}
+        for process in running:
+            key = backend.normalize_process_name(process["name"])
+            if key not in wanted:
+                continue
+            entry = stopped.setdefault(key, {"name": wanted[key], "paths": []})
+            path = process.get("path") or backend.get_process_path(process["pid"])
+            # Aplicativos com várias instâncias (ex: navegadores) são relançados uma única vez
+            if path and path not in entry["paths"]:
+                entry["paths"].append(path)
+
+        snapshot = {
+            "started_at": time.time(),
+            "power_plan": backend.get_active_power_plan(),
+            "applied_plan": plan_key,
+            "processes": list(stopped.values()),
+            "watch_process": watch_process,
+        }
+        # Grava antes de alterar o sistema: uma falha no meio ainda pode ser desfeita
+        _save_snapshot(snapshot)
+
+    messages = []
+    if stopped:
+        _, terminated = backend.terminate_processes([entry["name"] for entry in stopped.values()])
+        messages.append(f"Aplicativos encerrados: {', '.join(terminated) or 'nenhum'}")
+    else:
+        messages.append("Nenhum aplicativo para encerrar.")
+
+    if plan_key and plan_key != "NONE":
+        success_power, msg_power = set_power_plan(plan_key)
+        if not success_power and plan_key == "MAXIMUM_PERFORMANCE":
+            success_power, msg_power = set_power_plan("HIGH_PERFORMANCE")
+        messages.append(msg_power)
+
+    if watch_process:
+        _start_watcher(watch_process, on_restore)
+        messages.append(f"A sessão será restaurada quando '{watch_process}' for fechado.")
+
+    logger.info("Modo jogo iniciado.")
+    return True, "Modo jogo iniciado. " + " | ".join(messages)
+
+def restore_session(relaunch: bool = True) -> Tuple[bool, str]:
+    """Restaura o plano de energia e relança os aplicativos encerrados pelo modo jogo."""
+    backend = get_platform_backend()
+    _stop_watchers()
+
+    with _session_lock:
+        snapshot = load_snapshot()
+        if snapshot is None:
+            return False, "Nenhuma sessão do modo jogo para restaurar."
+
+        messages = []
+        overall_success = True
+
+        if snapshot.get("power_plan"):
+            success_power, msg_power = backend.restore_power_plan(snapshot["power_plan"])
+            overall_success = overall_success and success_power
+            messages.append(msg_power)
+
+        if relaunch:
+            # Uma leitura da tabela: aplicativos que o usuário já reabriu não são duplicados
+            running = {backend.normalize_process_name(p["name"]) for p in backend.list_processes()}
+            relaunched, failed = [], []
+            for entry in snapshot.get("processes", []):
+                if backend.normalize_process_name(entry["name"]) in running:
+                    continue
+                for path in entry.get("paths", [])[:1]:
+                    try:
+                        _launch_detached(path)
+                        relaunched.append(entry["name"])
+                    except OSError as e:
+                        logger.warning(f"Falha ao relançar '{path}': {e}")
+                        failed.append(entry["name"])
+            if relaunched:
+                messages.append(f"Aplicativos relançados: {', '.join(relaunched)}")
+            if failed:
+                overall_success = False
+                messages.append(f"Falha ao relançar: {', '.join(failed)}")
+
+        try:
+            os.remove(_session_path())
+        except OSError as e:
+            logger.warning(f"Não foi possível remover o snapshot do modo jogo: {e}")
+
+    logger.info("Sessão do modo jogo restaurada.")
+    return overall_success, "Sessão restaurada. " + (" | ".join(messages) or "Nenhuma alteração pendente.")
+
+
+# ====================================================================
+# MONITORAMENTO DO PROCESSO DO JOGO
+# ====================================================================
+
+def _find_pids(process_name: str) -> List[int]:
+    backend = get_platform_backend()
+    wanted = backend.normalize_process_name(process_name)
+    return [p["pid"] for p in backend.list_processes() if backend.normalize_process_name(p["name"]) == wanted]
+
+def _watch(process_name: str, on_restore, stop_event: threading.Event):
+    backend = get_platform_backend()
+
+    # Aguarda o jogo abrir (o modo pode ser ativado antes do jogo)
+    pids: List[int] = []
+    while not pids and not stop_event.is_set():
+        pids = _find_pids(process_name)
+        if not pids:
+            stop_event.wait(WATCH_POLL_SECONDS)
+
+    # Depois, só consulta os PIDs conhecidos, sem reler a tabela inteira
+    while pids and not stop_event.is_set():
+        pids = [pid for pid in pids if backend.is_process_alive(pid)]
+        if pids:
+            stop_event.wait(WATCH_POLL_SECONDS)
+
+    if stop_event.is_set():
+        return
+
+    logger.info(f"'{process_name}' foi fechado. Restaurando a sessão...")
+    result = restore_session()
+    if on_restore is not None:
+        on_restore(*result)
+
+def _stop_watchers():
+    """Interrompe todos os monitores em andamento."""
+    with _watchers_lock:
+        for stop_event in _watcher_stops:
+            stop_event.set()
+        _watcher_stops.clear()
+
+def _start_watcher(process_name: str, on_restore=None) -> threading.Thread:
+    stop_event = threading.Event()
+    with _watchers_lock:
+        _watcher_stops.append(stop_event)
+    thread = threading.Thread(target=_watch, args=(process_name, on_restore, stop_event), daemon=True,
+                              name="BlazeScanGameWatcher")
+    thread.start()
+    return thread
+
+def watch_game(process_name: str, on_restore=None) -> threading.Thread:
+    """Restaura a sessão ativa quando o processo do jogo terminar (ex: ao reabrir o programa)."""
+    return _start_watcher(process_name, on_restore)
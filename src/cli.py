@@ -0,0 +1,218 @@
+"""
+BlazeScan - Interface de linha de comando (modos sem interface gráfica)
+"""
+
+import os
+import argparse
+import logging
+from typing import List
+
+logger = logging.getLogger('BlazeScan')
+
+FLEET_TOKEN_ENV = "BLAZESCAN_TOKEN"
+
+# Primeiros argumentos que desviam o main.py para a linha de comando; qualquer outro abre a interface
+CLI_COMMANDS = ("historico", "agente", "frota", "sessao", "monitor", "-h", "--help")
+
+
+# ====================================================================
+# COMANDOS
+# ====================================================================
+
+def command_history(args: argparse.Namespace) -> int:
+    """Mostra as tendências do histórico de execuções."""
+    from src.backend.history import RunHistory, format_trends_report
+
+    history = RunHistory()
+    if args.alvo:
+        rate = history.growth_rate(args.alvo, args.dias)
+        if rate is None:
+            print(f"Dados insuficientes para '{args.alvo}' nos últimos {args.dias:g} dias.")
+            return 1
+        from src.utils.system import format_bytes
+        print(f"{args.alvo}: {format_bytes(int(max(rate, 0)))}/dia (últimos {args.dias:g} dias)")
+        return 0
+
+    print(format_trends_report(history, days=args.dias, last_runs=args.execucoes))
+    return 0
+
+
+def _get_token(args: argparse.Namespace) -> str:
+    # Preferir a variável de ambiente evita que o token fique no histórico do shell
+    return args.token or os.environ.get(FLEET_TOKEN_ENV, "")
+
+def command_agent(args: argparse.Namespace) -> int:
+    """Inicia o agente de frota nesta máquina."""
+    from src.fleet.agent import FleetAgent, DEFAULT_AGENT_HOST, ALL_INTERFACES_HOSTS
+
+    token = _get_token(args)
+    if not token:
+        print(f"Informe o token com --token ou pela variável de ambiente {FLEET_TOKEN_ENV}.")
+        return 2
+
+    host = ALL_INTERFACES_HOSTS[0] if args.todas_interfaces and args.host == DEFAULT_AGENT_HOST else args.host
+    if host in ALL_INTERFACES_HOSTS and not args.todas_interfaces:
+        print("Para ouvir em todas as interfaces, use --todas-interfaces.")
+        return 2
+    if args.todas_interfaces:
+        logger.warning("O agente aceitará conexões de qualquer interface de rede (HTTP sem criptografia).")
+
+    agent = FleetAgent(token, host=host, port=args.porta, allow_all_interfaces=args.todas_interfaces)
+    try:
+        agent.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Agente encerrado pelo usuário (Ctrl+C).")
+    finally:
+        agent.stop()
+    return 0
+
+def command_fleet(args: argparse.Namespace) -> int:
+    """Dispara uma limpeza em vários agentes e mostra o resultado agregado."""
+    from src.fleet.coordinator import FleetCoordinator, format_fleet_report
+
+    token = _get_token(args)
+    if not token:
+        print(f"Informe o token com --token ou pela variável de ambiente {FLEET_TOKEN_ENV}.")
+        return 2
+
+    agents = [a for a in args.agentes.split(",") if a.strip()]
+    if args.arquivo:
+        with open(args.arquivo, 'r', encoding='utf-8') as f:
+            agents += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not agents:
+        print("Nenhum agente informado.")
+        return 2
+
+    settings = {"energy_plan": args.plano, "optimize_disk": args.otimizar_disco}
+
+    def on_event(agent: str, event: dict):
+        if args.verboso:
+            print(f"[{agent}] {event.get('message', '')}")
+
+    coordinator = FleetCoordinator(agents, token, max_parallel=args.paralelo)
+    results = coordinator.run_cleanup(settings, on_event)
+    print(format_fleet_report(results))
+    return 0 if all(r.get("ok") and r.get("success") for r in results) else 1
+
+
+def command_session(args: argparse.Namespace) -> int:
+    """Inicia, restaura ou consulta o modo jogo."""
+    import threading
+    from src.backend.session import start_session, restore_session, load_snapshot
+
+    if args.acao == "restaurar":
+        success, message = restore_session(relaunch=not args.sem_relancar)
+        print(message)
+        return 0 if success else 1
+
+    if args.acao == "estado":
+        print("Modo jogo ativo." if load_snapshot() else "Modo jogo inativo.")
+        return 0
+
+    restored = threading.Event()
+    result = []
+
+    def on_restore(success: bool, message: str):
+        result.append((success, message))
+        restored.set()
+
+    success, message = start_session(args.plano, watch_process=args.jogo, on_restore=on_restore)
+    print(message)
+    if not success or not args.jogo:
+        return 0 if success else 1
+
+    # Mantém o processo vivo até o jogo fechar e a sessão ser restaurada
+    try:
+        while not restored.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        print("Monitoramento interrompido. Use 'sessao restaurar' para desfazer as alterações.")
+        return 0
+    print(result[0][1])
+    return 0 if result[0][0] else 1
+
+
+def command_daemon(args: argparse.Namespace) -> int:
+    """Executa o monitor de limpeza contínua em baixa prioridade."""
+    from src.backend.daemon import CleaningDaemon
+
+    settings = {
+        "min_free_percent": args.livre_min,
+        "target_max_mb": args.alvo_max_mb,
+        "max_files_per_second": args.arquivos_por_segundo,
+        "max_mb_per_second": args.mb_por_segundo,
+        "max_load": args.carga_max,
+        "poll_seconds": args.intervalo,
+    }
+    daemon = CleaningDaemon(settings)
+    if args.uma_vez:
+        daemon.run_once()
+        return 0
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        logger.info("Monitor encerrado pelo usuário (Ctrl+C).")
+    return 0
+
+
+# ====================================================================
+# PARSER E PONTO DE ENTRADA
+# ====================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="BlazeScan", description="BlazeScan - Otimizador de Sistema")
+    subparsers = parser.add_subparsers(dest="command")
+
+    history_parser = subparsers.add_parser("historico", help="Mostra as tendências das execuções anteriores.")
+    history_parser.add_argument("--alvo", help="Mostra apenas o crescimento diário deste alvo (ex: 'Cache Chrome').")
+    history_parser.add_argument("--dias", type=float, default=30, help="Janela de dias para o crescimento (padrão: 30).")
+    history_parser.add_argument("--execucoes", type=int, default=30, help="Número de execuções para as etapas mais lentas (padrão: 30).")
+    history_parser.set_defaults(func=command_history)
+
+    agent_parser = subparsers.add_parser("agente", help="Inicia o agente de frota (API HTTP autenticada).")
+    agent_parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1, apenas local).")
+    agent_parser.add_argument("--todas-interfaces", action="store_true",
+                              help="Aceita conexões de outras máquinas (escuta em 0.0.0.0). A API usa HTTP sem criptografia.")
+    agent_parser.add_argument("--porta", type=int, default=8765, help="Porta de escuta (padrão: 8765).")
+    agent_parser.add_argument("--token", help=f"Token de autenticação (ou variável {FLEET_TOKEN_ENV}).")
+    agent_parser.set_defaults(func=command_agent)
+
+    fleet_parser = subparsers.add_parser("frota", help="Executa a limpeza em vários agentes ao mesmo tempo.")
+    fleet_parser.add_argument("--agentes", default="", help="Lista separada por vírgulas (ex: pc1:8765,pc2:8765).")
+    fleet_parser.add_argument("--arquivo", help="Arquivo com um agente por linha.")
+    fleet_parser.add_argument("--token", help=f"Token de autenticação (ou variável {FLEET_TOKEN_ENV}).")
+    fleet_parser.add_argument("--paralelo", type=int, default=16, help="Máximo de agentes em paralelo (padrão: 16).")
+    fleet_parser.add_argument("--plano", default="NONE", help="Plano de energia (ex: HIGH_PERFORMANCE; padrão: NONE).")
+    fleet_parser.add_argument("--otimizar-disco", action="store_true", help="Executa a otimização de disco.")
+    fleet_parser.add_argument("--verboso", action="store_true", help="Mostra o progresso de cada agente.")
+    fleet_parser.set_defaults(func=command_fleet)
+
+    session_parser = subparsers.add_parser("sessao", help="Modo jogo: aplica o perfil de desempenho e restaura depois.")
+    session_parser.add_argument("acao", choices=["iniciar", "restaurar", "estado"], help="Ação do modo jogo.")
+    session_parser.add_argument("--plano", default="MAXIMUM_PERFORMANCE", help="Plano de energia da sessão (padrão: MAXIMUM_PERFORMANCE).")
+    session_parser.add_argument("--jogo", help="Processo do jogo (ex: game.exe); a sessão é restaurada quando ele fechar.")
+    session_parser.add_argument("--sem-relancar", action="store_true", help="Não relança os aplicativos encerrados ao restaurar.")
+    session_parser.set_defaults(func=command_session)
+
+    daemon_parser = subparsers.add_parser("monitor", help="Limpeza contínua em segundo plano, com limites de taxa e carga.")
+    daemon_parser.add_argument("--livre-min", type=float, default=10.0, help="Limpa quando o espaço livre ficar abaixo deste percentual (padrão: 10).")
+    daemon_parser.add_argument("--alvo-max-mb", type=float, default=512, help="Limpa um alvo quando ele passar deste tamanho (padrão: 512 MB).")
+    daemon_parser.add_argument("--arquivos-por-segundo", type=float, default=200, help="Máximo de arquivos removidos por segundo (0 = sem limite).")
+    daemon_parser.add_argument("--mb-por-segundo", type=float, default=20, help="Máximo de MB removidos por segundo (0 = sem limite).")
+    daemon_parser.add_argument("--carga-max", type=float, default=0.75, help="Pausa enquanto a carga da CPU passar desta fração (padrão: 0.75).")
+    daemon_parser.add_argument("--intervalo", type=float, default=60, help="Segundos entre verificações (padrão: 60).")
+    daemon_parser.add_argument("--uma-vez", action="store_true", help="Executa um único ciclo e sai.")
+    daemon_parser.set_defaults(func=command_daemon)
+
+    return parser
+
+def run_cli(argv: List[str]) -> int:
+    """Executa um comando de linha de comando e retorna o código de saída."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not getattr(args, "func", None):
+        parser.print_help()
+        return 2
+
+    return args.func(args)
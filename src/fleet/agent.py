@@ -0,0 +1,323 @@
+import json
+import hmac
+import time
+import uuid
+import socket
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Tuple, List, Dict, Any, Optional, Callable
+
+from src.utils.system import is_valid_process_name
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DO AGENTE
+# ====================================================================
+
+# Por padrão o agente só aceita conexões locais; ouvir em todas as interfaces é opcional e explícito
+DEFAULT_AGENT_HOST = "127.0.0.1"
+ALL_INTERFACES_HOSTS = ("0.0.0.0", "::", "")
+DEFAULT_AGENT_PORT = 8765
+
+# Intervalo máximo de espera por novos eventos no streaming de progresso
+STREAM_POLL_SECONDS = 1.0
+
+MAX_REQUEST_BODY = 64 * 1024
+
+# Execuções concluídas mantidas em memória para consulta de relatórios
+MAX_KEPT_RUNS = 50
+
+
+# ====================================================================
+# EXECUÇÃO ACOMPANHADA PELO AGENTE
+# ====================================================================
+
+class AgentRun:
+    """Uma execução de limpeza disparada remotamente, com seus eventos de progresso."""
+
+    def __init__(self, settings: Dict[str, Any]):
+        self.run_id = uuid.uuid4().hex
+        self.settings = settings
+        self.state = "running"
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self._condition = threading.Condition()
+
+    def add_event(self, level: str, message: str):
+        with self._condition:
+            self.events.append({"seq": len(self.events), "time": time.time(), "level": level, "message": message})
+            self._condition.notify_all()
+
+    def finish(self, state: str, result: Dict[str, Any]):
+        with self._condition:
+            self.state = state
+            self.result = result
+            self.finished_at = time.time()
+            self._condition.notify_all()
+
+    def wait_events(self, since: int, timeout: float) -> Tuple[List[Dict[str, Any]], str]:
+        """Aguarda (até timeout) eventos com seq >= since. Retorna (eventos, estado)."""
+        with self._condition:
+            if len(self.events) <= since and self.state == "running":
+                self._condition.wait(timeout)
+            return self.events[since:], self.state
+
+    def to_dict(self, include_events: bool = True) -> Dict[str, Any]:
+        with self._condition:
+            data = {
+                "run_id": self.run_id,
+                "state": self.state,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "result": self.result,
+            }
+            if include_events:
+                data["events"] = list(self.events)
+            return data
+
+
+class _RunLogHandler(logging.Handler):
+    """
+    Copia os logs do backend para os eventos da execução. O logger é compartilhado pelo
+    processo inteiro: só os registros emitidos pela thread da execução são copiados.
+    """
+
+    def __init__(self, run: AgentRun, thread_id: int):
+        super().__init__()
+        self.run = run
+        self.thread_id = thread_id
+
+    def emit(self, record):
+        if record.thread != self.thread_id:
+            return
+        try:
+            self.run.add_event(record.levelname, record.getMessage())
+        except Exception:
+            self.handleError(record)
+
+
+# ====================================================================
+# AGENTE HTTP
+# ====================================================================
+
+def _default_actions() -> Dict[str, Callable]:
+    # Importação tardia: o agente pode ser testado com ações substitutas sem carregar o backend
+    from src.backend.cleanup import perform_cleanup
+    from src.utils.system import terminate_processes, set_power_plan, get_processes_to_kill
+
+    return {
+        "cleanup": perform_cleanup,
+        "terminate_processes": lambda processes=None: terminate_processes(processes or get_processes_to_kill()),
+        "set_power_plan": set_power_plan,
+    }
+
+
+class FleetAgent:
+    """
+    Agente que expõe o backend do BlazeScan por uma pequena API HTTP autenticada.
+
+    Rotas (todas exigem o cabeçalho 'Authorization: Bearer <token>'):
+      GET  /status                  estado do agente
+      POST /runs                    inicia uma limpeza ({"settings": {...}})
+      GET  /runs/<id>               estado, eventos e relatório de uma execução
+      GET  /runs/<id>/stream        progresso em tempo real (uma linha JSON por evento)
+      POST /processes/terminate     encerra processos ({"processes": [...]}, opcional)
+      POST /power-plan              define o plano de energia ({"plan": "HIGH_PERFORMANCE"})
+
+    Apenas uma limpeza roda por vez em cada máquina.
+    """
+
+    def __init__(self, token: str, host: str = DEFAULT_AGENT_HOST, port: int = DEFAULT_AGENT_PORT,
+                 actions: Optional[Dict[str, Callable]] = None, allow_all_interfaces: bool = False):
+        if not token:
+            raise ValueError("O agente exige um token de autenticação.")
+        if host in ALL_INTERFACES_HOSTS and not allow_all_interfaces:
+            # A API é HTTP sem criptografia e pode apagar arquivos como administrador
+            raise ValueError("Ouvir em todas as interfaces exige confirmação explícita (allow_all_interfaces).")
+        self.token = token
+        self.actions = actions or _default_actions()
+        self.runs: Dict[str, AgentRun] = {}
+        self.current_run: Optional[AgentRun] = None
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    # --- Ciclo de vida ---
+
+    def start(self) -> "FleetAgent":
+        """Inicia o servidor em uma thread de fundo."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="BlazeScanAgent")
+        self._thread.start()
+        logger.info(f"Agente BlazeScan ouvindo em {self.address[0]}:{self.address[1]}")
+        return self
+
+    def serve_forever(self):
+        """Executa o servidor na thread atual (modo linha de comando)."""
+        logger.info(f"Agente BlazeScan ouvindo em {self.address[0]}:{self.address[1]}")
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # --- Ações ---
+
+    def start_run(self, settings: Dict[str, Any]) -> Optional[AgentRun]:
+        """Inicia uma limpeza em segundo plano. Retorna None se já houver uma em andamento."""
+        with self._lock:
+            if self.current_run is not None and self.current_run.state == "running":
+                return None
+            run = AgentRun(settings)
+            self.runs[run.run_id] = run
+            self.current_run = run
+            while len(self.runs) > MAX_KEPT_RUNS:
+                self.runs.pop(next(iter(self.runs)))
+
+        threading.Thread(target=self._execute_run, args=(run,), daemon=True).start()
+        return run
+
+    def _execute_run(self, run: AgentRun):
+        handler = _RunLogHandler(run, threading.get_ident())
+        logger.addHandler(handler)
+        try:
+            success, report, formatted_size = self.actions["cleanup"](run.settings)
+            run.finish("done", {"success": success, "report": report, "freed": formatted_size})
+        except Exception as e:
+            logger.error(f"Erro inesperado na execução remota: {e}")
+            run.finish("failed", {"success": False, "report": f"Erro inesperado: {e}", "freed": "0 Bytes"})
+        finally:
+            logger.removeHandler(handler)
+
+    def status(self) -> Dict[str, Any]:
+        current = self.current_run
+        return {
+            "hostname": socket.gethostname(),
+            "busy": current is not None and current.state == "running",
+            "current_run": current.run_id if current else None,
+        }
+
+    # --- HTTP ---
+
+    def _make_handler(self):
+        agent = self
+
+        class Handler(BaseHTTPRequestHandler):
+            server_version = "BlazeScanAgent/1.0"
+
+            def log_message(self, format, *args):
+                logger.debug(f"Agente: {self.address_string()} - {format % args}")
+
+            def _send_json(self, status: int, data: Dict[str, Any]):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _authorized(self) -> bool:
+                header = self.headers.get("Authorization", "")
+                provided = header[len("Bearer "):] if header.startswith("Bearer ") else ""
+                if hmac.compare_digest(provided.encode('utf-8'), agent.token.encode('utf-8')):
+                    return True
+                self._send_json(401, {"error": "não autorizado"})
+                return False
+
+            def _read_json(self) -> Optional[Dict[str, Any]]:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_REQUEST_BODY:
+                    self._send_json(413, {"error": "corpo da requisição muito grande"})
+                    return None
+                try:
+                    data = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": "JSON inválido"})
+                    return None
+                if not isinstance(data, dict):
+                    self._send_json(400, {"error": "o corpo deve ser um objeto JSON"})
+                    return None
+                return data
+
+            def _stream_run(self, run: AgentRun):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                since = 0
+                while True:
+                    events, state = run.wait_events(since, STREAM_POLL_SECONDS)
+                    for event in events:
+                        self.wfile.write((json.dumps(event) + "\n").encode('utf-8'))
+                    since += len(events)
+                    self.wfile.flush()
+                    if state != "running" and not events:
+                        break
+                end_event = {"type": "end", "state": run.state, "result": run.result}
+                self.wfile.write((json.dumps(end_event) + "\n").encode('utf-8'))
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                parts = [p for p in self.path.split("?")[0].split("/") if p]
+
+                if parts == ["status"]:
+                    self._send_json(200, agent.status())
+                elif len(parts) in (2, 3) and parts[0] == "runs":
+                    run = agent.runs.get(parts[1])
+                    if run is None:
+                        self._send_json(404, {"error": "execução não encontrada"})
+                    elif len(parts) == 2:
+                        self._send_json(200, run.to_dict())
+                    elif parts[2] == "stream":
+                        self._stream_run(run)
+                    else:
+                        self._send_json(404, {"error": "rota não encontrada"})
+                else:
+                    self._send_json(404, {"error": "rota não encontrada"})
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                data = self._read_json()
+                if data is None:
+                    return
+                path = self.path.split("?")[0].rstrip("/")
+
+                try:
+                    if path == "/runs":
+                        run = agent.start_run(data.get("settings") or {})
+                        if run is None:
+                            self._send_json(409, {"error": "já existe uma limpeza em andamento",
+                                                  "current_run": agent.current_run.run_id})
+                        else:
+                            self._send_json(202, {"run_id": run.run_id})
+                    elif path == "/processes/terminate":
+                        processes = data.get("processes")
+                        if processes is not None and not (
+                                isinstance(processes, list) and all(is_valid_process_name(p) for p in processes)):
+                            # Os nomes chegam ao taskkill; só nomes simples de executável são aceitos
+                            self._send_json(400, {"error": "'processes' deve ser uma lista de nomes de executável (ex: app.exe)"})
+                            return
+                        success, terminated = agent.actions["terminate_processes"](processes)
+                        self._send_json(200, {"success": success, "terminated": terminated})
+                    elif path == "/power-plan":
+                        success, message = agent.actions["set_power_plan"](data.get("plan", ""))
+                        self._send_json(200, {"success": success, "message": message})
+                    else:
+                        self._send_json(404, {"error": "rota não encontrada"})
+                except Exception as e:
+                    logger.error(f"Erro ao processar '{path}' no agente: {e}")
+                    self._send_json(500, {"error": str(e)})
+
+        return Handler
@@ -0,0 +1,144 @@
+import json
+import logging
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable
+
+from src.fleet.agent import DEFAULT_AGENT_PORT
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DO COORDENADOR
+# ====================================================================
+
+DEFAULT_MAX_PARALLEL = 16
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Uma limpeza completa pode levar vários minutos; o streaming mantém a conexão aberta
+STREAM_TIMEOUT_SECONDS = 60 * 60
+
+
+class FleetCoordinator:
+    """
+    Dispara ações em vários agentes BlazeScan em paralelo (com limite de
+    concorrência) e agrega os resultados.
+    """
+
+    def __init__(self, agents: List[str], token: str, max_parallel: int = DEFAULT_MAX_PARALLEL):
+        self.agents = [self._normalize_agent(agent) for agent in agents]
+        self.token = token
+        self.max_parallel = max(1, max_parallel)
+
+    @staticmethod
+    def _normalize_agent(agent: str) -> str:
+        agent = agent.strip().rstrip("/")
+        if "://" not in agent:
+            agent = "http://" + agent
+        if agent.count(":") == 1:
+            agent += f":{DEFAULT_AGENT_PORT}"
+        return agent
+
+    # --- HTTP ---
+
+    def _request(self, agent: str, method: str, path: str, body: Optional[Dict[str, Any]] = None,
+                 timeout: float = REQUEST_TIMEOUT_SECONDS):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(agent + path, data=data, method=method)
+        request.add_header("Authorization", f"Bearer {self.token}")
+        if data is not None:
+            request.add_header("Content-Type", "application/json")
+        return urllib.request.urlopen(request, timeout=timeout)
+
+    def _request_json(self, agent: str, method: str, path: str,
+                      body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        with self._request(agent, method, path, body) as response:
+            return json.loads(response.read() or b"{}")
+
+    # --- Execução em um agente ---
+
+    def _run_on_agent(self, agent: str, settings: Dict[str, Any],
+                      on_event: Optional[Callable[[str, Dict[str, Any]], None]]) -> Dict[str, Any]:
+        try:
+            run_id = self._request_json(agent, "POST", "/runs", {"settings": settings})["run_id"]
+
+            # Acompanha o progresso em tempo real até o fim da execução
+            result, state = None, "running"
+            with self._request(agent, "GET", f"/runs/{run_id}/stream", timeout=STREAM_TIMEOUT_SECONDS) as stream:
+                for line in stream:
+                    event = json.loads(line)
+                    if event.get("type") == "end":
+                        result, state = event.get("result"), event.get("state")
+                    elif on_event is not None:
+                        on_event(agent, event)
+
+            result = result or {}
+            return {
+                "agent": agent,
+                "ok": state == "done",
+                "run_id": run_id,
+                "success": bool(result.get("success")),
+                "freed": result.get("freed", "0 Bytes"),
+                "report": result.get("report", ""),
+                "error": None,
+            }
+
+        except urllib.error.HTTPError as e:
+            try:
+                error = json.loads(e.read()).get("error", str(e))
+            except Exception:
+                error = str(e)
+            return {"agent": agent, "ok": False, "success": False, "error": f"HTTP {e.code}: {error}"}
+        except Exception as e:
+            return {"agent": agent, "ok": False, "success": False, "error": str(e)}
+
+    def _broadcast(self, func: Callable[[str], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel, max(len(self.agents), 1))) as executor:
+            return list(executor.map(func, self.agents))
+
+    # --- Ações da frota ---
+
+    def run_cleanup(self, settings: Dict[str, Any],
+                    on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Executa perform_cleanup em todos os agentes e retorna um resultado por agente."""
+        logger.info(f"Iniciando limpeza em {len(self.agents)} agentes (até {self.max_parallel} em paralelo)...")
+        return self._broadcast(lambda agent: self._run_on_agent(agent, settings, on_event))
+
+    def _simple_action(self, path: str, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        def action(agent: str) -> Dict[str, Any]:
+            try:
+                data = self._request_json(agent, "POST", path, body)
+                return {"agent": agent, "ok": True, "success": bool(data.get("success")), "data": data, "error": None}
+            except Exception as e:
+                return {"agent": agent, "ok": False, "success": False, "error": str(e)}
+        return self._broadcast(action)
+
+    def terminate_processes(self, processes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Encerra processos em todos os agentes (lista padrão do agente se None)."""
+        return self._simple_action("/processes/terminate", {"processes": processes})
+
+    def set_power_plan(self, plan_key: str) -> List[Dict[str, Any]]:
+        """Define o plano de energia em todos os agentes."""
+        return self._simple_action("/power-plan", {"plan": plan_key})
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Consulta o estado de todos os agentes."""
+        def action(agent: str) -> Dict[str, Any]:
+            try:
+                return {"agent": agent, "ok": True, "data": self._request_json(agent, "GET", "/status"), "error": None}
+            except Exception as e:
+                return {"agent": agent, "ok": False, "error": str(e)}
+        return self._broadcast(action)
+
+
+def format_fleet_report(results: List[Dict[str, Any]]) -> str:
+    """Resume os resultados de uma limpeza na frota."""
+    succeeded = [r for r in results if r.get("ok") and r.get("success")]
+    lines = [f"--- Resultado da Frota: {len(succeeded)}/{len(results)} agentes concluíram com sucesso ---"]
+    for result in results:
+        if result.get("error"):
+            lines.append(f"{result['agent']}: FALHA - {result['error']}")
+        else:
+            lines.append(f"{result['agent']}: Liberado {result.get('freed', '0 Bytes')}")
+    return "\n".join(lines)
@@ -9,6 +9,11 @@ from typing import Dict, Any, Tuple
 # --- IMPORTAÇÕES CORRIGIDAS (Mudança de Relativa para Absoluta) ---
 try:
     from src.backend.cleanup import perform_cleanup
+    from src.backend.progress import ProgressTracker, format_eta
+    from src.utils.system import format_bytes
+    from src.backend.quarantine import undo_batch
+    from src.backend.history import format_trends_report
+    from src.backend.session import start_session, restore_session, load_snapshot, watch_game
     from src.update.updater import is_update_available
 except ImportError as e:
     logging.error(f"Erro de importação no UI: {e}")
@@ -17,6 +22,11 @@ except ImportError as e:
 ICON_FILENAME = "blazescan_logo.ico"
 ICON_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ICON_FILENAME))
 
+# Taxa fixa de atualização da tabela de progresso: o backend pode processar dezenas de
+# milhares de arquivos por segundo, mas a UI só lê o estado PROGRESS_FPS vezes por segundo
+PROGRESS_FPS = 10
+PROGRESS_COLUMNS = ["Alvo", "Arquivos", "Bytes", "Taxa", "ETA"]
+
 # --- CONFIGURAÇÃO DO LOGGER ---
 # Configuração do logger principal para a UI
 logger = logging.getLogger('BlazeScan')
@@ -45,7 +55,7 @@ class App(ctk.CTk):
 
         # Configuração da janela principal
         self.title("BlazeScan - Otimizador de Sistema")
-        self.geometry("600x750")
+        self.geometry("600x900")
         
         ctk.set_appearance_mode("System")
         ctk.set_default_color_theme("blue")
@@ -53,7 +63,12 @@ class App(ctk.CTk):
         # 🚨 CORREÇÃO 1: Inicialização das variáveis de controle 🚨
         self.energy_plan_var = ctk.StringVar(value="Balanceado")
         self.disk_optimize_var = ctk.BooleanVar(value=False)
+        self.quick_clean_var = ctk.BooleanVar(value=False)
+        self.compress_logs_var = ctk.BooleanVar(value=False)
+        self.trim_caches_var = ctk.BooleanVar(value=False)
         self.is_running = False # Variável para controlar o estado da limpeza
+        self.progress_tracker = None
+        self.progress_rows: Dict[str, list] = {}
         
         # --- IMPLEMENTAÇÃO DO ÍCONE ---
         try:
@@ -70,8 +85,9 @@ class App(ctk.CTk):
         self.grid_rowconfigure(0, weight=0) # Configurações (novo)
         self.grid_rowconfigure(1, weight=0) # Título
         self.grid_rowconfigure(2, weight=1) # Log (principal)
-        self.grid_rowconfigure(3, weight=0) # Resultado
-        self.grid_rowconfigure(4, weight=0) # Botão
+        self.grid_rowconfigure(3, weight=0) # Progresso
+        self.grid_rowconfigure(4, weight=0) # Resultado
+        self.grid_rowconfigure(5, weight=0) # Botão
 
         # 🚨 CORREÇÃO 2: Chamada para criar os widgets de configurações 🚨
         self.setup_settings_widgets()
@@ -90,15 +106,18 @@ class App(ctk.CTk):
         ui_handler = LogHandler(self.log_text)
         logger.addHandler(ui_handler)
 
-        # 3. Label de Resultado (agora na row 3)
+        # 3. Progresso por alvo e barra de progresso geral (row 3)
+        self.setup_progress_widgets()
+
+        # 4. Label de Resultado (agora na row 4)
         self.result_label = ctk.CTkLabel(self, text="Tamanho Limpo: 0 Bytes", font=ctk.CTkFont(size=14))
-        self.result_label.grid(row=3, column=0, padx=20, pady=(0, 10), sticky="w")
+        self.result_label.grid(row=4, column=0, padx=20, pady=(0, 10), sticky="w")
 
-        # 4. Botão de Ação (agora na row 4)
+        # 5. Botão de Ação (agora na row 5)
         self.cleanup_button = ctk.CTkButton(self, text="Iniciar Limpeza e Otimização", command=self.start_cleanup_thread)
-        self.cleanup_button.grid(row=4, column=0, padx=20, pady=(10, 20), sticky="s")
+        self.cleanup_button.grid(row=5, column=0, padx=20, pady=(10, 20), sticky="s")
 
-        # 5. Verificar atualização ao iniciar
+        # 6. Verificar atualização ao iniciar
         self.after(100, self.check_for_update)
     
     # 🚨 CORREÇÃO 3: Método para criar os widgets de configuração (Row 0) 🚨
@@ -115,7 +134,91 @@ class App(ctk.CTk):
 
         # Configuração de Disco
         ctk.CTkCheckBox(settings_frame, text="Otimizar Disco C: (Defrag/TRIM)", variable=self.disk_optimize_var).grid(row=1, column=0, columnspan=2, padx=10, pady=5, sticky="w")
+
+        # Limpeza rápida (quarentena com possibilidade de desfazer)
+        ctk.CTkCheckBox(settings_frame, text="Limpeza Rápida (quarentena, permite desfazer)", variable=self.quick_clean_var).grid(row=2, column=0, padx=10, pady=5, sticky="w")
+        self.undo_button = ctk.CTkButton(settings_frame, text="Desfazer Última Limpeza", command=self.start_undo_thread)
+        self.undo_button.grid(row=2, column=1, padx=10, pady=5, sticky="e")
+
+        # Compressão de logs e dumps antigos (em vez de apagar)
+        ctk.CTkCheckBox(settings_frame, text="Comprimir Logs e Dumps Antigos (> 7 dias)", variable=self.compress_logs_var).grid(row=3, column=0, padx=10, pady=5, sticky="w")
+
+        # Caches de navegadores/aplicativos: aparar em vez de apagar tudo
+        ctk.CTkCheckBox(settings_frame, text="Manter Caches Quentes (reduzir a 256 MB por cache)", variable=self.trim_caches_var).grid(row=4, column=0, columnspan=2, padx=10, pady=5, sticky="w")
+
+        # Histórico de execuções e tendências
+        ctk.CTkButton(settings_frame, text="Ver Histórico", command=self.show_history).grid(row=3, column=1, padx=10, pady=5, sticky="e")
+
+        # Modo jogo: aplica o perfil de desempenho e restaura tudo depois (ou quando o jogo fechar)
+        self.game_process_entry = ctk.CTkEntry(settings_frame, placeholder_text="Processo do jogo (opcional, ex: game.exe)")
+        self.game_process_entry.grid(row=5, column=0, padx=10, pady=5, sticky="ew")
+        self.game_mode_button = ctk.CTkButton(settings_frame, text="Iniciar Modo Jogo", command=self.toggle_game_mode)
+        self.game_mode_button.grid(row=5, column=1, padx=10, pady=5, sticky="e")
+        self.after(200, self.resume_game_mode)
         
+    def setup_progress_widgets(self):
+        """Cria a tabela de progresso por alvo e a barra de progresso geral (Row 3)."""
+        progress_frame = ctk.CTkFrame(self)
+        progress_frame.grid(row=3, column=0, padx=20, pady=(0, 10), sticky="ew")
+        progress_frame.grid_columnconfigure(0, weight=1)
+
+        self.stage_label = ctk.CTkLabel(progress_frame, text="Progresso: aguardando início", anchor="w")
+        self.stage_label.grid(row=0, column=0, padx=10, pady=(5, 0), sticky="w")
+
+        self.overall_progress = ctk.CTkProgressBar(progress_frame)
+        self.overall_progress.grid(row=1, column=0, padx=10, pady=5, sticky="ew")
+        self.overall_progress.set(0)
+
+        self.progress_table = ctk.CTkScrollableFrame(progress_frame, height=150)
+        self.progress_table.grid(row=2, column=0, padx=10, pady=(0, 10), sticky="ew")
+        self.progress_table.grid_columnconfigure(0, weight=1)
+        for column, title in enumerate(PROGRESS_COLUMNS):
+            ctk.CTkLabel(self.progress_table, text=title, font=ctk.CTkFont(weight="bold")).grid(
+                row=0, column=column, padx=5, sticky="w" if column == 0 else "e")
+
+    def reset_progress(self):
+        """Remove as linhas da execução anterior."""
+        for labels in self.progress_rows.values():
+            for label in labels:
+                label.destroy()
+        self.progress_rows = {}
+        self.overall_progress.set(0)
+        self.stage_label.configure(text="Progresso: iniciando...")
+
+    def render_progress(self):
+        """Lê o estado do backend e redesenha a tabela; reagenda-se a uma taxa fixa de quadros."""
+        tracker = self.progress_tracker
+        if tracker is None:
+            return
+
+        snapshot = tracker.snapshot()
+        for target in snapshot["targets"]:
+            labels = self.progress_rows.get(target["name"])
+            if labels is None:
+                # Os widgets de cada alvo são criados uma única vez e depois apenas atualizados
+                row = len(self.progress_rows) + 1
+                labels = [ctk.CTkLabel(self.progress_table, text="", anchor="w" if column == 0 else "e")
+                          for column in range(len(PROGRESS_COLUMNS))]
+                for column, label in enumerate(labels):
+                    label.grid(row=row, column=column, padx=5, sticky="w" if column == 0 else "e")
+                self.progress_rows[target["name"]] = labels
+
+            rate = f"{format_bytes(int(target['rate']))}/s" if target["rate"] else "--"
+            values = [target["name"], str(target["files"]), format_bytes(target["bytes"]), rate,
+                      "ok" if target["state"] == "concluído" else format_eta(target["eta"])]
+            for label, value in zip(labels, values):
+                if label.cget("text") != value:
+                    label.configure(text=value)
+
+        self.overall_progress.set(snapshot["overall"])
+        stage = snapshot["stage"] or "concluído"
+        self.stage_label.configure(text=f"Progresso: {snapshot['overall'] * 100:.0f}% - {stage}")
+
+        if self.is_running:
+            partial = sum(target["bytes"] for target in snapshot["targets"])
+            self.result_label.configure(text=f"Tamanho Limpo (parcial): {format_bytes(partial)}")
+            self.after(1000 // PROGRESS_FPS, self.render_progress)
+
     def _get_settings(self) -> dict:
         """Retorna um dicionário com as configurações atuais da UI."""
         # Mapeia a seleção da UI para as chaves do backend (system.py)
@@ -128,7 +231,10 @@ class App(ctk.CTk):
         
         return {
             "energy_plan": plan_mapping.get(self.energy_plan_var.get(), "NONE"),
-            "optimize_disk": self.disk_optimize_var.get()
+            "optimize_disk": self.disk_optimize_var.get(),
+            "cleanup_strategy": "quarantine" if self.quick_clean_var.get() else "delete",
+            "compress_logs": self.compress_logs_var.get(),
+            "cache_mode": "trim" if self.trim_caches_var.get() else "wipe"
         }
         
     def update_log(self, message: str):
@@ -155,16 +261,20 @@ class App(ctk.CTk):
         self.cleanup_button.configure(state="disabled", text="Limpando...")
         self.log_text.delete("0.0", ctk.END) # Limpa o log
         self.update_log("--- INICIANDO PROCESSO DE LIMPEZA E OTIMIZAÇÃO ---")
+
+        self.reset_progress()
+        self.progress_tracker = ProgressTracker()
         
         # 2. CRIAÇÃO E INÍCIO DA THREAD (PASSANDO settings)
-        cleanup_thread = threading.Thread(target=self.run_cleanup, args=(settings,))
+        cleanup_thread = threading.Thread(target=self.run_cleanup, args=(settings, self.progress_tracker))
         cleanup_thread.start()
+        self.render_progress()
 
-    def run_cleanup(self, settings: Dict[str, Any]):
+    def run_cleanup(self, settings: Dict[str, Any], progress_tracker=None):
         """Função que executa a lógica de limpeza do backend."""
         try:
             # perform_cleanup é chamado com 'settings'
-            success, log_message, formatted_size = perform_cleanup(settings)
+            success, log_message, formatted_size = perform_cleanup(settings, progress_tracker)
             
             self.after(0, self.finish_cleanup, success, log_message, formatted_size)
             
@@ -182,6 +292,114 @@ class App(ctk.CTk):
         
         self.cleanup_button.configure(state="normal", text="Iniciar Limpeza e Otimização")
         self.is_running = False
+        # Último quadro: mostra o estado final da tabela e a barra completa
+        self.render_progress()
+
+    def start_undo_thread(self):
+        """Restaura, em uma thread separada, os itens da última limpeza rápida."""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self.undo_button.configure(state="disabled")
+        self.cleanup_button.configure(state="disabled")
+        threading.Thread(target=self.run_undo).start()
+
+    def run_undo(self):
+        """Executa o desfazer da quarentena no backend."""
+        try:
+            _, message = undo_batch()
+        except Exception as e:
+            logger.error(f"Erro inesperado ao desfazer a limpeza: {e}")
+            message = f"Erro inesperado ao desfazer a limpeza: {e}"
+        self.after(0, self.finish_undo, message)
+
+    def finish_undo(self, message: str):
+        """Reabilita os botões após o desfazer."""
+        self.update_log(message)
+        self.undo_button.configure(state="normal")
+        self.cleanup_button.configure(state="normal")
+        self.is_running = False
+
+    def resume_game_mode(self):
+        """Se o programa foi fechado com o modo jogo ativo, volta a acompanhar a sessão."""
+        try:
+            snapshot = load_snapshot()
+        except Exception as e:
+            logger.error(f"Erro ao ler a sessão do modo jogo: {e}")
+            return
+        if snapshot is None:
+            return
+        self.game_mode_button.configure(text="Restaurar Sessão")
+        if snapshot.get("watch_process"):
+            watch_game(snapshot["watch_process"], self._on_game_session_restored)
+
+    def toggle_game_mode(self):
+        """Inicia o modo jogo ou restaura a sessão ativa, em uma thread separada."""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self.game_mode_button.configure(state="disabled")
+        self.cleanup_button.configure(state="disabled")
+        settings = self._get_settings()
+        game_process = self.game_process_entry.get().strip() or None
+        threading.Thread(target=self.run_game_mode, args=(settings["energy_plan"], game_process)).start()
+
+    def run_game_mode(self, plan_key: str, game_process):
+        """Executa o início/restauração do modo jogo no backend."""
+        try:
+            if load_snapshot() is None:
+                plan_key = plan_key if plan_key != "NONE" else "MAXIMUM_PERFORMANCE"
+                success, message = start_session(plan_key, watch_process=game_process,
+                                                 on_restore=self._on_game_session_restored)
+                active = success
+            else:
+                success, message = restore_session()
+                active = False
+        except Exception as e:
+            logger.error(f"Erro inesperado no modo jogo: {e}")
+            message, active = f"Erro inesperado no modo jogo: {e}", load_snapshot() is not None
+        self.after(0, self.finish_game_mode, message, active)
+
+    def _on_game_session_restored(self, success: bool, message: str):
+        # Chamado pela thread que monitora o jogo
+        self.after(0, self.finish_game_mode, message, False, False)
+
+    def finish_game_mode(self, message: str, active: bool, release: bool = True):
+        """Atualiza o botão do modo jogo conforme o estado da sessão."""
+        self.update_log(message)
+        self.game_mode_button.configure(state="normal", text="Restaurar Sessão" if active else "Iniciar Modo Jogo")
+        if release:
+            self.cleanup_button.configure(state="normal")
+            self.is_running = False
+
+    def show_history(self):
+        """Abre uma janela com as tendências do histórico de execuções."""
+        window = ctk.CTkToplevel(self)
+        window.title("BlazeScan - Histórico de Execuções")
+        window.geometry("560x480")
+
+        history_text = ctk.CTkTextbox(window)
+        history_text.pack(fill="both", expand=True, padx=10, pady=10)
+        history_text.insert("0.0", "Carregando histórico...")
+        history_text.configure(state="disabled")
+
+        def load_report():
+            try:
+                report = format_trends_report()
+            except Exception as e:
+                logger.error(f"Erro ao carregar o histórico: {e}")
+                report = f"Erro ao carregar o histórico: {e}"
+            self.after(0, show_report, report)
+
+        def show_report(report: str):
+            history_text.configure(state="normal")
+            history_text.delete("0.0", ctk.END)
+            history_text.insert("0.0", report)
+            history_text.configure(state="disabled")
+
+        threading.Thread(target=load_report, daemon=True).start()
 
     # --- Lógica de Atualização (Mantida) ---
     def check_for_update(self):
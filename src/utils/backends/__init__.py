@@ -0,0 +1,19 @@
+import sys
+from typing import Optional
+
+from src.utils.backends.base import PlatformBackend
+
+_backend: Optional[PlatformBackend] = None
+
+
+def get_platform_backend() -> PlatformBackend:
+    """Retorna (e mantém em cache) o backend da plataforma atual."""
+    global _backend
+    if _backend is None:
+        if sys.platform.startswith('linux'):
+            from src.utils.backends.linux import LinuxBackend
+            _backend = LinuxBackend()
+        else:
+            from src.utils.backends.windows import WindowsBackend
+            _backend = WindowsBackend()
+    return _backend
@@ -0,0 +1,83 @@
+import os
+from typing import List, Tuple, Dict, Any, Optional
+
+
+class PlatformBackend:
+    """
+    Interface das operações dependentes de sistema operacional.
+
+    O motor de varredura e remoção (src.utils.system / src.backend.cleanup) é o
+    mesmo em todas as plataformas; cada backend só informa ONDE estão os alvos e
+    COMO controlar processos e energia. Os nomes dos alvos e as mensagens seguem
+    o mesmo formato, para que os relatórios sejam idênticos.
+    """
+
+    name = "base"
+
+    def get_temp_paths(self) -> Dict[str, str]:
+        """Retorna um dicionário Nome -> Caminho de pastas cujo conteúdo pode ser apagado."""
+        raise NotImplementedError
+
+    def get_file_targets(self) -> Dict[str, List[str]]:
+        """Retorna um dicionário Nome -> padrões glob de arquivos avulsos a apagar (ex: logs rotacionados)."""
+        return {}
+
+    def get_min_file_age(self, target_name: str) -> Optional[float]:
+        """Idade mínima (em segundos) para apagar arquivos de um alvo. None = sem restrição."""
+        return None
+
+    def get_required_owner(self, target_name: str) -> Optional[int]:
+        """UID dono dos itens que podem ser apagados em um alvo compartilhado. None = sem restrição."""
+        return None
+
+    def get_compress_paths(self) -> Dict[str, str]:
+        """Retorna um dicionário de pastas de logs e dumps que podem ser comprimidos em vez de apagados."""
+        return {}
+
+    def get_classifier_paths(self) -> Dict[str, str]:
+        """Pastas examinadas pelo classificador de lixo por conteúdo (Downloads e pastas de dumps)."""
+        paths = {'Downloads': os.path.join(os.path.expanduser('~'), 'Downloads')}
+        paths.update(self.get_compress_paths())
+        return paths
+
+    def get_processes_to_kill(self) -> List[str]:
+        """Retorna os nomes de processos encerrados pela otimização."""
+        return []
+
+    @staticmethod
+    def normalize_process_name(name: str) -> str:
+        """Nome comparável de um executável: sem diretório, minúsculo e sem '.exe'."""
+        name = os.path.basename(name).lower()
+        return name[:-4] if name.endswith(".exe") else name
+
+    def list_processes(self) -> List[Dict[str, Any]]:
+        """Lê a tabela de processos UMA vez. Cada item: {"pid", "name", "path"} (path pode ser None)."""
+        raise NotImplementedError
+
+    def get_process_path(self, pid: int) -> Optional[str]:
+        """Caminho do executável de um processo, quando list_processes não o informa."""
+        return None
+
+    def is_process_alive(self, pid: int) -> bool:
+        """Verifica se o processo ainda está em execução."""
+        raise NotImplementedError
+
+    def terminate_processes(self, processes: List[str]) -> Tuple[bool, List[str]]:
+        """Encerra os processos informados. Retorna (sucesso geral, processos encerrados)."""
+        raise NotImplementedError
+
+    def set_power_plan(self, plan_key: str) -> Tuple[bool, str]:
+        """Aplica o plano de energia (chaves de POWER_PLAN_GUIDS)."""
+        raise NotImplementedError
+
+    def get_active_power_plan(self) -> Optional[str]:
+        """Identificador do plano de energia ativo (GUID no Windows, governor no Linux), com UMA consulta."""
+        return None
+
+    def restore_power_plan(self, plan_id: str) -> Tuple[bool, str]:
+        """Reativa um plano de energia registrado por get_active_power_plan."""
+        return False, "Restauração do plano de energia não suportada nesta plataforma."
+
+    def optimize_disk(self, drive_letter: str = "C") -> Tuple[bool, str]:
+        """Executa a otimização (desfragmentação/TRIM) do disco."""
+        return False, "Otimização de disco não suportada nesta plataforma."
@@ -0,0 +1,266 @@
+import os
+import glob
+import time
+import signal
+import logging
+import tempfile
+from typing import List, Tuple, Dict, Any, Optional
+
+from src.utils.backends.base import PlatformBackend
+from src.utils.discovery import discover_app_caches
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DO LINUX
+# ====================================================================
+
+CPUFREQ_GLOB = "/sys/devices/system/cpu/cpu[0-9]*/cpufreq"
+
+# Plano de energia -> governors aceitos (o primeiro disponível é usado)
+POWER_PLAN_GOVERNORS = {
+    "MAXIMUM_PERFORMANCE": ["performance"],
+    "HIGH_PERFORMANCE": ["performance"],
+    "BALANCED": ["schedutil", "ondemand", "conservative", "powersave"],
+    "POWER_SAVER": ["powersave", "conservative"],
+}
+
+# Equivalentes Linux de OPT_PROCESSES_TO_KILL (comparados com o nome do executável)
+LINUX_PROCESSES_TO_KILL: List[str] = [
+    "spotify",
+    "steam",
+    "steamwebhelper",
+    "teams",
+    "teams-for-linux",
+    "zoom",
+    "dropbox",
+    "qbittorrent",
+    "anydesk",
+    "teamviewer",
+    "chrome",
+    "google-chrome",
+    "chromium",
+    "firefox",
+    "msedge",
+    "microsoft-edge",
+    "opera",
+]
+
+# Em /tmp e /var/tmp nada é bloqueado como no Windows: só apaga o que está parado há algum tempo
+TEMP_MIN_AGE_SECONDS = 24 * 60 * 60
+SYSTEM_TEMP_MIN_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# Subpastas de ~/.cache que são apenas cache regenerável. O ~/.cache inteiro não é alvo:
+# ele guarda caches grandes e caros de reconstruir (modelos, toolchains, índices de IDEs)
+XDG_CACHE_SUBDIRS = {
+    'Cache Miniaturas': 'thumbnails',
+    'Cache Shaders Mesa': 'mesa_shader_cache',
+    'Cache Fontconfig': 'fontconfig',
+}
+
+# Pastas temporárias compartilhadas entre usuários: só itens do próprio usuário são apagados
+SHARED_TEMP_TARGETS = ('Temp Usuário', 'Temp Sistema')
+
+# Espera pelo SIGTERM antes do SIGKILL (equivalente ao taskkill /F)
+TERMINATE_GRACE_SECONDS = 3.0
+
+
+class LinuxBackend(PlatformBackend):
+    """Backend do Linux: /tmp, caches conhecidos (pip/npm/apps), controle de processos via /proc e governor da CPU."""
+
+    name = "linux"
+
+    # --- Alvos de limpeza ---
+
+    def _cache_home(self) -> str:
+        return os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+
+    def get_temp_paths(self) -> Dict[str, str]:
+        cache_home = self._cache_home()
+
+        paths = {}
+        paths['Temp Usuário'] = tempfile.gettempdir()
+        # Caches específicos primeiro, para que o relatório mostre cada um separadamente
+        paths['Cache pip'] = os.environ.get('PIP_CACHE_DIR') or os.path.join(cache_home, 'pip')
+        paths['Cache npm'] = os.path.join(os.environ.get('npm_config_cache') or os.path.join(os.path.expanduser('~'), '.npm'), '_cacache')
+        # Navegadores e aplicativos (todos os perfis), a partir do índice de descoberta
+        paths.update(discover_app_caches())
+        for name, subdir in XDG_CACHE_SUBDIRS.items():
+            paths[name] = os.path.join(cache_home, subdir)
+        paths['Temp Sistema'] = '/var/tmp'
+        return paths
+
+    def get_file_targets(self) -> Dict[str, List[str]]:
+        return {
+            'Logs Rotacionados': ['/var/log/**/*.gz', '/var/log/**/*.[0-9]', '/var/log/**/*.old'],
+        }
+
+    def get_min_file_age(self, target_name: str) -> Optional[float]:
+        if target_name == 'Temp Usuário':
+            return TEMP_MIN_AGE_SECONDS
+        if target_name == 'Temp Sistema':
+            return SYSTEM_TEMP_MIN_AGE_SECONDS
+        return None
+
+    def get_required_owner(self, target_name: str) -> Optional[int]:
+        # /tmp e /var/tmp são limpos como root: sockets, locks e arquivos de outros usuários ficam intactos
+        if target_name in SHARED_TEMP_TARGETS:
+            return os.geteuid()
+        return None
+
+    def get_compress_paths(self) -> Dict[str, str]:
+        return {'Dumps de Falha': '/var/crash'}
+
+    # --- Processos ---
+
+    def get_processes_to_kill(self) -> List[str]:
+        return list(LINUX_PROCESSES_TO_KILL)
+
+    def list_processes(self) -> List[Dict[str, Any]]:
+        """Lê /proc uma única vez e retorna os processos com nome do executável e caminho."""
+        processes = []
+        own_pid = os.getpid()
+        for entry in os.scandir('/proc'):
+            if not entry.name.isdigit() or int(entry.name) == own_pid:
+                continue
+            try:
+                with open(os.path.join(entry.path, 'cmdline'), 'rb') as f:
+                    argv0 = f.read().split(b'\0', 1)[0].decode('utf-8', 'replace')
+            except OSError:
+                continue
+            if not argv0:
+                # Threads do kernel e processos zumbis não têm cmdline
+                continue
+            argv0 = argv0.split(' ', 1)[0]
+            try:
+                path = os.readlink(os.path.join(entry.path, 'exe'))
+            except OSError:
+                path = argv0 if os.path.isabs(argv0) else None
+            processes.append({"pid": int(entry.name), "name": os.path.basename(argv0), "path": path})
+        return processes
+
+    def _read_process_table(self) -> Dict[int, str]:
+        """Retorna PID -> nome normalizado do executável (uma única leitura de /proc)."""
+        return {p["pid"]: self.normalize_process_name(p["name"]) for p in self.list_processes()}
+
+    def terminate_processes(self, processes: List[str]) -> Tuple[bool, List[str]]:
+        logger.info(f"Tentando encerrar {len(processes)} processos para otimização.")
+        wanted = {self.normalize_process_name(p): p for p in processes}
+
+        targets: Dict[int, str] = {}
+        for pid, name in self._read_process_table().items():
+            if name in wanted:
+                targets[pid] = wanted[name]
+
+        for pid, process_name in targets.items():
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+            except PermissionError as e:
+                logger.warning(f" - FALHA crítica ao encerrar '{process_name}' (PID {pid}). Output: {e}")
+
+        # Força o encerramento de quem ignorar o SIGTERM
+        deadline = time.monotonic() + TERMINATE_GRACE_SECONDS
+        pending = set(targets)
+        while pending and time.monotonic() < deadline:
+            pending = {pid for pid in pending if self._is_alive(pid)}
+            if pending:
+                time.sleep(0.1)
+        for pid in pending:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+        terminated_list = []
+        for pid, process_name in targets.items():
+            if not self._is_alive(pid) and process_name not in terminated_list:
+                terminated_list.append(process_name)
+                logger.info(f" - ENCERRADO: {process_name}")
+
+        return True, terminated_list
+
+    def is_process_alive(self, pid: int) -> bool:
+        return self._is_alive(pid)
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        try:
+            with open(f'/proc/{pid}/stat', 'r') as f:
+                # Processos zumbis (estado 'Z') já terminaram
+                return f.read().rsplit(')', 1)[1].split()[0] != 'Z'
+        except (OSError, IndexError):
+            return False
+
+    # --- Energia ---
+
+    def _cpufreq_dirs(self) -> List[str]:
+        return sorted(glob.glob(CPUFREQ_GLOB))
+
+    def get_available_governors(self) -> List[str]:
+        dirs = self._cpufreq_dirs()
+        if not dirs:
+            return []
+        try:
+            with open(os.path.join(dirs[0], 'scaling_available_governors'), 'r') as f:
+                return f.read().split()
+        except OSError:
+            return []
+
+    def get_active_power_plan(self) -> Optional[str]:
+        dirs = self._cpufreq_dirs()
+        if not dirs:
+            return None
+        try:
+            with open(os.path.join(dirs[0], 'scaling_governor'), 'r') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _write_governor(self, governor: str) -> Optional[str]:
+        """Aplica o governor em todas as CPUs. Retorna a mensagem de erro, ou None."""
+        try:
+            for cpufreq_dir in self._cpufreq_dirs():
+                with open(os.path.join(cpufreq_dir, 'scaling_governor'), 'w') as f:
+                    f.write(governor)
+        except OSError as e:
+            return str(e)
+        return None
+
+    def restore_power_plan(self, plan_id: str) -> Tuple[bool, str]:
+        error = self._write_governor(plan_id)
+        if error:
+            logger.error(f"Falha ao restaurar o plano de energia: {error}")
+            return False, f"Falha ao restaurar o plano de energia: {error}"
+        logger.info(f"Plano de energia restaurado (governor '{plan_id}').")
+        return True, f"Plano de energia restaurado (governor '{plan_id}')."
+
+    def set_power_plan(self, plan_key: str) -> Tuple[bool, str]:
+        plan_upper = plan_key.upper()
+        candidates = POWER_PLAN_GOVERNORS.get(plan_upper)
+
+        if not candidates:
+            logger.warning(f"Plano de energia '{plan_key}' desconhecido.")
+            return False, f"Plano de energia '{plan_key}' desconhecido."
+
+        cpufreq_dirs = self._cpufreq_dirs()
+        if not cpufreq_dirs:
+            msg = "Falha ao definir plano de energia: controle de frequência da CPU (cpufreq) indisponível."
+            logger.error(msg)
+            return False, msg
+
+        available = self.get_available_governors()
+        governor = next((g for g in candidates if g in available), None)
+        if governor is None:
+            msg = f"Falha ao definir plano de energia: nenhum governor compatível ({', '.join(candidates)}) disponível."
+            logger.error(msg)
+            return False, msg
+
+        error = self._write_governor(governor)
+        if error:
+            logger.error(f"Falha ao definir plano de energia: {error}")
+            return False, f"Falha ao definir plano de energia: {error}"
+
+        logger.info(f"Plano de energia definido para {plan_key.replace('_', ' ').title()} (governor '{governor}').")
+        return True, f"Plano de energia definido para {plan_key.replace('_', ' ').title()} (governor '{governor}')."
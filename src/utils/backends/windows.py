@@ -0,0 +1,255 @@
+import os
+import re
+import logging
+from typing import List, Tuple, Dict, Any, Optional
+
+from src.utils.backends.base import PlatformBackend
+from src.utils.system import execute_windows_command, is_valid_process_name, POWER_PLAN_GUIDS, OPT_PROCESSES_TO_KILL
+from src.utils.discovery import discover_app_caches
+
+logger = logging.getLogger('BlazeScan')
+
+TH32CS_SNAPPROCESS = 0x00000002
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+SYNCHRONIZE = 0x00100000
+WAIT_TIMEOUT = 0x00000102
+INVALID_HANDLE_VALUE = -1
+
+GUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}")
+
+# A otimização de um disco grande pode levar horas; os demais comandos usam o limite padrão
+DISK_OPTIMIZE_TIMEOUT = 4 * 60 * 60
+
+
+class WindowsBackend(PlatformBackend):
+    """Backend do Windows: pastas %TEMP%/caches, taskkill, powercfg e defrag."""
+
+    name = "windows"
+
+    def get_processes_to_kill(self) -> List[str]:
+        return list(OPT_PROCESSES_TO_KILL)
+
+    def get_temp_paths(self) -> Dict[str, str]:
+        """Retorna um dicionário de caminhos temporários a serem limpos."""
+        user_temp = os.environ.get('TEMP')
+        local_app_data = os.environ.get('LOCALAPPDATA')
+        system_drive = os.environ.get('SystemDrive', 'C:')
+
+        paths = {}
+        if user_temp:
+            paths['Temp Usuário'] = user_temp
+        if local_app_data:
+            paths['Temp/Cache Local'] = os.path.join(local_app_data, 'Temp')
+
+        # Navegadores e aplicativos (todos os perfis), a partir do índice de descoberta
+        paths.update(discover_app_caches())
+
+        if system_drive:
+            paths['Temp Sistema'] = os.path.join(system_drive, 'Windows', 'Temp')
+            paths['Prefetch'] = os.path.join(system_drive, 'Windows', 'Prefetch')
+
+        return paths
+
+    def get_compress_paths(self) -> Dict[str, str]:
+        """Retorna um dicionário de pastas de logs e dumps que podem ser comprimidos em vez de apagados."""
+        local_app_data = os.environ.get('LOCALAPPDATA')
+        system_drive = os.environ.get('SystemDrive', 'C:')
+
+        paths = {}
+        if local_app_data:
+            paths['Dumps de Falha'] = os.path.join(local_app_data, 'CrashDumps')
+        if system_drive:
+            paths['Minidumps do Sistema'] = os.path.join(system_drive, 'Windows', 'Minidump')
+            paths['Logs do Windows'] = os.path.join(system_drive, 'Windows', 'Logs')
+
+        return paths
+
+    def list_processes(self) -> List[Dict[str, Any]]:
+        """Lê a tabela de processos com um único snapshot (CreateToolhelp32Snapshot)."""
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", wintypes.DWORD),
+                ("cntUsage", wintypes.DWORD),
+                ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", wintypes.DWORD),
+                ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD),
+                ("pcPriClassBase", ctypes.c_long),
+                ("dwFlags", wintypes.DWORD),
+                ("szExeFile", ctypes.c_wchar * 260),
+            ]
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+        if not snapshot or snapshot == wintypes.HANDLE(INVALID_HANDLE_VALUE).value:
+            logger.error("Falha ao ler a tabela de processos (CreateToolhelp32Snapshot).")
+            return []
+
+        processes = []
+        own_pid = os.getpid()
+        try:
+            entry = PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+            has_entry = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while has_entry:
+                if entry.th32ProcessID not in (0, own_pid):
+                    processes.append({"pid": entry.th32ProcessID, "name": entry.szExeFile, "path": None})
+                has_entry = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            kernel32.CloseHandle(snapshot)
+        return processes
+
+    def get_process_path(self, pid: int) -> Optional[str]:
+        """Caminho completo do executável (QueryFullProcessImageNameW), usado para relançar aplicativos."""
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None
+        try:
+            buffer = ctypes.create_unicode_buffer(32768)
+            size = wintypes.DWORD(len(buffer))
+            if kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+                return buffer.value
+            return None
+        finally:
+            kernel32.CloseHandle(handle)
+
+    def is_process_alive(self, pid: int) -> bool:
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        handle = kernel32.OpenProcess(SYNCHRONIZE | PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            return kernel32.WaitForSingleObject(handle, 0) == WAIT_TIMEOUT
+        finally:
+            kernel32.CloseHandle(handle)
+
+    def get_active_power_plan(self) -> Optional[str]:
+        """Retorna o GUID do plano de energia ativo ('powercfg /getactivescheme')."""
+        success, output = execute_windows_command(["powercfg", "/getactivescheme"])
+        match = GUID_PATTERN.search(output) if success else None
+        return match.group(0).lower() if match else None
+
+    def restore_power_plan(self, plan_id: str) -> Tuple[bool, str]:
+        success, output = execute_windows_command(["powercfg", "/setactive", plan_id])
+        if success:
+            logger.info(f"Plano de energia restaurado ({plan_id}).")
+            return True, f"Plano de energia restaurado ({plan_id})."
+        logger.error(f"Falha ao restaurar o plano de energia: {output}")
+        return False, f"Falha ao restaurar o plano de energia: {output}"
+
+    def set_power_plan(self, plan_key: str) -> Tuple[bool, str]:
+        """Define o plano de energia do Windows."""
+
+        plan_upper = plan_key.upper()
+        guid = POWER_PLAN_GUIDS.get(plan_upper)
+
+        if not guid:
+            logger.warning(f"Plano de energia '{plan_key}' desconhecido.")
+            return False, f"Plano de energia '{plan_key}' desconhecido."
+
+        # 1. Tentar ativar o plano
+        command = ["powercfg", "/setactive", guid]
+        success, output = execute_windows_command(command)
+
+        # 2. SE FALHAR E FOR O 'DESEMPENHO MÁXIMO', TENTAR CRIÁ-LO (Lógica robusta)
+        if not success and plan_upper == "MAXIMUM_PERFORMANCE":
+            logger.warning("Falha ao ativar Desempenho Máximo. Tentando criá-lo primeiro...")
+
+            # Comando para duplicar o plano HIGH_PERFORMANCE (8c5...) para o MAXIMUM_PERFORMANCE (e9a...)
+            creation_command = ["powercfg", "/duplicate scheme", 
+                                POWER_PLAN_GUIDS["HIGH_PERFORMANCE"], 
+                                POWER_PLAN_GUIDS["MAXIMUM_PERFORMANCE"]]
+
+            create_success, create_output = execute_windows_command(creation_command)
+
+            if create_success:
+                logger.info("Plano 'Desempenho Máximo' criado com sucesso. Tentando ativar novamente.")
+                success, output = execute_windows_command(command)
+
+                if success:
+                    logger.info(f"Plano de energia definido para {plan_key.replace('_', ' ').title()}.")
+                    return True, f"Plano de energia definido para {plan_key.replace('_', ' ').title()}."
+            else:
+                logger.error(f"Falha na criação do plano Desempenho Máximo. Output: {create_output}")
+                return False, f"Falha na criação e ativação do plano de energia: {create_output}"
+
+        # 3. RETORNO FINAL
+        if success:
+            logger.info(f"Plano de energia definido para {plan_key.replace('_', ' ').title()}.")
+            return True, f"Plano de energia definido para {plan_key.replace('_', ' ').title()}."
+        else:
+            logger.error(f"Falha ao definir plano de energia: {output}")
+            return False, f"Falha ao definir plano de energia: {output}"
+
+    def optimize_disk(self, drive_letter: str = "C") -> Tuple[bool, str]:
+        """
+        Executa a otimização (desfragmentação/TRIM) no disco especificado.
+        Requer privilégios de Administrador.
+        """
+        if not drive_letter or not drive_letter.isalpha() or len(drive_letter) != 1:
+            return False, "Letra da unidade inválida."
+
+        drive_letter = drive_letter.upper()
+
+        # Comando nativo do Windows: /O = Otimizar (Aplica TRIM em SSDs, desfragmenta HDDs)
+        command = ["defrag", f"{drive_letter}:", "/O", "/V"] 
+
+        logger.info(f"Iniciando otimização do disco {drive_letter}: com 'defrag /O'...")
+
+        success, output = execute_windows_command(command, timeout=DISK_OPTIMIZE_TIMEOUT)
+
+        if success:
+            if "completed" in output.lower() or "concluída" in output.lower() or "êxito" in output.lower():
+                msg = f"Otimização do disco {drive_letter}: concluída com sucesso."
+                logger.info(msg)
+                return True, msg
+            else:
+                msg = f"Otimização do disco {drive_letter}: finalizada, mas verifique o log para detalhes. {output.strip().splitlines()[-1]}"
+                logger.warning(msg)
+                return True, msg
+        else:
+            msg = f"Falha na otimização do disco {drive_letter}:. Erro: {output}"
+            logger.error(msg)
+            return False, msg
+
+    def terminate_processes(self, processes: List[str]) -> Tuple[bool, List[str]]:
+        """Tenta encerrar uma lista de processos usando o taskkill."""
+        terminated_list = []
+
+        logger.info(f"Tentando encerrar {len(processes)} processos para otimização.")
+        overall_success = True 
+
+        for process_name in processes:
+            if not is_valid_process_name(process_name):
+                # O taskkill roda no cmd.exe persistente: nomes arbitrários poderiam injetar comandos
+                logger.warning(f" - Nome de processo inválido ignorado: {process_name!r}")
+                overall_success = False
+                continue
+            command = ["taskkill", "/F", "/IM", process_name]
+            success, output = execute_windows_command(command)
+
+            if success:
+                if "AVISO:" in output:
+                    logger.debug(f" - Processo '{process_name}' não estava rodando.")
+                else:
+                    terminated_list.append(process_name)
+                    logger.info(f" - ENCERRADO: {process_name}")
+
+            else:
+                logger.warning(f" - FALHA crítica ao encerrar '{process_name}'. Output: {output.strip()}")
+
+        return overall_success, terminated_list
@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Any, Optional
+
+from src.utils.system import get_app_data_dir
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# LAYOUTS CONHECIDOS DE APLICATIVOS
+# ====================================================================
+
+DISCOVERY_INDEX_FILENAME = "discovery_index.json"
+DISCOVERY_INDEX_VERSION = 1
+
+MAX_DISCOVERY_WORKERS = 8
+
+# Subpastas de cache dos navegadores baseados em Chromium e dos aplicativos Electron
+CHROMIUM_CACHE_DIRS = ["Cache", "Code Cache", "GPUCache"]
+
+# Cada layout: app (nome exibido), root (raiz da plataforma), base (relativo à raiz),
+# profiles ("chromium" = Default/Profile N, "all" = toda subpasta, None = sem perfis)
+# e caches (subpastas removíveis dentro de cada perfil).
+WINDOWS_APP_LAYOUTS: List[Dict[str, Any]] = [
+    {"app": "Chrome", "root": "local", "base": "Google/Chrome/User Data", "profiles": "chromium", "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Edge", "root": "local", "base": "Microsoft/Edge/User Data", "profiles": "chromium", "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Brave", "root": "local", "base": "BraveSoftware/Brave-Browser/User Data", "profiles": "chromium", "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Vivaldi", "root": "local", "base": "Vivaldi/User Data", "profiles": "chromium", "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Opera", "root": "local", "base": "Opera Software/Opera Stable", "profiles": None, "caches": ["Cache"]},
+    {"app": "Firefox", "root": "local", "base": "Mozilla/Firefox/Profiles", "profiles": "all", "caches": ["cache2"]},
+    {"app": "Discord", "root": "roaming", "base": "discord", "profiles": None, "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Teams", "root": "roaming", "base": "Microsoft/Teams", "profiles": None, "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Slack", "root": "roaming", "base": "Slack", "profiles": None, "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "VS Code", "root": "roaming", "base": "Code", "profiles": None,
+     "caches": CHROMIUM_CACHE_DIRS + ["CachedData", "CachedExtensionVSIXs"]},
+]
+
+LINUX_APP_LAYOUTS: List[Dict[str, Any]] = [
+    {"app": "Chrome", "root": "cache", "base": "google-chrome", "profiles": "chromium", "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Chromium", "root": "cache", "base": "chromium", "profiles": "chromium", "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Edge", "root": "cache", "base": "microsoft-edge", "profiles": "chromium", "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Brave", "root": "cache", "base": "BraveSoftware/Brave-Browser", "profiles": "chromium", "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Firefox", "root": "cache", "base": "mozilla/firefox", "profiles": "all", "caches": ["cache2"]},
+    {"app": "Discord", "root": "config", "base": "discord", "profiles": None, "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Teams", "root": "config", "base": "teams-for-linux", "profiles": None, "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "Slack", "root": "config", "base": "Slack", "profiles": None, "caches": CHROMIUM_CACHE_DIRS},
+    {"app": "VS Code", "root": "config", "base": "Code", "profiles": None,
+     "caches": CHROMIUM_CACHE_DIRS + ["CachedData", "CachedExtensionVSIXs"]},
+]
+
+DEFAULT_PROFILE = "Default"
+
+
+# ====================================================================
+# SONDAGEM DOS LAYOUTS
+# ====================================================================
+
+def _platform_roots() -> Dict[str, Optional[str]]:
+    home = os.path.expanduser('~')
+    return {
+        "local": os.environ.get('LOCALAPPDATA'),
+        "roaming": os.environ.get('APPDATA'),
+        "config": os.environ.get('XDG_CONFIG_HOME') or os.path.join(home, '.config'),
+        "cache": os.environ.get('XDG_CACHE_HOME') or os.path.join(home, '.cache'),
+    }
+
+def get_app_layouts() -> List[Dict[str, Any]]:
+    """Layouts de aplicativos conhecidos na plataforma atual."""
+    return WINDOWS_APP_LAYOUTS if sys.platform == 'win32' else LINUX_APP_LAYOUTS
+
+def _layout_key(layout: Dict[str, Any]) -> str:
+    return f"{layout['app']}|{layout['root']}|{layout['base']}"
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+def _is_chromium_profile(name: str) -> bool:
+    return name == DEFAULT_PROFILE or name.startswith("Profile ") or name == "Guest Profile"
+
+def _target_name(app: str, profile: Optional[str], cache_dir: str) -> str:
+    # O perfil Default e a pasta 'Cache' mantêm os nomes antigos ('Cache Chrome'), preservando o histórico
+    name = f"Cache {app}"
+    if profile and profile != DEFAULT_PROFILE:
+        name += f" ({profile})"
+    if cache_dir != "Cache":
+        name += f" [{cache_dir}]"
+    return name
+
+def probe_layout(layout: Dict[str, Any], base_path: str) -> Dict[str, Any]:
+    """
+    Sonda um layout: encontra os perfis e as pastas de cache existentes.
+    Retorna a entrada do índice: mtimes das pastas observadas e os alvos encontrados.
+    """
+    watched = {base_path: _mtime(base_path)}
+    targets: Dict[str, str] = {}
+    if watched[base_path] is None:
+        return {"watched": watched, "targets": targets}
+
+    profiles: List[Tuple[Optional[str], str]] = []
+    if layout["profiles"] is None:
+        profiles.append((None, base_path))
+    else:
+        try:
+            with os.scandir(base_path) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if layout["profiles"] == "chromium" and not _is_chromium_profile(entry.name):
+                        continue
+                    profiles.append((entry.name, entry.path))
+        except OSError as e:
+            logger.debug(f"Falha ao listar perfis em '{base_path}': {e}")
+
+    for profile, profile_path in profiles:
+        if profile_path != base_path:
+            # Uma pasta de cache criada dentro do perfil altera o mtime do perfil
+            watched[profile_path] = _mtime(profile_path)
+        for cache_dir in layout["caches"]:
+            cache_path = os.path.join(profile_path, *cache_dir.split("/"))
+            if os.path.isdir(cache_path) and not os.path.islink(cache_path):
+                targets[_target_name(layout["app"], profile, cache_dir)] = cache_path
+
+    return {"watched": watched, "targets": targets}
+
+
+# ====================================================================
+# ÍNDICE PERSISTIDO DE LOCALIZAÇÕES
+# ====================================================================
+
+class DiscoveryIndex:
+    """
+    Índice das pastas de cache descobertas. Cada layout guarda o mtime das pastas
+    observadas (base e perfis); na próxima descoberta, só os layouts cujas pastas
+    mudaram são sondados de novo, em paralelo.
+    """
+
+    def __init__(self, index_file: str):
+        self.index_file = index_file
+        self.layouts: Dict[str, Dict[str, Any]] = {}
+        self.reprobed = 0
+
+    def load(self) -> "DiscoveryIndex":
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == DISCOVERY_INDEX_VERSION:
+                self.layouts = data.get("layouts", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Índice de descoberta ilegível, será recriado: {e}")
+        return self
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            tmp_path = self.index_file + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": DISCOVERY_INDEX_VERSION, "layouts": self.layouts}, f)
+            os.replace(tmp_path, self.index_file)
+        except OSError as e:
+            logger.debug(f"Não foi possível gravar o índice de descoberta: {e}")
+
+    @staticmethod
+    def _is_fresh(entry: Dict[str, Any], base_path: str) -> bool:
+        watched = entry.get("watched", {})
+        if base_path not in watched:
+            return False
+        return all(_mtime(path) == mtime for path, mtime in watched.items())
+
+    def discover(self, layouts: List[Dict[str, Any]], roots: Dict[str, Optional[str]]) -> Dict[str, str]:
+        """Retorna Nome -> Caminho de todas as pastas de cache, sondando apenas os layouts alterados."""
+        pending: List[Tuple[str, Dict[str, Any], str]] = []
+        current_keys = set()
+        for layout in layouts:
+            root = roots.get(layout["root"])
+            if not root:
+                continue
+            key = _layout_key(layout)
+            current_keys.add(key)
+            base_path = os.path.join(root, *layout["base"].split("/"))
+            entry = self.layouts.get(key)
+            if entry is None or not self._is_fresh(entry, base_path):
+                pending.append((key, layout, base_path))
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(MAX_DISCOVERY_WORKERS, len(pending))) as executor:
+                results = executor.map(lambda item: probe_layout(item[1], item[2]), pending)
+                for (key, _, _), entry in zip(pending, results):
+                    self.layouts[key] = entry
+            self.reprobed = len(pending)
+
+        # Layouts que deixaram de existir (ex: variável de ambiente ausente) saem do índice
+        for key in list(self.layouts):
+            if key not in current_keys:
+                del self.layouts[key]
+
+        targets: Dict[str, str] = {}
+        for layout in layouts:
+            entry = self.layouts.get(_layout_key(layout))
+            if entry:
+                targets.update(entry["targets"])
+        return targets
+
+
+def discover_app_caches() -> Dict[str, str]:
+    """
+    Descobre as pastas de cache de navegadores e aplicativos (todos os perfis).
+    Usa o índice persistido: em execuções seguintes, só os layouts alterados são sondados.
+    """
+    index = DiscoveryIndex(os.path.join(get_app_data_dir(), DISCOVERY_INDEX_FILENAME)).load()
+    try:
+        targets = index.discover(get_app_layouts(), _platform_roots())
+    except Exception as e:
+        logger.warning(f"Falha na descoberta de caches de aplicativos: {e}")
+        return {}
+    if index.reprobed:
+        index.save()
+        logger.debug(f"Descoberta de caches: {index.reprobed} layouts sondados, {len(targets)} pastas encontradas.")
+    return targets
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DO CACHE NEGATIVO
+# ====================================================================
+
+FAILURE_CACHE_FILENAME = "failure_cache.json"
+
+# Espera inicial antes de tentar de novo um item que falhou (dobra a cada falha)
+FAILURE_BASE_BACKOFF_SECONDS = 60 * 60            # 1 hora
+FAILURE_MAX_BACKOFF_SECONDS = 7 * 24 * 60 * 60    # 7 dias
+
+
+class FailureCache:
+    """
+    Cache persistente de caminhos que não puderam ser removidos.
+
+    Cada entrada guarda o errno, o mtime do arquivo no momento da falha e o
+    número de falhas consecutivas. Um item conhecido como bloqueado é pulado
+    nas próximas execuções até que seu mtime mude ou o período de espera
+    (backoff exponencial) expire.
+    """
+
+    def __init__(self, cache_file: str,
+                 base_backoff: float = FAILURE_BASE_BACKOFF_SECONDS,
+                 max_backoff: float = FAILURE_MAX_BACKOFF_SECONDS):
+        self.cache_file = cache_file
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        # Contadores da execução atual (usados no relatório)
+        self.skipped = 0
+        self.failed = 0
+
+    # --- Persistência ---
+
+    def load(self) -> "FailureCache":
+        """Carrega o cache do disco. Um arquivo ausente ou corrompido resulta em cache vazio."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = data
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            logger.debug(f"Cache negativo ilegível em {self.cache_file}, recriando: {e}")
+            self.entries = {}
+        return self
+
+    def save(self):
+        """Grava o cache no disco, descartando entradas antigas demais para serem úteis."""
+        now = time.time()
+        self.entries = {
+            path: entry for path, entry in self.entries.items()
+            if now - entry.get("last_failure", 0) < 2 * self.max_backoff
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = self.cache_file + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.warning(f"Não foi possível salvar o cache negativo em {self.cache_file}: {e}")
+
+    # --- Consulta e registro ---
+
+    def _backoff(self, failures: int) -> float:
+        return min(self.base_backoff * (2 ** max(failures - 1, 0)), self.max_backoff)
+
+    def should_skip(self, path: str, mtime: float) -> bool:
+        """Retorna True se o item falhou recentemente e não mudou desde então."""
+        entry = self.entries.get(path)
+        if entry is None:
+            return False
+
+        if entry.get("mtime") != mtime:
+            # O arquivo mudou: vale a pena tentar de novo
+            return False
+
+        if time.time() - entry.get("last_failure", 0) >= self._backoff(entry.get("failures", 1)):
+            return False
+
+        self.skipped += 1
+        return True
+
+    def record_failure(self, path: str, error: OSError, mtime: Optional[float]):
+        """Registra uma falha de remoção para o caminho."""
+        entry = self.entries.get(path)
+        failures = entry.get("failures", 0) + 1 if entry else 1
+        self.entries[path] = {
+            "errno": error.errno,
+            "mtime": mtime,
+            "failures": failures,
+            "last_failure": time.time(),
+        }
+        self.failed += 1
+
+    def record_success(self, path: str):
+        """Remove o caminho do cache após uma remoção bem-sucedida."""
+        self.entries.pop(path, None)
+
+    def total_failures(self, path_prefix: str = "") -> int:
+        """Soma as falhas registradas (opcionalmente apenas sob um diretório)."""
+        return sum(
+            entry.get("failures", 0) for path, entry in self.entries.items()
+            if path.startswith(path_prefix)
+        )
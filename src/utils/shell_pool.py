@@ -0,0 +1,248 @@
+import os
+import re
+import sys
+import queue
+import shlex
+import signal
+import time
+import uuid
+import atexit
+import logging
+import threading
+import subprocess
+from typing import List, Tuple, Optional, NamedTuple
+
+logger = logging.getLogger('BlazeScan')
+
+# ====================================================================
+# CONSTANTES DO POOL DE SHELLS
+# ====================================================================
+
+SHELL_POOL_SIZE = 2
+# Tempo limite padrão de cada comando (None = sem limite)
+DEFAULT_COMMAND_TIMEOUT = 120.0
+# Tempo para o shell recém-iniciado responder ao primeiro marcador
+WORKER_START_TIMEOUT = 10.0
+
+SENTINEL_PREFIX = "__END_"
+
+# Códigos de saída do shell para "comando não encontrado"
+COMMAND_NOT_FOUND_CODES = (127, 9009)
+
+# Evita que cada cmd.exe abra uma janela de console
+CREATE_NO_WINDOW = 0x08000000
+
+
+class ShellResult(NamedTuple):
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+
+
+class ShellWorkerError(Exception):
+    """O shell do worker terminou ou parou de responder."""
+
+
+def get_shell_command() -> List[str]:
+    """Shell persistente da plataforma: cmd.exe sem eco no Windows, /bin/sh nos demais."""
+    if sys.platform == 'win32':
+        return [os.environ.get('COMSPEC', 'cmd.exe'), '/Q', '/K']
+    return ['/bin/sh']
+
+
+class ShellWorker:
+    """
+    Um shell de longa duração que recebe comandos pelo stdin. Cada comando é seguido de
+    um marcador único em stdout (com o código de saída) e em stderr, que delimita a
+    resposta sem precisar encerrar o processo.
+    """
+
+    def __init__(self, shell_command: Optional[List[str]] = None):
+        self.shell_command = shell_command or get_shell_command()
+        self.is_cmd = os.path.basename(self.shell_command[0]).lower().startswith('cmd')
+        self.process: Optional[subprocess.Popen] = None
+        self._stdout: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    # --- Ciclo de vida ---
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        self._stdout, self._stderr = queue.Queue(), queue.Queue()
+        kwargs = {}
+        if sys.platform == 'win32':
+            kwargs['creationflags'] = CREATE_NO_WINDOW
+        else:
+            # Grupo próprio: no tempo limite, o shell e o comando em andamento são encerrados juntos
+            kwargs['start_new_session'] = True
+        self.process = subprocess.Popen(
+            self.shell_command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace',
+            bufsize=1,
+            **kwargs,
+        )
+        for stream, lines in ((self.process.stdout, self._stdout), (self.process.stderr, self._stderr)):
+            threading.Thread(target=self._pump, args=(stream, lines), daemon=True).start()
+        # Comando vazio: confirma que o shell responde e descarta o banner inicial
+        if self.run([], WORKER_START_TIMEOUT).timed_out:
+            raise ShellWorkerError("o shell não respondeu ao iniciar")
+        logger.debug(f"Shell persistente iniciado (PID {self.process.pid}).")
+
+    def stop(self):
+        process, self.process = self.process, None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            if sys.platform == 'win32':
+                # Encerra também o comando em andamento, filho do cmd.exe
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                               capture_output=True, creationflags=CREATE_NO_WINDOW)
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        try:
+            process.kill()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    @staticmethod
+    def _pump(stream, lines: "queue.Queue[Optional[str]]"):
+        try:
+            for line in stream:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    # --- Protocolo ---
+
+    def _wrap(self, command: List[str], token: str) -> str:
+        marker = f"{SENTINEL_PREFIX}{token}_"
+        if self.is_cmd:
+            command_str = subprocess.list2cmdline(command) if command else "rem"
+            # %^ERRORLEVEL% só é expandido no 'call', depois do comando terminar
+            return (f"{command_str} <NUL & call echo {marker}%^ERRORLEVEL% "
+                    f"& >&2 echo {marker}\n")
+        command_str = shlex.join(command) if command else ":"
+        return (f"{{ {command_str}\n}} </dev/null; printf '%s%d\\n' '{marker}' \"$?\"; "
+                f"printf '%s\\n' '{marker}' >&2\n")
+
+    @staticmethod
+    def _read_until(lines: "queue.Queue[Optional[str]]", marker: str,
+                    deadline: Optional[float]) -> Tuple[List[str], str]:
+        """Lê linhas até o marcador. Retorna as linhas anteriores e o restante da linha do marcador."""
+        collected: List[str] = []
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
+            try:
+                line = lines.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError()
+            if line is None:
+                raise ShellWorkerError("o shell terminou inesperadamente")
+            index = line.find(marker)
+            if index < 0:
+                collected.append(line)
+                continue
+            collected.append(line[:index])
+            return collected, line[index + len(marker):]
+
+    def run(self, command: List[str], timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT) -> ShellResult:
+        """
+        Executa um comando e espera pelos marcadores. No tempo limite o worker é encerrado
+        (o comando pode continuar preso ao shell) e ShellResult.timed_out é True.
+        """
+        if not self.is_alive():
+            raise ShellWorkerError("o shell não está em execução")
+
+        token = uuid.uuid4().hex
+        marker = f"{SENTINEL_PREFIX}{token}_"
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self.process.stdin.write(self._wrap(command, token))
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise ShellWorkerError(f"falha ao enviar o comando: {e}")
+
+        try:
+            stdout_lines, tail = self._read_until(self._stdout, marker, deadline)
+            stderr_lines, _ = self._read_until(self._stderr, marker, deadline)
+        except TimeoutError:
+            self.stop()
+            return ShellResult(None, "", "", timed_out=True)
+
+        match = re.match(r"-?\d+", tail.strip())
+        returncode = int(match.group(0)) if match else None
+        return ShellResult(returncode, "".join(stdout_lines), "".join(stderr_lines))
+
+
+class ShellPool:
+    """
+    Conjunto de shells persistentes. Cada comando usa um worker livre (criado sob demanda
+    e reiniciado automaticamente se tiver morrido), então rajadas de comandos do sistema
+    custam apenas a ida e volta pelos pipes, e não a inicialização de um shell novo.
+    """
+
+    def __init__(self, size: int = SHELL_POOL_SIZE, shell_command: Optional[List[str]] = None):
+        self._idle: "queue.Queue[ShellWorker]" = queue.Queue()
+        for _ in range(max(size, 1)):
+            self._idle.put(ShellWorker(shell_command))
+        # Workers descartados (shell morto ou tempo limite); cada um é reiniciado no próximo uso
+        self.restarts = 0
+        self._restarts_lock = threading.Lock()
+
+    def _discard(self, worker: ShellWorker, reason: str):
+        worker.stop()
+        with self._restarts_lock:
+            self.restarts += 1
+        logger.debug(f"Shell persistente descartado ({reason}); será reiniciado no próximo uso.")
+
+    def run(self, command: List[str], timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT) -> ShellResult:
+        worker = self._idle.get()
+        try:
+            if worker.process is not None and not worker.is_alive():
+                self._discard(worker, "encerrado enquanto ocioso")
+            if not worker.is_alive():
+                worker.start()
+            result = worker.run(command, timeout)
+            if result.timed_out:
+                # O worker já encerrou o shell e o comando preso a ele
+                self._discard(worker, "tempo limite")
+            return result
+        except ShellWorkerError:
+            # O comando pode ter sido executado: não é repetido, só o worker é descartado
+            self._discard(worker, "shell terminou")
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def shutdown(self):
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_default_pool: Optional[ShellPool] = None
+_default_pool_lock = threading.Lock()
+
+def get_shell_pool() -> ShellPool:
+    """Pool compartilhado pelo processo, encerrado automaticamente na saída."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ShellPool()
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
@@ -1,8 +1,17 @@
 import os
-import subprocess
+import re
+import sys
+import stat
+import shutil
+import glob
+import time
+import heapq
+import functools
 import logging
-from typing import List, Tuple, Optional, Dict
-import shutil # Importação necessária para clean_directory
+from typing import List, Tuple, Optional, Dict, Callable
+
+from src.utils.failure_cache import FailureCache, FAILURE_CACHE_FILENAME
+from src.utils.shell_pool import get_shell_pool, ShellWorkerError, DEFAULT_COMMAND_TIMEOUT, COMMAND_NOT_FOUND_CODES
 
 logger = logging.getLogger('BlazeScan')
 
@@ -17,6 +26,27 @@ POWER_PLAN_GUIDS = {
     "POWER_SAVER": "a1841308-3541-4fab-bc81-f71556f20b4a"
 }
 
+# Atributo de arquivo do Windows que identifica symlinks e junctions
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+FILE_ATTRIBUTE_DIRECTORY = 0x10
+FILE_ATTRIBUTE_SPARSE_FILE = 0x200
+FILE_ATTRIBUTE_COMPRESSED = 0x800
+
+# st_blocks é sempre contado em unidades de 512 bytes (POSIX)
+POSIX_BLOCK_SIZE = 512
+DEFAULT_CLUSTER_SIZE = 4096
+
+APP_DATA_DIRNAME = "BlazeScan"
+
+# Entradas de /tmp e /var/tmp que o próprio systemd-tmpfiles nunca apaga (tmp.conf e x11.conf):
+# os /tmp privados dos serviços (PrivateTmp) e os diretórios de sockets do X11, ICE, XIM e fontes.
+# São de root, então o filtro por dono não as protege quando a limpeza roda como root
+PROTECTED_TEMP_ENTRY_PATTERN = re.compile(r"systemd-private-.*|\..*-unix")
+
+# Prioridade usada por trabalhos em segundo plano
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+BACKGROUND_NICE_LEVEL = 19
+
 OPT_PROCESSES_TO_KILL: List[str] = [
     "spotify.exe",
     "epicgameslauncher.exe", 
@@ -36,6 +66,13 @@ OPT_PROCESSES_TO_KILL: List[str] = [
     "copilot.exe",
 ]
 
+# Nome de executável aceito para encerramento: sem caminhos, curingas (*) nem metacaracteres
+# do cmd.exe (&, |, ^, <, >), e sem começar com '/' ou '-' (não vira opção do taskkill/pkill)
+PROCESS_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._ -]{0,254}")
+
+def is_valid_process_name(name) -> bool:
+    return isinstance(name, str) and PROCESS_NAME_PATTERN.fullmatch(name) is not None
+
 # ====================================================================
 # FUNÇÕES DE UTILIDADE GERAL
 # ====================================================================
@@ -52,18 +89,75 @@ def format_bytes(size_in_bytes: int) -> str:
         i += 1
     return f"{size:.2f} {units[i]}"
 
-def execute_windows_command(command: List[str]) -> Tuple[bool, str]:
-    """Executa um comando do Windows e retorna o status e a saída (stdout + stderr)."""
+def get_app_data_dir() -> str:
+    """Retorna o diretório onde o BlazeScan guarda seus dados persistentes (caches, histórico)."""
+    base_dir = os.environ.get('LOCALAPPDATA')
+    if not base_dir:
+        base_dir = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base_dir, APP_DATA_DIRNAME)
+
+def lower_current_thread_priority():
+    """
+    Reduz a prioridade de CPU e de I/O da thread atual (usado por trabalhos em segundo plano).
+    No Windows usa o modo background da thread; no Linux o nice da thread também
+    reduz a prioridade de I/O nos escalonadores que a respeitam (CFQ/BFQ).
+    """
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+        elif hasattr(os, 'setpriority'):
+            import threading
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), BACKGROUND_NICE_LEVEL)
+    except Exception as e:
+        logger.debug(f"Não foi possível reduzir a prioridade da thread: {e}")
+
+_cpu_times_sample: Optional[Tuple[int, int]] = None
+
+def get_system_load() -> Optional[float]:
+    """
+    Carga atual do sistema como fração da capacidade de CPU (1.0 = todos os núcleos ocupados).
+    No Linux usa a média de carga de 1 minuto; no Windows, o uso de CPU desde a chamada anterior
+    (GetSystemTimes). Retorna None se não for possível medir.
+    """
+    global _cpu_times_sample
+    try:
+        if hasattr(os, 'getloadavg'):
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+            idle, kernel, user = wintypes.FILETIME(), wintypes.FILETIME(), wintypes.FILETIME()
+            if not ctypes.windll.kernel32.GetSystemTimes(ctypes.byref(idle), ctypes.byref(kernel), ctypes.byref(user)):
+                return None
+            to_int = lambda ft: (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+            # O tempo de kernel já inclui o tempo ocioso
+            sample = (to_int(idle), to_int(kernel) + to_int(user))
+            previous, _cpu_times_sample = _cpu_times_sample, sample
+            if previous is None or sample[1] <= previous[1]:
+                return None
+            idle_delta, total_delta = sample[0] - previous[0], sample[1] - previous[1]
+            return 1.0 - idle_delta / total_delta
+    except Exception as e:
+        logger.debug(f"Não foi possível medir a carga do sistema: {e}")
+    return None
+
+def execute_windows_command(command: List[str], timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT) -> Tuple[bool, str]:
+    """
+    Executa um comando do Windows e retorna o status e a saída (stdout + stderr).
+    O comando roda em um dos shells persistentes do pool (sem criar um processo de shell
+    por chamada) e é interrompido após 'timeout' segundos (None = sem limite).
+    """
     command_str = " ".join(command)
     
     try:
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            shell=True,
-            check=False # Garante que não levante exceção em códigos de retorno diferentes de zero
-        )
+        result = get_shell_pool().run(command, timeout)
+
+        if result.timed_out:
+            logger.error(f"Tempo limite de {timeout:g}s excedido ao executar '{command_str}'.")
+            return False, f"Tempo limite de {timeout:g}s excedido."
         
         stdout_output = result.stdout.strip()
         stderr_output = result.stderr.strip()
@@ -71,6 +165,10 @@ def execute_windows_command(command: List[str]) -> Tuple[bool, str]:
         if result.returncode == 0:
             logger.debug(f"Comando executado com sucesso: {command[0]}")
             return True, stdout_output
+
+        elif result.returncode in COMMAND_NOT_FOUND_CODES:
+            logger.error(f"Comando não encontrado: {command[0]}")
+            return False, f"Comando não encontrado: {command[0]}"
         
         else:
             # Taskkill pode retornar erro se o processo não for encontrado (tratamento específico)
@@ -81,10 +179,10 @@ def execute_windows_command(command: List[str]) -> Tuple[bool, str]:
             error_message = f"CÓDIGO {result.returncode}: {stderr_output}"
             logger.error(f"Falha ao executar '{command_str}'. Saída de Erro: {error_message}")
             return False, error_message
-            
-    except FileNotFoundError:
-        logger.error(f"Comando não encontrado: {command[0]}")
-        return False, f"Comando não encontrado: {command[0]}"
+
+    except ShellWorkerError as e:
+        logger.error(f"Falha no shell ao executar '{command_str}': {e}")
+        return False, f"Falha no shell: {e}"
         
     except Exception as e:
         logger.error(f"Erro inesperado ao executar '{command_str}': {e}")
@@ -95,176 +193,414 @@ def execute_windows_command(command: List[str]) -> Tuple[bool, str]:
 # FUNÇÕES DE INTERAÇÃO COM O SISTEMA
 # ====================================================================
 
+def get_platform_backend():
+    """Retorna o backend da plataforma atual (importação tardia: os backends dependem deste módulo)."""
+    from src.utils.backends import get_platform_backend as _get_platform_backend
+    return _get_platform_backend()
+
 def get_temp_paths() -> Dict[str, str]:
     """Retorna um dicionário de caminhos temporários a serem limpos."""
-    user_temp = os.environ.get('TEMP')
-    local_app_data = os.environ.get('LOCALAPPDATA')
-    system_drive = os.environ.get('SystemDrive', 'C:')
+    return get_platform_backend().get_temp_paths()
 
-    paths = {}
-    if user_temp:
-        paths['Temp Usuário'] = user_temp
-    if local_app_data:
-        paths['Temp/Cache Local'] = os.path.join(local_app_data, 'Temp')
-        paths['Cache Edge'] = os.path.join(local_app_data, 'Microsoft', 'Edge', 'User Data', 'Default', 'Cache')
-        paths['Cache Chrome'] = os.path.join(local_app_data, 'Google', 'Chrome', 'User Data', 'Default', 'Cache')
+def get_file_targets() -> Dict[str, List[str]]:
+    """Retorna um dicionário de padrões de arquivos avulsos a serem apagados (ex: logs rotacionados)."""
+    return get_platform_backend().get_file_targets()
 
-    if system_drive:
-        paths['Temp Sistema'] = os.path.join(system_drive, 'Windows', 'Temp')
-        paths['Prefetch'] = os.path.join(system_drive, 'Windows', 'Prefetch')
+def get_min_file_age(target_name: str) -> Optional[float]:
+    """Retorna a idade mínima (em segundos) dos arquivos apagados em um alvo, ou None."""
+    return get_platform_backend().get_min_file_age(target_name)
 
-    return paths
+def get_required_owner(target_name: str) -> Optional[int]:
+    """Retorna o UID dono dos itens apagados em um alvo compartilhado (ex: /tmp), ou None."""
+    return get_platform_backend().get_required_owner(target_name)
 
-def set_power_plan(plan_key: str) -> Tuple[bool, str]:
-    """Define o plano de energia do Windows."""
-    
-    plan_upper = plan_key.upper()
-    guid = POWER_PLAN_GUIDS.get(plan_upper)
-    
-    if not guid:
-        logger.warning(f"Plano de energia '{plan_key}' desconhecido.")
-        return False, f"Plano de energia '{plan_key}' desconhecido."
-    
-    # 1. Tentar ativar o plano
-    command = ["powercfg", "/setactive", guid]
-    success, output = execute_windows_command(command)
-    
-    # 2. SE FALHAR E FOR O 'DESEMPENHO MÁXIMO', TENTAR CRIÁ-LO (Lógica robusta)
-    if not success and plan_upper == "MAXIMUM_PERFORMANCE":
-        logger.warning("Falha ao ativar Desempenho Máximo. Tentando criá-lo primeiro...")
-        
-        # Comando para duplicar o plano HIGH_PERFORMANCE (8c5...) para o MAXIMUM_PERFORMANCE (e9a...)
-        creation_command = ["powercfg", "/duplicate scheme", 
-                            POWER_PLAN_GUIDS["HIGH_PERFORMANCE"], 
-                            POWER_PLAN_GUIDS["MAXIMUM_PERFORMANCE"]]
-        
-        create_success, create_output = execute_windows_command(creation_command)
-        
-        if create_success:
-            logger.info("Plano 'Desempenho Máximo' criado com sucesso. Tentando ativar novamente.")
-            success, output = execute_windows_command(command)
-            
-            if success:
-                logger.info(f"Plano de energia definido para {plan_key.replace('_', ' ').title()}.")
-                return True, f"Plano de energia definido para {plan_key.replace('_', ' ').title()}."
-        else:
-            logger.error(f"Falha na criação do plano Desempenho Máximo. Output: {create_output}")
-            return False, f"Falha na criação e ativação do plano de energia: {create_output}"
+def get_compress_paths() -> Dict[str, str]:
+    """Retorna um dicionário de pastas de logs e dumps que podem ser comprimidos em vez de apagados."""
+    return get_platform_backend().get_compress_paths()
+
+def get_classifier_paths() -> Dict[str, str]:
+    """Retorna as pastas examinadas pelo classificador de lixo por conteúdo."""
+    return get_platform_backend().get_classifier_paths()
 
-    # 3. RETORNO FINAL
-    if success:
-        logger.info(f"Plano de energia definido para {plan_key.replace('_', ' ').title()}.")
-        return True, f"Plano de energia definido para {plan_key.replace('_', ' ').title()}."
-    else:
-        logger.error(f"Falha ao definir plano de energia: {output}")
-        return False, f"Falha ao definir plano de energia: {output}"
+def get_processes_to_kill() -> List[str]:
+    """Retorna os processos encerrados pela otimização na plataforma atual."""
+    return get_platform_backend().get_processes_to_kill()
+
+def set_power_plan(plan_key: str) -> Tuple[bool, str]:
+    """Define o plano de energia (no Linux, o governor da CPU equivalente)."""
+    return get_platform_backend().set_power_plan(plan_key)
 
 def optimize_disk(drive_letter: str = "C") -> Tuple[bool, str]:
     """
     Executa a otimização (desfragmentação/TRIM) no disco especificado.
     Requer privilégios de Administrador.
     """
-    if not drive_letter or not drive_letter.isalpha() or len(drive_letter) != 1:
-        return False, "Letra da unidade inválida."
+    return get_platform_backend().optimize_disk(drive_letter)
 
-    drive_letter = drive_letter.upper()
-    
-    # Comando nativo do Windows: /O = Otimizar (Aplica TRIM em SSDs, desfragmenta HDDs)
-    command = ["defrag", f"{drive_letter}:", "/O", "/V"] 
-    
-    logger.info(f"Iniciando otimização do disco {drive_letter}: com 'defrag /O'...")
-    
-    success, output = execute_windows_command(command)
-    
-    if success:
-        if "completed" in output.lower() or "concluída" in output.lower() or "êxito" in output.lower():
-            msg = f"Otimização do disco {drive_letter}: concluída com sucesso."
-            logger.info(msg)
-            return True, msg
-        else:
-            msg = f"Otimização do disco {drive_letter}: finalizada, mas verifique o log para detalhes. {output.strip().splitlines()[-1]}"
-            logger.warning(msg)
-            return True, msg
-    else:
-        msg = f"Falha na otimização do disco {drive_letter}:. Erro: {output}"
-        logger.error(msg)
-        return False, msg
-    
 def terminate_processes(processes: List[str]) -> Tuple[bool, List[str]]:
-    """Tenta encerrar uma lista de processos usando o taskkill."""
-    terminated_list = []
-    
-    logger.info(f"Tentando encerrar {len(processes)} processos para otimização.")
-    overall_success = True 
-    
-    for process_name in processes:
-        command = ["taskkill", "/F", "/IM", process_name]
-        success, output = execute_windows_command(command)
-        
-        if success:
-            if "AVISO:" in output:
-                logger.debug(f" - Processo '{process_name}' não estava rodando.")
-            else:
-                terminated_list.append(process_name)
-                logger.info(f" - ENCERRADO: {process_name}")
-                
+    """Tenta encerrar uma lista de processos."""
+    return get_platform_backend().terminate_processes(processes)
+
+# ====================================================================
+# CONTABILIDADE DE ESPAÇO (TAMANHO APARENTE x ALOCADO EM DISCO)
+# ====================================================================
+
+@functools.lru_cache(maxsize=None)
+def _get_cluster_size(drive: str) -> int:
+    """Tamanho do cluster do volume no Windows (consultado uma vez por unidade)."""
+    try:
+        import ctypes
+        sectors_per_cluster, bytes_per_sector = ctypes.c_ulong(), ctypes.c_ulong()
+        free_clusters, total_clusters = ctypes.c_ulong(), ctypes.c_ulong()
+        if ctypes.windll.kernel32.GetDiskFreeSpaceW(
+                ctypes.c_wchar_p(drive + "\\"), ctypes.byref(sectors_per_cluster), ctypes.byref(bytes_per_sector),
+                ctypes.byref(free_clusters), ctypes.byref(total_clusters)):
+            return sectors_per_cluster.value * bytes_per_sector.value or DEFAULT_CLUSTER_SIZE
+    except Exception as e:
+        logger.debug(f"Não foi possível obter o tamanho do cluster de '{drive}': {e}")
+    return DEFAULT_CLUSTER_SIZE
+
+def _get_compressed_file_size(path: str) -> Optional[int]:
+    """Bytes realmente ocupados por arquivos esparsos/comprimidos no Windows (GetCompressedFileSizeW)."""
+    try:
+        import ctypes
+        high = ctypes.c_ulong(0)
+        low = ctypes.windll.kernel32.GetCompressedFileSizeW(ctypes.c_wchar_p(path), ctypes.byref(high))
+        if low == 0xFFFFFFFF and ctypes.GetLastError() != 0:
+            return None
+        return (high.value << 32) + low
+    except Exception:
+        return None
+
+def get_allocated_size(path: str, st: os.stat_result) -> int:
+    """
+    Retorna os bytes que o arquivo ocupa no disco (blocos alocados), e não o tamanho aparente.
+    Arquivos esparsos ocupam menos que st_size; arquivos pequenos ocupam um cluster inteiro.
+    """
+    if hasattr(st, 'st_blocks'):
+        return st.st_blocks * POSIX_BLOCK_SIZE
+
+    size = st.st_size
+    attributes = getattr(st, 'st_file_attributes', 0)
+    if attributes & (FILE_ATTRIBUTE_SPARSE_FILE | FILE_ATTRIBUTE_COMPRESSED):
+        compressed_size = _get_compressed_file_size(path)
+        if compressed_size is not None:
+            size = compressed_size
+    cluster_size = _get_cluster_size(os.path.splitdrive(os.path.abspath(path))[0])
+    return -(-size // cluster_size) * cluster_size
+
+class CleanupInterrupted(Exception):
+    """Levantada pelo throttle de um SpaceAccount para encerrar uma limpeza antes do fim."""
+
+
+class SpaceAccount:
+    """
+    Soma o espaço dos arquivos removidos em bytes aparentes e em bytes alocados no disco.
+    Hardlinks são contados uma única vez: o conteúdo só deixa o disco quando o último link
+    é removido (st_nlink == 1 no momento da remoção).
+
+    O throttle opcional é chamado após cada remoção com os bytes liberados no disco (a mesma
+    unidade do total do alvo), para limite de taxa e progresso; ele pode dormir ou levantar
+    CleanupInterrupted para encerrar a limpeza.
+    """
+
+    def __init__(self, throttle: Optional[Callable[[int], None]] = None):
+        self.apparent_bytes = 0
+        self.on_disk_bytes = 0
+        self.files = 0
+        self.throttle = throttle
+        self._seen_inodes = set()
+
+    def add_removed(self, path: str, st: os.stat_result) -> int:
+        """Registra um arquivo removido e retorna os bytes efetivamente liberados no disco."""
+        self.files += 1
+        freed = 0
+        if st.st_ino and st.st_nlink > 1:
+            # Outros links continuam apontando para o conteúdo: nada é liberado ainda
+            key = (st.st_dev, st.st_ino)
+            if key not in self._seen_inodes:
+                self._seen_inodes.add(key)
+                self.apparent_bytes += st.st_size
         else:
-            logger.warning(f" - FALHA crítica ao encerrar '{process_name}'. Output: {output.strip()}")
+            if st.st_ino and (st.st_dev, st.st_ino) in self._seen_inodes:
+                # Último link de um inode já contado no tamanho aparente
+                self._seen_inodes.discard((st.st_dev, st.st_ino))
+            else:
+                self.apparent_bytes += st.st_size
+            freed = get_allocated_size(path, st)
+            self.on_disk_bytes += freed
+
+        # Chamado depois de contabilizar: uma interrupção nunca perde o que já foi removido
+        if self.throttle is not None:
+            self.throttle(freed)
+        return freed
+
+def get_disk_free_bytes(path: str) -> Optional[int]:
+    """Espaço livre do volume que contém o caminho (shutil.disk_usage), ou None se indisponível."""
+    try:
+        return shutil.disk_usage(path).free
+    except OSError:
+        return None
 
-    return overall_success, terminated_list
 
 # ====================================================================
 # FUNÇÕES DE LIMPEZA E CÁLCULO DE TAMANHO (CORREÇÃO DE ERRO ANTERIOR)
 # ====================================================================
 
 def get_dir_size(start_path: str) -> int:
-    """Calcula o tamanho total de todos os arquivos em um diretório, em bytes."""
+    """
+    Calcula o espaço em disco ocupado por um diretório, em bytes (blocos alocados).
+    Arquivos com vários hardlinks são contados uma única vez.
+    """
     total_size = 0
+    seen_inodes = set()
     if not os.path.exists(start_path):
         return 0
     try:
         for dirpath, dirnames, filenames in os.walk(start_path):
             for f in filenames:
                 fp = os.path.join(dirpath, f)
-                if not os.path.islink(fp):
-                    try:
-                        total_size += os.path.getsize(fp)
-                    except OSError:
-                        logger.debug(f"Permissão negada ou erro ao obter tamanho de: {fp}")
+                try:
+                    st = os.lstat(fp)
+                except OSError:
+                    logger.debug(f"Permissão negada ou erro ao obter tamanho de: {fp}")
+                    continue
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                if st.st_ino and st.st_nlink > 1:
+                    if (st.st_dev, st.st_ino) in seen_inodes:
+                        continue
+                    seen_inodes.add((st.st_dev, st.st_ino))
+                total_size += get_allocated_size(fp, st)
     except Exception as e:
         logger.debug(f"Erro ao calcular tamanho em {start_path}: {e}")
     return total_size
 
-def clean_directory(path: str) -> int:
-    """Remove todo o conteúdo de um diretório e retorna o tamanho liberado."""
-    if not os.path.exists(path):
-        return 0
-        
-    cleaned_size = get_dir_size(path)
-        
-    # 2. Tenta remover TUDO
+def _is_plain_dir(entry: os.DirEntry) -> bool:
+    """Retorna True para diretórios reais (não symlinks nem junctions do Windows)."""
     try:
-        # Percorre o conteúdo do diretório de destino
-        for item in os.listdir(path):
-            item_path = os.path.join(path, item)
+        if not entry.is_dir(follow_symlinks=False):
+            return False
+        attributes = getattr(entry.stat(follow_symlinks=False), 'st_file_attributes', 0)
+        return not (attributes & FILE_ATTRIBUTE_REPARSE_POINT)
+    except OSError:
+        return False
+
+def is_protected_temp_entry(name: str) -> bool:
+    """Retorna True para entradas de serviços do sistema que nunca devem ser apagadas nem movidas."""
+    return PROTECTED_TEMP_ENTRY_PATTERN.fullmatch(name) is not None
+
+def _is_removable(st: os.stat_result, min_mtime: Optional[float], owner_uid: Optional[int] = None) -> bool:
+    """
+    Sockets, FIFOs e dispositivos nunca são lixo; com min_mtime, arquivos recentes também são mantidos.
+    Com owner_uid, itens de outros usuários (ex: em /tmp, limpo como root) nunca são tocados.
+    """
+    if stat.S_ISSOCK(st.st_mode) or stat.S_ISFIFO(st.st_mode) or stat.S_ISCHR(st.st_mode) or stat.S_ISBLK(st.st_mode):
+        return False
+    if owner_uid is not None and st.st_uid != owner_uid:
+        return False
+    if min_mtime is not None and max(st.st_mtime, st.st_atime) > min_mtime:
+        return False
+    return True
+
+def _remove_file(item_path: str, st: os.stat_result, failure_cache: Optional[FailureCache]) -> bool:
+    """Remove um arquivo (ou link) já examinado, registrando o resultado no cache negativo."""
+    if failure_cache is not None and failure_cache.should_skip(item_path, st.st_mtime):
+        logger.debug(f" - Pulado (bloqueado anteriormente): '{item_path}'")
+        return False
+
+    try:
+        is_dir_link = stat.S_ISDIR(st.st_mode) or getattr(st, 'st_file_attributes', 0) & FILE_ATTRIBUTE_DIRECTORY
+        if is_dir_link and sys.platform == 'win32':
+            # Junction/symlink para diretório: remove apenas o link, nunca o alvo
+            os.rmdir(item_path)
+        else:
+            os.remove(item_path)
+        if failure_cache is not None:
+            failure_cache.record_success(item_path)
+        return True
+    except OSError as e:
+        logger.debug(f" - Falha ao remover '{item_path}': {e}")
+        if failure_cache is not None:
+            failure_cache.record_failure(item_path, e, st.st_mtime)
+        return False
+
+def _remove_tree_contents(path: str, failure_cache: Optional[FailureCache] = None,
+                          min_mtime: Optional[float] = None,
+                          account: Optional[SpaceAccount] = None,
+                          owner_uid: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Remove recursivamente o conteúdo de um diretório.
+    Retorna (bytes liberados no disco, arquivos removidos).
+    Arquivos conhecidos como bloqueados (cache negativo) são pulados sem nova tentativa.
+    """
+    account = account if account is not None else SpaceAccount()
+    removed_bytes, removed_files = 0, 0
+    try:
+        entries = list(os.scandir(path))
+    except OSError as e:
+        logger.debug(f" - Falha ao listar '{path}': {e}")
+        return 0, 0
+
+    for entry in entries:
+        item_path = entry.path
+        if is_protected_temp_entry(entry.name):
+            continue
+
+        if _is_plain_dir(entry):
             try:
-                if os.path.isdir(item_path):
-                    # Remove pastas recursivamente (ignora erros de permissão/arquivo em uso)
-                    shutil.rmtree(item_path, ignore_errors=True)
-                else:
-                    # Remove arquivos (ignora erros de permissão/arquivo em uso)
-                    os.remove(item_path)
-            except Exception as sub_e:
-                # Loga o arquivo/pasta específico que não pôde ser removido
-                logger.debug(f" - Falha ao remover '{item_path}': {sub_e}")
-        
+                dir_st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if owner_uid is not None and dir_st.st_uid != owner_uid:
+                # Pasta de outro usuário: nem o conteúdo é examinado
+                continue
+            dir_mtime = dir_st.st_mtime
+            sub_bytes, sub_files = _remove_tree_contents(item_path, failure_cache, min_mtime, account, owner_uid)
+            removed_bytes += sub_bytes
+            removed_files += sub_files
+            if min_mtime is not None and dir_mtime > min_mtime:
+                # Pasta criada/alterada recentemente pode estar em uso por outro processo
+                continue
+            try:
+                os.rmdir(item_path)
+            except OSError as e:
+                # Diretório ainda contém itens em uso: a falha já foi registrada nos filhos
+                logger.debug(f" - Falha ao remover pasta '{item_path}': {e}")
+            continue
+
+        try:
+            st = entry.stat(follow_symlinks=False)
+            if stat.S_ISREG(st.st_mode) and not st.st_ino:
+                # No Windows, DirEntry.stat() não preenche st_ino/st_nlink: sem o lstat,
+                # arquivos com hardlinks seriam contados como liberados a cada link removido
+                st = os.lstat(item_path)
+        except OSError:
+            continue
+
+        if not _is_removable(st, min_mtime, owner_uid):
+            continue
+
+        if _remove_file(item_path, st, failure_cache) and stat.S_ISREG(st.st_mode):
+            removed_bytes += account.add_removed(item_path, st)
+            removed_files += 1
+
+    return removed_bytes, removed_files
+
+def load_failure_cache() -> FailureCache:
+    """Carrega o cache negativo de itens que não puderam ser removidos."""
+    return FailureCache(os.path.join(get_app_data_dir(), FAILURE_CACHE_FILENAME)).load()
+
+def clean_directory(path: str, failure_cache: Optional[FailureCache] = None,
+                    min_age: Optional[float] = None,
+                    account: Optional[SpaceAccount] = None,
+                    owner_uid: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Remove todo o conteúdo de um diretório e retorna (bytes liberados no disco, arquivos removidos).
+    Com min_age (segundos), apenas arquivos sem uso há pelo menos esse tempo são removidos.
+    Com owner_uid, apenas itens desse usuário são removidos.
+    O tamanho aparente removido fica disponível em account, se informado.
+    """
+    if not os.path.exists(path):
+        return 0, 0
+
+    min_mtime = time.time() - min_age if min_age else None
+
+    # Remove tudo o que for possível; itens em uso permanecem e ficam registrados no cache negativo
+    account = account if account is not None else SpaceAccount()
+    bytes_before, files_before = account.on_disk_bytes, account.files
+    try:
+        cleaned_size, removed_files = _remove_tree_contents(path, failure_cache, min_mtime, account, owner_uid)
+    except CleanupInterrupted:
+        # Interrompida pelo throttle: o que já foi removido está no account
+        cleaned_size, removed_files = account.on_disk_bytes - bytes_before, account.files - files_before
     except Exception as e:
         logger.warning(f"Falha na limpeza de {path} (erro principal): {e}. Itens que estavam em uso podem ter permanecido.")
-        
-    # 3. Garante que o diretório base existe (importante para o TEMP, etc.)
+        cleaned_size, removed_files = 0, 0
+
+    # Garante que o diretório base existe (importante para o TEMP, etc.)
     try:
         os.makedirs(path, exist_ok=True)
     except Exception as e:
         logger.error(f"Não foi possível recriar o diretório temporário {path}: {e}")
-        
-    return cleaned_size
\ No newline at end of file
+
+    return cleaned_size, removed_files
+
+def clean_files(patterns: List[str], failure_cache: Optional[FailureCache] = None,
+                account: Optional[SpaceAccount] = None) -> Tuple[int, int]:
+    """Remove os arquivos avulsos que casam com os padrões glob e retorna (bytes liberados no disco, arquivos removidos)."""
+    account = account if account is not None else SpaceAccount()
+    cleaned_size, removed_files = 0, 0
+    seen = set()
+
+    for pattern in patterns:
+        for file_path in glob.iglob(pattern, recursive=True):
+            if file_path in seen:
+                continue
+            seen.add(file_path)
+            try:
+                st = os.lstat(file_path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            if _remove_file(file_path, st, failure_cache):
+                cleaned_size += account.add_removed(file_path, st)
+                removed_files += 1
+
+    return cleaned_size, removed_files
+
+def trim_directory(path: str, budget_bytes: int,
+                   failure_cache: Optional[FailureCache] = None,
+                   account: Optional[SpaceAccount] = None) -> Tuple[int, int, int]:
+    """
+    Reduz um cache ao orçamento de bytes removendo primeiro os arquivos acessados há mais tempo (LRU).
+    Uma única varredura coleta (último acesso, tamanho alocado, caminho); um heap seleciona os mais antigos.
+    Retorna (bytes mantidos, bytes removidos, arquivos removidos), em bytes ocupados no disco.
+    """
+    if not os.path.exists(path):
+        return 0, 0, 0
+
+    account = account if account is not None else SpaceAccount()
+    bytes_before = account.on_disk_bytes
+
+    entries: List[Tuple[float, int, str]] = []
+    total_bytes = 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            try:
+                st = os.lstat(file_path)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                allocated = get_allocated_size(file_path, st)
+                entries.append((max(st.st_atime, st.st_mtime), allocated, file_path))
+                total_bytes += allocated
+
+    if total_bytes <= budget_bytes:
+        return total_bytes, 0, 0
+
+    # heapify é O(n); só os k arquivos removidos pagam O(log n) cada
+    heapq.heapify(entries)
+    evicted_bytes, evicted_files = 0, 0
+    excess = total_bytes - budget_bytes
+
+    while entries and evicted_bytes < excess:
+        last_access, size, file_path = heapq.heappop(entries)
+        try:
+            st = os.lstat(file_path)
+        except OSError:
+            continue
+        if max(st.st_atime, st.st_mtime) > last_access:
+            # Usado depois da varredura: voltou a fazer parte do conjunto quente
+            continue
+        if _remove_file(file_path, st, failure_cache):
+            evicted_files += 1
+            try:
+                evicted_bytes += account.add_removed(file_path, st)
+            except CleanupInterrupted:
+                evicted_bytes = account.on_disk_bytes - bytes_before
+                break
+
+    return total_bytes - evicted_bytes, evicted_bytes, evicted_files
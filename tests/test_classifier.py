@@ -0,0 +1,63 @@
+import os
+import struct
+
+import pytest
+
+from src.backend.classifier import (
+    classify_file,
+    CATEGORY_CRASH_DUMP,
+    CATEGORY_INSTALLER,
+    CATEGORY_PARTIAL_DOWNLOAD,
+    CATEGORY_ARCHIVE_FRAGMENT,
+    MAGIC_MINIDUMP,
+    MAGIC_OLE,
+    MAGIC_7Z,
+    ELF_TYPE_CORE,
+)
+
+NOW = 1_700_000_000.0
+HOUR_SECONDS = 60 * 60
+
+
+def _elf_header(elf_type):
+    # ELF de 64 bits, little-endian; e_type fica no offset 16
+    return b"\x7fELF" + bytes([2, 1, 1, 0]) + b"\0" * 8 + struct.pack("<H", elf_type) + b"\0" * 46
+
+
+def _stat(age_seconds=30 * 24 * HOUR_SECONDS, size=1024 * 1024):
+    mtime = NOW - age_seconds
+    return os.stat_result((0o100644, 0, 0, 1, 0, 0, size, mtime, mtime, mtime))
+
+
+CASES = [
+    # (nome, cabeçalho, nomes na pasta, idade, categoria esperada, confiança esperada)
+    ("WER123.bin", MAGIC_MINIDUMP + b"\0" * 60, set(), None, CATEGORY_CRASH_DUMP, 0.95),
+    ("core.4242", _elf_header(ELF_TYPE_CORE), set(), None, CATEGORY_CRASH_DUMP, 0.9),
+    ("programa.core", _elf_header(2), set(), None, None, None),
+    ("setup.msi", MAGIC_OLE + b"\0" * 56, set(), None, CATEGORY_INSTALLER, 0.8),
+    ("setup.msi", b"<html>pagina de erro</html>", set(), None, None, None),
+    ("setup.msi", None, set(), None, None, None),
+    ("backup.7z.002", MAGIC_7Z + b"\0" * 26, {"backup.7z.002", "backup.7z.003"}, None,
+     CATEGORY_ARCHIVE_FRAGMENT, 0.85),
+    ("backup.7z.002", MAGIC_7Z + b"\0" * 26, {"backup.7z.001", "backup.7z.002"}, None,
+     CATEGORY_ARCHIVE_FRAGMENT, 0.5),
+    ("Backup.7z.002", b"corrompido", {"backup.7z.001", "backup.7z.002"}, None,
+     CATEGORY_ARCHIVE_FRAGMENT, 0.4),
+    ("video.mp4.crdownload", None, set(), HOUR_SECONDS, CATEGORY_PARTIAL_DOWNLOAD, 0.4),
+    ("video.mp4.crdownload", None, set(), 25 * HOUR_SECONDS, CATEGORY_PARTIAL_DOWNLOAD, 0.9),
+    ("foto.jpg", b"\xff\xd8\xff\xe0", set(), None, None, None),
+]
+
+
+@pytest.mark.parametrize("name, header, dir_names, age, category, confidence", CASES)
+def test_classify_file(name, header, dir_names, age, category, confidence):
+    st = _stat(age) if age is not None else _stat()
+
+    finding = classify_file(os.path.join("pasta", name), st, header, dir_names, NOW)
+
+    if category is None:
+        assert finding is None
+    else:
+        assert finding["category"] == category
+        assert finding["confidence"] == confidence
+        assert finding["size"] == st.st_size
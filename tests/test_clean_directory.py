@@ -0,0 +1,68 @@
+import os
+import time
+
+import pytest
+
+from src.utils.system import clean_directory
+
+OLD_AGE_SECONDS = 10 * 24 * 60 * 60
+
+
+def _make_old(*paths):
+    old = time.time() - OLD_AGE_SECONDS
+    for path in paths:
+        os.utime(path, (old, old))
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="FIFOs indisponíveis")
+def test_fifos_are_kept(tmp_path):
+    fifo = tmp_path / "fila"
+    os.mkfifo(fifo)
+    junk = tmp_path / "lixo.tmp"
+    junk.write_bytes(b"x")
+    _make_old(fifo, junk)
+
+    _, files = clean_directory(str(tmp_path), min_age=60)
+
+    assert files == 1
+    assert fifo.exists()
+    assert not junk.exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() != 0, reason="exige root para chown")
+def test_items_of_other_users_are_kept(tmp_path):
+    own_file = tmp_path / "meu.tmp"
+    own_file.write_bytes(b"x")
+    other_file = tmp_path / "alheio.tmp"
+    other_file.write_bytes(b"y")
+    other_dir = tmp_path / "pasta_alheia"
+    other_dir.mkdir()
+    (other_dir / "dentro.tmp").write_bytes(b"z")
+    os.chown(other_file, 12345, 12345)
+    os.chown(other_dir, 12345, 12345)
+    _make_old(own_file, other_file, other_dir / "dentro.tmp", other_dir)
+
+    _, files = clean_directory(str(tmp_path), min_age=60, owner_uid=os.geteuid())
+
+    assert files == 1
+    assert not own_file.exists()
+    assert other_file.exists()
+    assert (other_dir / "dentro.tmp").exists()
+
+
+def test_system_service_entries_are_kept(tmp_path):
+    protected = [tmp_path / "systemd-private-abc123-chronyd.service-Xyz", tmp_path / ".X11-unix", tmp_path / ".ICE-unix"]
+    for directory in protected:
+        directory.mkdir()
+        (directory / "dentro").write_bytes(b"x")
+        _make_old(directory / "dentro", directory)
+    junk = tmp_path / "lixo.tmp"
+    junk.write_bytes(b"y")
+    _make_old(junk)
+
+    owner_uid = os.geteuid() if hasattr(os, "geteuid") else None
+    _, files = clean_directory(str(tmp_path), min_age=60, owner_uid=owner_uid)
+
+    assert files == 1
+    assert not junk.exists()
+    assert all((directory / "dentro").exists() for directory in protected)
@@ -0,0 +1,68 @@
+import gzip
+import os
+import time
+
+import pytest
+
+from src.backend.compress import compress_old_files
+from src.utils.system import get_allocated_size
+
+OLD_AGE_SECONDS = 10 * 24 * 60 * 60
+
+
+def _make_old(*paths):
+    old = time.time() - OLD_AGE_SECONDS
+    for path in paths:
+        os.utime(path, (old, old))
+
+
+def _allocated(path):
+    return get_allocated_size(str(path), os.stat(path))
+
+
+def test_saving_is_measured_on_disk(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_bytes(b"linha de log repetida\n" * 20000)
+    _make_old(log)
+    original_allocated = _allocated(log)
+    original_mtime = os.stat(log).st_mtime
+
+    saved, compressed, failures = compress_old_files(str(tmp_path), min_age_days=7)
+
+    archive = tmp_path / "app.log.gz"
+    assert (compressed, failures) == (1, 0)
+    assert not log.exists()
+    assert saved == original_allocated - _allocated(archive)
+    assert os.stat(archive).st_mtime == original_mtime
+    assert gzip.decompress(archive.read_bytes()) == b"linha de log repetida\n" * 20000
+
+
+def test_sparse_file_is_kept(tmp_path):
+    dump = tmp_path / "esparso.dmp"
+    with open(dump, "wb") as f:
+        f.truncate(8 * 1024 * 1024)
+    _make_old(dump)
+    if _allocated(dump) >= 8 * 1024 * 1024:
+        pytest.skip("sistema de arquivos sem suporte a arquivos esparsos")
+
+    saved, compressed, _ = compress_old_files(str(tmp_path), min_age_days=7)
+
+    # O tamanho aparente cairia 8 MB, mas o arquivo quase não ocupa disco
+    assert (saved, compressed) == (0, 0)
+    assert dump.exists()
+    assert not (tmp_path / "esparso.dmp.gz").exists()
+
+
+def test_existing_archive_is_never_overwritten(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_bytes(b"conteudo novo\n" * 2000)
+    archive = tmp_path / "app.log.gz"
+    archive.write_bytes(gzip.compress(b"rotacionado antes\n"))
+    _make_old(log)
+
+    saved, compressed, failures = compress_old_files(str(tmp_path), min_age_days=7)
+
+    assert (saved, compressed, failures) == (0, 0, 0)
+    assert log.read_bytes() == b"conteudo novo\n" * 2000
+    assert gzip.decompress(archive.read_bytes()) == b"rotacionado antes\n"
+    assert sorted(os.listdir(tmp_path)) == ["app.log", "app.log.gz"]
@@ -0,0 +1,116 @@
+import os
+import time
+
+import pytest
+
+from src.backend import daemon
+from src.backend.daemon import RateLimiter, CleaningDaemon
+from src.utils.system import SpaceAccount, CleanupInterrupted, clean_directory, get_allocated_size
+
+
+def _elapsed(func):
+    started = time.monotonic()
+    func()
+    return time.monotonic() - started
+
+
+def test_file_bucket_limits_the_rate():
+    limiter = RateLimiter(max_files_per_second=20)
+
+    # 20 arquivos de rajada e mais 10 a 20/s
+    elapsed = _elapsed(lambda: [limiter(0) for _ in range(30)])
+
+    assert 0.4 <= elapsed < 2
+
+
+def test_byte_bucket_limits_the_rate():
+    limiter = RateLimiter(max_bytes_per_second=1000)
+
+    elapsed = _elapsed(lambda: [limiter(size) for size in (1000, 500)])
+
+    assert 0.4 <= elapsed < 2
+    assert limiter.removed_bytes == 1500
+
+
+def test_unlimited_rate_does_not_wait():
+    limiter = RateLimiter()
+
+    assert _elapsed(lambda: [limiter(1024 * 1024) for _ in range(1000)]) < 0.5
+
+
+def test_max_bytes_interrupts():
+    limiter = RateLimiter(max_bytes=1000)
+    limiter(400)
+    limiter(400)
+
+    with pytest.raises(CleanupInterrupted):
+        limiter(300)
+
+
+def test_max_bytes_stops_clean_directory(tmp_path):
+    for index in range(10):
+        (tmp_path / f"{index}.tmp").write_bytes(b"x" * 4096)
+    allocated = get_allocated_size(str(tmp_path / "0.tmp"), os.stat(tmp_path / "0.tmp"))
+    account = SpaceAccount(throttle=RateLimiter(max_bytes=3 * allocated))
+
+    freed, files = clean_directory(str(tmp_path), account=account)
+
+    assert (freed, files) == (3 * allocated, 3)
+    assert len(os.listdir(tmp_path)) == 7
+
+
+def test_stop_event_interrupts():
+    limiter = RateLimiter()
+    limiter.stop_event.set()
+
+    with pytest.raises(CleanupInterrupted):
+        limiter(0)
+
+
+def test_pauses_while_the_system_is_busy(monkeypatch):
+    loads = iter([0.95, 0.9, 0.1])
+    sessions = iter([True, False])
+    monkeypatch.setattr(daemon, "get_system_load", lambda: next(loads, 0.1))
+    monkeypatch.setattr(daemon, "is_session_active", lambda: next(sessions))
+    monkeypatch.setattr(daemon, "LOAD_RECHECK_SECONDS", 0.01)
+    limiter = RateLimiter(max_load=0.75)
+
+    limiter(0)
+
+    # Carga alta duas vezes, depois o modo jogo ativo, depois livre
+    assert next(sessions, None) is None
+    assert limiter.paused_seconds > 0
+    # A carga só é reavaliada uma vez por segundo
+    monkeypatch.setattr(daemon, "get_system_load", lambda: pytest.fail("carga consultada de novo"))
+    limiter(0)
+
+
+def test_empty_target_backs_off_until_it_grows(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "dados"))
+    target = tmp_path / "temp"
+    target.mkdir()
+    calls = []
+    real_clean = daemon.clean_directory
+
+    def counting_clean(path, *args):
+        calls.append(path)
+        return real_clean(path, *args)
+
+    monkeypatch.setattr(daemon, "get_temp_paths", lambda: {"Temp Teste": str(target)})
+    monkeypatch.setattr(daemon, "clean_directory", counting_clean)
+    monkeypatch.setattr(CleaningDaemon, "_free_percent", staticmethod(lambda path: 1.0))
+    cleaning_daemon = CleaningDaemon({"max_load": None, "poll_seconds": 60})
+
+    cleaning_daemon.run_once()
+    cleaning_daemon.run_once()
+
+    # Espaço livre baixo, mas nada a remover: o segundo ciclo não percorre o alvo
+    assert len(calls) == 1
+    _, delay = cleaning_daemon._empty_backoff["Temp Teste"]
+    assert delay == 120
+
+    (target / "novo.tmp").write_bytes(b"x" * 4096)
+    cleaning_daemon._last_size_check = 0.0
+    assert cleaning_daemon.run_once() > 0
+    assert len(calls) == 2
+    assert "Temp Teste" not in cleaning_daemon._empty_backoff
@@ -0,0 +1,169 @@
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.fleet.agent import FleetAgent
+from src.fleet.coordinator import FleetCoordinator, format_fleet_report
+
+TOKEN = "token-de-teste"
+logger = logging.getLogger('BlazeScan')
+
+
+class FakeActions:
+    """Ações substitutas do backend, compartilhadas pelos agentes para medir a concorrência."""
+
+    def __init__(self, duration=0.0):
+        self.duration = duration
+        self.release = threading.Event()
+        self.release.set()
+        self.running = 0
+        self.peak = 0
+        self.terminated = []
+        self._lock = threading.Lock()
+
+    def cleanup(self, settings):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            logger.info(f"limpando com o plano {settings.get('energy_plan')}")
+            time.sleep(self.duration)
+            self.release.wait(10)
+            logger.info("limpeza concluída")
+        finally:
+            with self._lock:
+                self.running -= 1
+        return True, "relatório", "1.00 MB"
+
+    def terminate_processes(self, processes=None):
+        self.terminated.append(processes)
+        return True, list(processes or [])
+
+    def as_dict(self):
+        return {
+            "cleanup": self.cleanup,
+            "terminate_processes": self.terminate_processes,
+            "set_power_plan": lambda plan: (True, plan),
+        }
+
+
+@pytest.fixture
+def fleet(caplog):
+    caplog.set_level(logging.INFO, logger='BlazeScan')
+    actions = FakeActions()
+    agents = [FleetAgent(TOKEN, port=0, actions=actions.as_dict()).start() for _ in range(3)]
+    yield actions, agents
+    actions.release.set()
+    for agent in agents:
+        agent.stop()
+
+
+def _addresses(agents):
+    return [f"{host}:{port}" for host, port in (agent.address for agent in agents)]
+
+
+def _post(agent, path, body, token=TOKEN):
+    host, port = agent.address
+    request = urllib.request.Request(f"http://{host}:{port}{path}", data=json.dumps(body).encode('utf-8'),
+                                     method="POST", headers={"Authorization": f"Bearer {token}"})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_results_are_aggregated(fleet):
+    _, agents = fleet
+    coordinator = FleetCoordinator(_addresses(agents), TOKEN)
+
+    results = coordinator.run_cleanup({"energy_plan": "HIGH_PERFORMANCE"})
+
+    assert [r["agent"] for r in results] == coordinator.agents
+    assert all(r["ok"] and r["success"] and r["error"] is None for r in results)
+    assert {r["freed"] for r in results} == {"1.00 MB"}
+    assert "3/3 agentes concluíram com sucesso" in format_fleet_report(results)
+
+
+def test_events_are_streamed_from_every_agent(fleet):
+    _, agents = fleet
+    coordinator = FleetCoordinator(_addresses(agents), TOKEN)
+    events = []
+    lock = threading.Lock()
+
+    def on_event(agent, event):
+        with lock:
+            events.append((agent, event["message"]))
+
+    coordinator.run_cleanup({"energy_plan": "BALANCED"}, on_event)
+
+    for agent in coordinator.agents:
+        messages = [message for source, message in events if source == agent]
+        assert messages == ["limpando com o plano BALANCED", "limpeza concluída"]
+
+
+def test_bad_token_is_rejected(fleet):
+    actions, agents = fleet
+    coordinator = FleetCoordinator(_addresses(agents), "token-errado")
+
+    results = coordinator.run_cleanup({})
+
+    assert all(not r["ok"] and r["error"].startswith("HTTP 401") for r in results)
+    assert actions.peak == 0
+    assert _post(agents[0], "/processes/terminate", {}, token="")[0] == 401
+
+
+def test_second_run_on_a_busy_agent_conflicts(fleet):
+    actions, agents = fleet
+    actions.release.clear()
+
+    status, first = _post(agents[0], "/runs", {"settings": {}})
+    status_busy, busy = _post(agents[0], "/runs", {"settings": {}})
+
+    assert status == 202
+    assert status_busy == 409
+    assert busy["current_run"] == first["run_id"]
+    results = FleetCoordinator(_addresses(agents[:1]), TOKEN).run_cleanup({})
+    assert results[0]["error"].startswith("HTTP 409")
+
+    actions.release.set()
+    deadline = time.monotonic() + 5
+    while agents[0].status()["busy"] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _post(agents[0], "/runs", {"settings": {}})[0] == 202
+
+
+def test_max_parallel_bounds_concurrent_runs(fleet):
+    actions, agents = fleet
+    actions.duration = 0.3
+    coordinator = FleetCoordinator(_addresses(agents), TOKEN, max_parallel=2)
+
+    results = coordinator.run_cleanup({})
+
+    assert all(r["ok"] for r in results)
+    assert actions.peak == 2
+
+
+@pytest.mark.parametrize("processes", ["chrome.exe", ["a.exe & calc.exe"], ["*"], ["/FI"], [3]])
+def test_invalid_process_names_are_rejected(fleet, processes):
+    actions, agents = fleet
+
+    status, _ = _post(agents[0], "/processes/terminate", {"processes": processes})
+
+    assert status == 400
+    assert actions.terminated == []
+
+
+def test_valid_process_names_are_terminated(fleet):
+    actions, agents = fleet
+    coordinator = FleetCoordinator(_addresses(agents), TOKEN)
+
+    results = coordinator.terminate_processes(["chrome.exe", "My App.exe"])
+
+    assert all(r["ok"] and r["data"]["terminated"] == ["chrome.exe", "My App.exe"] for r in results)
+    assert len(actions.terminated) == 3
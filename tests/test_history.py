@@ -0,0 +1,60 @@
+import os
+import sqlite3
+import time
+
+from src.backend import history
+from src.backend.history import RunHistory, AUTO_VACUUM_INCREMENTAL
+
+
+def _page_count(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return conn.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_new_database_uses_incremental_auto_vacuum(tmp_path):
+    db_path = str(tmp_path / "history.sqlite3")
+    RunHistory(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        conn.close()
+
+
+def test_existing_database_is_converted(tmp_path):
+    db_path = str(tmp_path / "history.sqlite3")
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE legacy (id INTEGER PRIMARY KEY)")
+    conn.execute("INSERT INTO legacy VALUES (1)")
+    conn.commit()
+    conn.close()
+
+    RunHistory(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+        assert conn.execute("SELECT COUNT(*) FROM legacy").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_retention_returns_pages_to_disk(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "history.sqlite3")
+    run_history = RunHistory(db_path)
+    targets = [{"stage": "Limpeza", "name": "Temp " + "x" * 200, "bytes": 1}] * 20
+    for _ in range(100):
+        run_history.record_run(time.time(), 1.0, 1, True, {"nota": "y" * 2000}, targets, [])
+    pages_before = _page_count(db_path)
+
+    monkeypatch.setattr(history, "HISTORY_MAX_RUNS", 1)
+    run_history.record_run(time.time(), 1.0, 1, True, {}, [], [])
+
+    assert _page_count(db_path) < pages_before / 4
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from src.utils import system
+from src.backend import quarantine
+from src.backend.quarantine import (
+    new_batch,
+    quarantine_directory,
+    undo_batch,
+    list_undoable_batches,
+    start_background_purge,
+)
+
+
+@pytest.fixture
+def target(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "dados"))
+    target_dir = tmp_path / "alvo"
+    (target_dir / "sub").mkdir(parents=True)
+    (target_dir / "a.tmp").write_bytes(b"a" * 1024)
+    (target_dir / "sub" / "b.tmp").write_bytes(b"b" * 1024)
+    return target_dir
+
+
+def _quarantine(target_dir):
+    batch = new_batch()
+    assert quarantine_directory(batch, "Alvo", str(target_dir)) == 2
+    assert os.listdir(target_dir) == []
+    return batch
+
+
+def _quarantine_root(tmp_path):
+    return tmp_path / "dados" / system.APP_DATA_DIRNAME / quarantine.QUARANTINE_DIRNAME
+
+
+def test_undo_restores_everything(target, tmp_path):
+    batch = _quarantine(target)
+
+    success, _ = undo_batch(batch["batch_id"])
+
+    assert success
+    assert (target / "a.tmp").read_bytes() == b"a" * 1024
+    assert (target / "sub" / "b.tmp").read_bytes() == b"b" * 1024
+    assert list_undoable_batches() == []
+    assert os.listdir(_quarantine_root(tmp_path)) == []
+
+
+def test_undo_keeps_items_that_exist_at_the_destination(target):
+    batch = _quarantine(target)
+    (target / "a.tmp").write_bytes(b"novo")
+
+    success, msg = undo_batch()
+
+    assert success
+    assert "1 itens permaneceram na quarentena" in msg
+    assert (target / "a.tmp").read_bytes() == b"novo"
+    assert (target / "sub" / "b.tmp").exists()
+    # O item em conflito continua na quarentena e o lote ainda pode ser desfeito
+    [remaining] = list_undoable_batches()
+    assert remaining["batch_id"] == batch["batch_id"]
+    quarantine_dir = remaining["targets"][0]["quarantine_dir"]
+    assert os.listdir(quarantine_dir) == ["a.tmp"]
+
+
+def test_background_purge_frees_the_batch(target, tmp_path):
+    _quarantine(target)
+
+    start_background_purge(True).join(10)
+
+    assert list_undoable_batches() == []
+    assert os.listdir(target) == []
+    assert os.listdir(_quarantine_root(tmp_path)) == []
+
+
+def test_purge_keeps_the_manifest_while_items_remain(target, monkeypatch):
+    batch = _quarantine(target)
+    real_remove = os.remove
+
+    def stuck_remove(path):
+        if os.path.basename(path) == "b.tmp":
+            raise PermissionError("somente leitura")
+        real_remove(path)
+
+    monkeypatch.setattr(system.os, "remove", stuck_remove)
+    start_background_purge(True).join(10)
+
+    [remaining] = list_undoable_batches()
+    assert remaining["batch_id"] == batch["batch_id"]
+
+    monkeypatch.setattr(system.os, "remove", real_remove)
+    start_background_purge(True).join(10)
+
+    assert list_undoable_batches() == []
+
+
+def test_system_service_entries_are_not_quarantined(target):
+    (target / ".X11-unix").mkdir()
+    (target / "systemd-private-abc123-chronyd.service-Xyz").mkdir()
+
+    batch = new_batch()
+
+    assert quarantine_directory(batch, "Alvo", str(target)) == 2
+    assert sorted(os.listdir(target)) == [".X11-unix", "systemd-private-abc123-chronyd.service-Xyz"]
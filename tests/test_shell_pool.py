@@ -0,0 +1,118 @@
+import os
+import sys
+import time
+
+import pytest
+
+from src.utils.shell_pool import ShellPool, ShellWorkerError
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32' or not os.path.exists('/bin/sh'),
+                                reason="os testes usam /bin/sh")
+
+
+@pytest.fixture
+def pool():
+    shell_pool = ShellPool(size=1, shell_command=['/bin/sh'])
+    yield shell_pool
+    shell_pool.shutdown()
+
+
+def _live_group_members(pgid):
+    """PIDs vivos (não zumbis) do grupo de processos, lidos de /proc. O SIGKILL é assíncrono."""
+    if not os.path.isdir('/proc'):
+        return []
+    members = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[2]) == pgid and fields[0] != 'Z':
+            members.append(int(entry))
+    return members
+
+
+def _worker_process(shell_pool):
+    return shell_pool._idle.queue[0].process
+
+
+def test_exit_code_and_output(pool):
+    result = pool.run(["sh", "-c", "echo saída; exit 3"])
+
+    assert result.returncode == 3
+    assert result.stdout == "saída\n"
+    assert result.stderr == ""
+    assert not result.timed_out
+
+
+def test_stdout_and_stderr_are_separated(pool):
+    result = pool.run(["sh", "-c", "echo um; echo dois >&2; printf sem-quebra; printf erro-sem-quebra >&2"])
+
+    assert result.returncode == 0
+    assert result.stdout == "um\nsem-quebra"
+    assert result.stderr == "dois\nerro-sem-quebra"
+
+
+def test_arguments_are_not_interpreted_by_the_shell(pool):
+    result = pool.run(["echo", "$HOME; exit 1"])
+
+    assert result.returncode == 0
+    assert result.stdout == "$HOME; exit 1\n"
+
+
+def test_command_does_not_consume_protocol_stdin(pool):
+    assert pool.run(["cat"]).returncode == 0
+    assert pool.run(["echo", "depois"]).stdout == "depois\n"
+
+
+def test_consecutive_commands_reuse_the_same_shell(pool):
+    pool.run(["true"])
+    pid = _worker_process(pool).pid
+    pool.run(["true"])
+
+    assert _worker_process(pool).pid == pid
+    assert pool.restarts == 0
+
+
+def test_timeout_kills_the_shell_and_the_command(pool):
+    pool.run(["true"])
+    shell = _worker_process(pool)
+
+    started = time.monotonic()
+    result = pool.run(["sleep", "30"], timeout=0.3)
+
+    assert result.timed_out
+    assert result.returncode is None
+    assert time.monotonic() - started < 5
+    assert shell.poll() is not None
+    # O shell roda em um grupo próprio: o 'sleep' também foi encerrado
+    deadline = time.monotonic() + 2
+    while _live_group_members(shell.pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _live_group_members(shell.pid) == []
+    assert pool.restarts == 1
+    assert pool.run(["echo", "ok"]).stdout == "ok\n"
+
+
+def test_restart_after_the_shell_dies_during_a_command(pool):
+    with pytest.raises(ShellWorkerError):
+        pool.run(["sh", "-c", "kill -9 $PPID"])
+
+    assert pool.restarts == 1
+    assert pool.run(["echo", "reiniciado"]).stdout == "reiniciado\n"
+
+
+def test_restart_after_the_idle_shell_is_killed(pool):
+    pool.run(["true"])
+    shell = _worker_process(pool)
+    shell.kill()
+    shell.wait()
+
+    result = pool.run(["echo", "reiniciado"])
+
+    assert result.stdout == "reiniciado\n"
+    assert _worker_process(pool).pid != shell.pid
+    assert pool.restarts == 1
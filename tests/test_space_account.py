@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from src.utils import system
+from src.utils.system import SpaceAccount, clean_directory, get_allocated_size
+
+
+class _WindowsLikeEntry:
+    """DirEntry cujo stat() não preenche st_ino/st_nlink, como no Windows."""
+
+    def __init__(self, entry):
+        self._entry = entry
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, follow_symlinks=True):
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self):
+        return self._entry.is_symlink()
+
+    def stat(self, follow_symlinks=True):
+        st = self._entry.stat(follow_symlinks=follow_symlinks)
+        fields = list(st[:10])
+        fields[1] = 0  # st_ino
+        fields[3] = 0  # st_nlink
+        return os.stat_result(fields, {"st_blocks": st.st_blocks})
+
+
+def _make_hardlinked_pair(directory):
+    first = directory / "a.bin"
+    first.write_bytes(b"x" * 64 * 1024)
+    os.link(first, directory / "b.bin")
+    st = os.lstat(first)
+    return st.st_size, get_allocated_size(str(first), st)
+
+
+@pytest.mark.skipif(not hasattr(os, "link"), reason="hardlinks indisponíveis")
+def test_hardlinks_are_counted_once(tmp_path):
+    size, allocated = _make_hardlinked_pair(tmp_path)
+
+    account = SpaceAccount()
+    freed, files = clean_directory(str(tmp_path), account=account)
+
+    assert files == 2
+    assert freed == allocated
+    assert account.on_disk_bytes == allocated
+    assert account.apparent_bytes == size
+
+
+@pytest.mark.skipif(not hasattr(os, "link"), reason="hardlinks indisponíveis")
+def test_hardlinks_are_counted_once_without_inode_in_dir_entry(tmp_path, monkeypatch):
+    size, allocated = _make_hardlinked_pair(tmp_path)
+    real_scandir = os.scandir
+    monkeypatch.setattr(system.os, "scandir",
+                        lambda path: [_WindowsLikeEntry(e) for e in real_scandir(path)])
+
+    account = SpaceAccount()
+    freed, files = clean_directory(str(tmp_path), account=account)
+
+    assert files == 2
+    assert freed == allocated
+    assert account.apparent_bytes == size
@@ -0,0 +1,57 @@
+import os
+import time
+
+from src.utils import system
+from src.utils.system import SpaceAccount, trim_directory, get_allocated_size
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def _make_cache(directory, count=5):
+    """Arquivos de mesmo tamanho; o índice 0 é o acessado há mais tempo."""
+    now = time.time()
+    files = []
+    for index in range(count):
+        path = directory / f"{index}.bin"
+        path.write_bytes(b"x" * 4096)
+        last_access = now - (count - index) * DAY_SECONDS
+        os.utime(path, (last_access, last_access))
+        files.append(path)
+    return files, get_allocated_size(str(files[0]), os.stat(files[0]))
+
+
+def test_oldest_files_are_evicted_until_within_budget(tmp_path):
+    files, allocated = _make_cache(tmp_path)
+    budget = int(2.5 * allocated)
+    account = SpaceAccount()
+
+    kept, evicted, evicted_files = trim_directory(str(tmp_path), budget, account=account)
+
+    assert [path.exists() for path in files] == [False, False, False, True, True]
+    assert (kept, evicted, evicted_files) == (2 * allocated, 3 * allocated, 3)
+    assert kept <= budget
+    assert account.on_disk_bytes == evicted
+
+
+def test_cache_within_budget_is_untouched(tmp_path):
+    files, allocated = _make_cache(tmp_path)
+
+    assert trim_directory(str(tmp_path), 5 * allocated) == (5 * allocated, 0, 0)
+    assert all(path.exists() for path in files)
+
+
+def test_file_used_after_the_scan_is_kept(tmp_path, monkeypatch):
+    files, allocated = _make_cache(tmp_path)
+    real_heapify = system.heapq.heapify
+
+    def heapify_then_touch(entries):
+        # Entre a varredura e a remoção, outro processo usa o segundo arquivo mais antigo
+        os.utime(files[1])
+        real_heapify(entries)
+
+    monkeypatch.setattr(system.heapq, "heapify", heapify_then_touch)
+
+    kept, evicted, evicted_files = trim_directory(str(tmp_path), int(2.5 * allocated))
+
+    assert [path.exists() for path in files] == [False, True, False, False, True]
+    assert (kept, evicted, evicted_files) == (2 * allocated, 3 * allocated, 3)